@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Jarvis command-processing benchmark
+Drives JarvisAssistant headlessly (no microphone, no TTS, no real subprocesses)
+over a synthetic corpus and reports throughput, per-intent latency and allocations.
+
+Usage:
+    python benchmark.py                      # run and compare with the saved baseline
+    python benchmark.py --save-baseline      # record the current numbers as the baseline
+    python benchmark.py --size 5000 --threshold 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout, redirect_stderr
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT))
+
+from jarvis import JarvisAssistant, CommandExecutor, Fore, Style  # pylint: disable=wrong-import-position
+
+DEFAULT_BASELINE = ROOT / 'benchmark_baseline.json'
+
+# (intent, templates); {app} is filled from the apps config, {n} with a small number
+TEMPLATES = [
+    ('open_app', ["open {app}", "launch {app}", "please open {app}", "start {app} for me",
+                  "could you run {app}", "open {app} app", "open {misspelt}"]),
+    ('time', ["what time is it", "what's the time", "tell me the time", "time please"]),
+    ('date', ["what's the date", "what is today's date", "date today"]),
+    ('day', ["what day is it", "which day is it today"]),
+    ('greeting', ["hello", "hi jarvis", "hey there", "good morning"]),
+    ('how_are_you', ["how are you", "how are you doing today"]),
+    ('thanks', ["thanks", "thank you so much", "thank you jarvis"]),
+    ('name', ["what is your name", "what's your name"]),
+    ('identity', ["who are you", "who made you"]),
+    ('help', ["help", "what can you do"]),
+    ('license', ["license", "what license are you under"]),
+    ('lock_screen', ["lock screen", "lock the screen please"]),
+    ('screenshot', ["take a screenshot", "screenshot"]),
+    ('volume_up', ["volume up", "turn the volume up"]),
+    ('volume_down', ["volume down", "turn volume down a bit"]),
+    ('mute', ["mute", "mute the sound"]),
+    ('reminder', ["remind me in {n} minutes to stretch", "remind me at 5 pm to call mom",
+                  "remind me every day at 9 to take vitamins"]),
+    ('timer', ["set a timer for {n} minutes", "set timer for {n} hours"]),
+    ('list_reminders', ["list reminders", "what are my reminders"]),
+    ('cancel_reminders', ["cancel reminders", "cancel the timer"]),
+]
+
+# Inputs that look like commands but should route elsewhere (or nowhere),
+# plus pathological sizes and characters
+ADVERSARIAL = [
+    "", "   ", "?!", "opening hours of the shop", "timeless classics", "please submit the form",
+    "today's weather", "muted colours", "openness", "the helpline number", "thanksgiving recipes",
+    "hello " * 200, "open " * 300, "remind me", "set a timer", "timer timer timer timer",
+    "open chrome; rm -rf /", "open $(whoami)", "open `id`", "launch ../../etc/passwd",
+    "ÖFFNE safari bitte", "打开 chrome", "open 🦊 firefox", "what time is it " + "x" * 4000,
+    "remind me in 99999999999 minutes to overflow", "remind me at 25:99 to break things",
+    "open " + "a" * 2000, "hey jarvis hey jarvis hey jarvis", "\t\nopen\tnotes\n",
+]
+
+
+class FakeProcess:
+    """Stands in for subprocess.Popen: exits immediately with success"""
+
+    launched = 0
+
+    def __init__(self, args, **_popen_kwargs):
+        FakeProcess.launched += 1
+        self.args = args
+        self.pid = -1
+        self.returncode = 0
+
+    def wait(self, timeout=None):  # pylint: disable=unused-argument
+        """Already exited"""
+        return self.returncode
+
+    def poll(self):
+        """Already exited (CommandHandle.cancel checks before killing)"""
+        return self.returncode
+
+    def kill(self):
+        """Nothing to kill"""
+
+
+class NullStream:
+    """Write-only sink for the assistant's console output"""
+
+    def write(self, text):
+        """Discard text"""
+        return len(text)
+
+    def flush(self):
+        """Nothing is buffered"""
+
+
+@contextmanager
+def quiet():
+    """Silence prints and console logging while benchmarking"""
+    sink = NullStream()
+    with redirect_stdout(sink), redirect_stderr(sink):
+        yield
+
+
+def build_corpus(apps, size, seed=0):
+    """Return size utterances, roughly 90% realistic and 10% adversarial"""
+    rng = random.Random(seed)
+    aliases = [alias for app in apps.values() for alias in app.get('commands', [])]
+    corpus = []
+
+    while len(corpus) < size:
+        if rng.random() < 0.1:
+            text = rng.choice(ADVERSARIAL)
+        else:
+            _, templates = rng.choice(TEMPLATES)
+            alias = rng.choice(aliases)
+            misspelt = alias[:-1] if len(alias) > 3 else alias
+            text = rng.choice(templates).format(app=alias, misspelt=misspelt, n=rng.randint(1, 59))
+
+        # Vary case and wake word the way recognizers do
+        roll = rng.random()
+        if roll < 0.2:
+            text = text.upper()
+        elif roll < 0.4:
+            text = text.capitalize()
+        if rng.random() < 0.25:
+            text = f"hey jarvis {text}"
+        corpus.append(text)
+
+    return corpus
+
+
+def headless_assistant(workdir):
+    """Create a JarvisAssistant that needs no audio devices or macOS tooling"""
+    os.chdir(workdir)
+    Path('logs').mkdir(exist_ok=True)
+
+    # Point every app at a fake bundle so the launch path is taken on any OS
+    apps_config = JarvisAssistant.default_apps_config(None)
+    for key, app in apps_config['applications'].items():
+        bundle = Path(workdir, 'Applications', f"{key}.app")
+        bundle.mkdir(parents=True, exist_ok=True)
+        app['path'] = str(bundle)
+    with open('apps_config.json', 'w', encoding='utf-8') as f:
+        json.dump(apps_config, f, indent=2)
+
+    with quiet():
+        assistant = JarvisAssistant(speech=False)
+        assistant.executor.shutdown(wait=True)
+        assistant.executor = CommandExecutor(
+            max_workers=assistant.config.get('executor_workers', 4),
+            default_timeout=assistant.config.get('command_timeout', 10),
+            logger=assistant.logger,
+            launcher=FakeProcess
+        )
+    return assistant
+
+
+def route(assistant, text):
+    """Route text the same way process_command does"""
+    text = text.lower().strip().replace(assistant.wake_word, '').strip()
+    intent, _ = assistant.router.route(text)
+    return intent or 'unknown'
+
+
+def percentile(samples, q):
+    """Nearest-rank quantile q of samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run_throughput(assistant, corpus, repeat):
+    """Time process_command over the corpus; returns best-of-repeat stats"""
+    intents = [route(assistant, text) for text in corpus]
+    elapsed, latencies = float('inf'), {}
+
+    for _ in range(repeat):
+        run_latencies = {}
+        with quiet():
+            started = time.perf_counter()
+            for text, intent in zip(corpus, intents):
+                t0 = time.perf_counter()
+                assistant.process_command(text)
+                run_latencies.setdefault(intent, []).append(time.perf_counter() - t0)
+            run_elapsed = time.perf_counter() - started
+
+        if run_elapsed < elapsed:
+            elapsed, latencies = run_elapsed, run_latencies
+    return {
+        'commands_per_second': len(corpus) / elapsed,
+        'elapsed': elapsed,
+        'intents': {
+            intent: {
+                'count': len(samples),
+                'mean_us': sum(samples) / len(samples) * 1e6,
+                'p50_us': percentile(samples, 0.5) * 1e6,
+                'p95_us': percentile(samples, 0.95) * 1e6,
+            }
+            for intent, samples in latencies.items()
+        }
+    }
+
+
+def run_allocations(assistant, corpus):
+    """Per-intent peak traced memory and allocated blocks left behind, per command"""
+    groups = {}
+    for text in corpus:
+        groups.setdefault(route(assistant, text), []).append(text)
+
+    results = {}
+    tracemalloc.start()
+    try:
+        with quiet():
+            for intent, texts in groups.items():
+                before = tracemalloc.take_snapshot()
+                if hasattr(tracemalloc, 'reset_peak'):  # Python 3.9+
+                    tracemalloc.reset_peak()
+                base, _ = tracemalloc.get_traced_memory()
+                for text in texts:
+                    assistant.process_command(text)
+                _, peak = tracemalloc.get_traced_memory()
+                after = tracemalloc.take_snapshot()
+                blocks = sum(stat.count_diff for stat in after.compare_to(before, 'filename'))
+                results[intent] = {
+                    'peak_kib': max(0, peak - base) / 1024,
+                    'blocks_per_cmd': blocks / len(texts),
+                }
+    finally:
+        tracemalloc.stop()
+    return results
+
+
+def print_report(stats, allocations, baseline):
+    """Print the per-intent table, throughput and the change versus baseline"""
+    print(f"\n{Fore.CYAN}{'='*78}{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}Jarvis command benchmark{Style.RESET_ALL} "
+          f"(Python {platform.python_version()}, {platform.system()})")
+    print(f"{Fore.CYAN}{'='*78}{Style.RESET_ALL}")
+    print(f"{'intent':<18}{'count':>7}{'mean µs':>11}{'p50 µs':>10}{'p95 µs':>10}"
+          f"{'peak KiB':>11}{'blocks/cmd':>12}")
+
+    for intent, row in sorted(stats['intents'].items(), key=lambda item: -item[1]['count']):
+        alloc = allocations.get(intent, {})
+        print(f"{intent:<18}{row['count']:>7}{row['mean_us']:>11.1f}{row['p50_us']:>10.1f}"
+              f"{row['p95_us']:>10.1f}{alloc.get('peak_kib', 0):>11.1f}"
+              f"{alloc.get('blocks_per_cmd', 0):>12.1f}")
+
+    commands = sum(row['count'] for row in stats['intents'].values())
+    print(f"\n{Fore.GREEN}Throughput:{Style.RESET_ALL} "
+          f"{stats['commands_per_second']:,.0f} commands/s "
+          f"({stats['elapsed']:.3f}s for {commands} commands)")
+    if baseline:
+        change = stats['commands_per_second'] / baseline['commands_per_second'] - 1
+        print(f"{Fore.GREEN}Baseline:{Style.RESET_ALL}   "
+              f"{baseline['commands_per_second']:,.0f} commands/s ({change:+.1%})")
+    print(f"Subprocess launches stubbed: {FakeProcess.launched}")
+
+
+def main():
+    """Run the benchmark; returns 1 on a throughput regression"""
+    parser = argparse.ArgumentParser(description='Benchmark Jarvis command processing')
+    parser.add_argument('--size', type=int, default=3000, help='Number of utterances in the corpus')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed passes; the fastest is reported')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Write results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed throughput drop versus the baseline (0.2 = 20%%)')
+    parser.add_argument('--no-alloc', action='store_true', help='Skip the tracemalloc pass')
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline).resolve()
+    baseline = None
+    if baseline_path.exists() and not args.save_baseline:
+        with open(baseline_path, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='jarvis-bench-') as workdir:
+        assistant = headless_assistant(workdir)
+        try:
+            corpus = build_corpus(assistant.apps_config['applications'], args.size, args.seed)
+
+            # Warm-up pass builds the app index and fills caches
+            with quiet():
+                for text in corpus[:200]:
+                    assistant.process_command(text)
+
+            stats = run_throughput(assistant, corpus, args.repeat)
+            allocations = {} if args.no_alloc else run_allocations(assistant, corpus)
+        finally:
+            with quiet():
+                assistant.shutdown(drain=False)
+            os.chdir(cwd)
+
+    print_report(stats, allocations, baseline)
+
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'commands_per_second': round(stats['commands_per_second'], 1),
+                'size': args.size,
+                'seed': args.seed,
+                'python': platform.python_version(),
+                'jarvis': assistant.version,
+                'intents': {intent: round(row['p50_us'], 1)
+                            for intent, row in stats['intents'].items()},
+            }, f, indent=2)
+        print(f"\n{Fore.GREEN}✓ Baseline saved to {baseline_path}{Style.RESET_ALL}")
+        return 0
+
+    if baseline is None:
+        print(f"\n{Fore.YELLOW}No baseline at {baseline_path}; "
+              f"run with --save-baseline to create one{Style.RESET_ALL}")
+        return 0
+
+    floor = baseline['commands_per_second'] * (1 - args.threshold)
+    if stats['commands_per_second'] < floor:
+        print(f"\n{Fore.RED}✗ Throughput regressed below {floor:,.0f} commands/s "
+              f"({args.threshold:.0%} under baseline){Style.RESET_ALL}")
+        return 1
+
+    print(f"\n{Fore.GREEN}✓ Within {args.threshold:.0%} of baseline{Style.RESET_ALL}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,113 +7,3721 @@ License: MIT
 GitHub: https://github.com/its4yus4/jarvis-assistant
 """
 
+import time
+
+# Taken before any other import so startup profiles include import cost
+PROCESS_START = time.perf_counter()
+
+# pylint: disable=wrong-import-position
 import sys
 import os
 import json
-import time
 import re
 import subprocess
 import argparse
+import asyncio
 import threading
-from datetime import datetime
+import queue
+import itertools
+import wave
+import shutil
+import hashlib
+import tempfile
+import platform
+import heapq
+import signal
+import random
+import atexit
+import logging
+import logging.handlers
+import math
+import sqlite3
+import plistlib
+from array import array
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict, namedtuple, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait as wait_futures
+from datetime import datetime, timedelta
 from pathlib import Path
 
-# Third-party imports
-try:
-    import speech_recognition as sr
-    import pyttsx3
-    from colorama import init, Fore, Back, Style
-    init(autoreset=True)
-except ImportError as e:
-    print(f"Missing dependency: {e}")
-    print("Please run: pip install -r requirements.txt")
-    sys.exit(1)
+# Third-party imports
+try:
+    from colorama import init, Fore, Back, Style
+    init(autoreset=True)
+except ImportError as e:
+    print(f"Missing dependency: {e}")
+    print("Please run: pip install -r requirements.txt")
+    sys.exit(1)
+# pylint: enable=wrong-import-position
+
+# The audio stack and NumPy are imported on first use so text-only
+# modes never pay for them
+sr = None
+pyttsx3 = None
+np = None
+_numpy_checked = False
+
+
+def load_speech_recognition():
+    """Import speech_recognition on first use"""
+    global sr
+    if sr is None:
+        try:
+            import speech_recognition
+        except ImportError as e:
+            print(f"Missing dependency: {e}")
+            print("Please run: pip install -r requirements.txt")
+            sys.exit(1)
+        sr = speech_recognition
+    return sr
+
+
+def load_pyttsx3():
+    """Import pyttsx3 on first use (raises ImportError if missing)"""
+    global pyttsx3
+    if pyttsx3 is None:
+        import pyttsx3 as module
+        pyttsx3 = module
+    return pyttsx3
+
+
+def load_numpy():
+    """Import the optional NumPy stack, returning None if it isn't installed"""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+# ASCII Banner
+BANNER = f"""{Fore.CYAN}
+    ╔{'═' * 58}╗
+    ║{' ' * 58}║
+    ║{Fore.YELLOW}      ██╗ █████╗ ██████╗ ██╗   ██╗██╗███████╗     {Fore.CYAN}║
+    ║{Fore.YELLOW}      ██║██╔══██╗██╔══██╗██║   ██║██║██╔════╝     {Fore.CYAN}║
+    ║{Fore.YELLOW}      ██║███████║██████╔╝██║   ██║██║███████╗     {Fore.CYAN}║
+    ║{Fore.YELLOW} ██   ██║██╔══██║██╔══██╗╚██╗ ██╔╝██║╚════██║     {Fore.CYAN}║
+    ║{Fore.YELLOW} ╚█████╔╝██║  ██║██║  ██║ ╚████╔╝ ██║███████║     {Fore.CYAN}║
+    ║{Fore.YELLOW}  ╚════╝ ╚═╝  ╚═╝╚═╝  ╚═╝  ╚═══╝  ╚═╝╚══════╝     {Fore.CYAN}║
+    ║{' ' * 58}║
+    ║{Fore.GREEN}      Just A Rather Very Intelligent System      {Fore.CYAN}║
+    ║{' ' * 58}║
+    ║{Fore.MAGENTA}         macOS Assistant • Version 2.1.0          {Fore.CYAN}║
+    ║{Fore.MAGENTA}           GitHub: @its4yus4                    {Fore.CYAN}║
+    ║{Fore.MAGENTA}           License: MIT                         {Fore.CYAN}║
+    ║{' ' * 58}║
+    ╚{'═' * 58}╝
+{Style.RESET_ALL}"""
+
+# Intent table, highest precedence first. Phrases match as whole words;
+# patterns are regexes whose named groups become slots. Serial intents
+# depend on the order of commands and are never run concurrently; intents
+# marked "early": False never commit on a partial streaming result, ones
+# marked "split": False keep the rest of a compound command as their
+# free-text details, and ones marked "whole": True match only an entire
+# utterance (or one part of a compound command).
+INTENTS = [
+    {"intent": "cancel_reminders", "serial": True,
+     "phrases": ["cancel reminders", "cancel all reminders", "cancel my reminders",
+                 "clear reminders", "cancel timer", "cancel the timer", "cancel timers"]},
+    {"intent": "list_reminders", "serial": True,
+     "phrases": ["list reminders", "my reminders", "list timers"]},
+    {"intent": "reminder", "serial": True, "split": False,
+     "pattern": r"\bremind me\b(?=(?P<details>.*))"},
+    {"intent": "timer", "pattern": r"\btimer\b(?=(?P<details>.*))", "serial": True, "split": False},
+    {"intent": "quit", "serial": True, "early": False, "whole": True,
+     "phrases": ["quit", "exit", "goodbye", "stop", "shutdown", "close"]},
+    {"intent": "license", "phrases": ["license", "open source"]},
+    {"intent": "open_app", "pattern": r"\b(?:open|launch|start|run)\s+(?=(?P<app>\S.*))"},
+    {"intent": "lock_screen",
+     "phrases": ["lock screen", "lock the screen", "lock my screen", "lock my mac",
+                 "lock the mac", "lock my computer", "go to sleep"]},
+    {"intent": "screenshot", "phrases": ["screenshot"]},
+    {"intent": "show_desktop", "phrases": ["desktop"]},
+    {"intent": "volume_up", "phrases": ["volume up", "louder", "increase volume"], "serial": True},
+    {"intent": "volume_down", "phrases": ["volume down", "quieter", "decrease volume"],
+     "serial": True},
+    {"intent": "mute", "phrases": ["mute"], "serial": True},
+    {"intent": "max_volume", "phrases": ["max volume", "full volume", "volume max"],
+     "serial": True},
+    {"intent": "time", "phrases": ["time"]},
+    {"intent": "date", "phrases": ["date"]},
+    {"intent": "day", "phrases": ["day"]},
+    {"intent": "greeting", "phrases": ["hello", "hi", "hey", "greetings"]},
+    {"intent": "name", "phrases": ["your name"]},
+    {"intent": "identity", "phrases": ["who are you"]},
+    {"intent": "how_are_you", "phrases": ["how are you"]},
+    {"intent": "thanks", "phrases": ["thank", "thanks"]},
+    {"intent": "help", "phrases": ["help"]},
+]
+
+# Intents handled by a system command of the same name
+SYSTEM_INTENTS = ['lock_screen', 'screenshot', 'show_desktop', 'volume_up',
+                  'volume_down', 'mute', 'max_volume']
+
+# Canned replies, rotated by the current second
+RESPONSES = {
+    "greeting": [
+        "Hello! How can I assist you?",
+        "Hi there!",
+        "Greetings!",
+        "Hello! Ready to help."
+    ],
+    "how_are_you": [
+        "I'm functioning optimally, thank you.",
+        "All systems are operational.",
+        "I'm well, thank you for asking.",
+        "Running smoothly as always."
+    ],
+    "thanks": [
+        "You're welcome!",
+        "My pleasure.",
+        "Happy to help!",
+        "Anytime!"
+    ]
+}
+
+# Leading verb phrase of an action reply ("Opening", "Trying to open"), so a
+# compound command's replies can share it
+REPLY_VERB = re.compile(r'(?P<verb>\w+ing(?: to \w+)?) (?P<rest>.+)')
+
+
+class IntentRouter:
+    """Single-pass intent matcher compiled once from an intent table"""
+
+    # Compound commands: sequencing words separate stages, conjunctions actions
+    SEQUENCE = re.compile(r'\s*,?\s*\b(?:and then|then|after that|afterwards)\b\s*')
+    CONJUNCTION = re.compile(r'\s*,\s*(?:and\s+)?|\s+and\s+')
+    SEPARATOR = re.compile(r',|\b(?:and|then|after that|afterwards)\b')
+
+    def __init__(self, intents):
+        self.priority = {}
+        self.slots = {}
+        self.early = set()     # Phrase intents safe to act on from a partial result
+        self.serial = set()    # Intents that must not run alongside other serial ones
+        self.unsplit = set()   # Intents whose details run to the end of the command
+        self.prefixes = set()  # Leading words of longer phrases ("volume" of "volume up")
+        alternatives = []
+
+        for rank, entry in enumerate(intents):
+            name = entry['intent']
+            self.priority[name] = rank
+            if entry.get('serial'):
+                self.serial.add(name)
+            if not entry.get('split', True):
+                self.unsplit.add(name)
+            for phrase in entry.get('phrases', []):
+                words = phrase.split()
+                self.prefixes.update(' '.join(words[:i]) for i in range(1, len(words)))
+            if 'phrases' in entry and entry.get('early', True):
+                self.early.add(name)
+
+            if 'pattern' in entry:
+                # Slot groups are namespaced so names can repeat across intents
+                body, slots = entry['pattern'], []
+                for slot in re.findall(r'\(\?P<(\w+)>', body):
+                    body = body.replace(f'(?P<{slot}>', f'(?P<{name}__{slot}>')
+                    slots.append(slot)
+                self.slots[name] = slots
+            else:
+                # Longest phrase first so prefixes don't shadow longer phrases
+                phrases = sorted(entry['phrases'], key=len, reverse=True)
+                body = '|'.join(re.escape(p) for p in phrases)
+                if entry.get('whole'):
+                    # Only the entire utterance: "stop", but not "stop the music"
+                    body = r'^\s*(?:' + body + r')\s*$'
+                else:
+                    body = r'\b(?:' + body + r')\b'
+                self.slots[name] = []
+
+            alternatives.append(f'(?P<{name}>{body})')
+
+        self.regex = re.compile('|'.join(alternatives))
+
+    def route(self, text):
+        """Return (intent, slots) for the highest-precedence match, or (None, {})"""
+        best, best_match = None, None
+        for match in self.regex.finditer(text):
+            name = match.lastgroup
+            if best is None or self.priority[name] < self.priority[best]:
+                best, best_match = name, match
+                if self.priority[name] == 0:
+                    break
+
+        if best is None:
+            return None, {}
+
+        slots = {
+            slot: best_match.group(f'{best}__{slot}').strip()
+            for slot in self.slots[best]
+        }
+        return best, slots
+
+    def incomplete(self, text):
+        """True if the last words of text could still grow into a longer phrase"""
+        words = text.split()
+        if words and words[-1] in ('and', 'then'):
+            return True  # More of a compound command is on its way
+        return any(' '.join(words[-i:]) in self.prefixes for i in range(1, min(len(words), 3) + 1))
+
+    def plan(self, text, resolves=None):
+        """Split a compound command into stages of [(intent, slots, text)]
+
+        Stages run in order ("mute then lock screen"); the actions of a stage are
+        independent ("open chrome and spotify"). A part that names no
+        intent borrows the verb of the one before it ("... and spotify"),
+        but only if resolves(intent, slots) accepts both parts, so a name
+        like "barnes and noble" isn't split in two. Text that does not
+        split cleanly into intents, or that contains a free-text intent
+        like a reminder, stays a single action.
+        """
+        intent, slots = self.route(text)
+        single = [[(intent, slots, text)]]
+        if intent in self.unsplit or not self.SEPARATOR.search(text):
+            return single
+
+        stages = []
+        previous_intent, previous_slots, previous_part = None, {}, ''
+        for stage_text in self.SEQUENCE.split(text):
+            stage = []
+            for part in self.CONJUNCTION.split(stage_text):
+                if not part:
+                    continue
+                intent, slots = self.route(part)
+                if intent is None and previous_slots:
+                    # Reuse everything before the first slot: "open" of "open chrome"
+                    first = min(previous_part.find(value) for value in previous_slots.values())
+                    part = previous_part[:first] + part
+                    intent, slots = self.route(part)
+                    if resolves is not None and intent is not None and not (
+                            resolves(previous_intent, previous_slots) and resolves(intent, slots)):
+                        return single
+                if intent is None or intent in self.unsplit:
+                    return single
+                previous_intent, previous_slots, previous_part = intent, slots, part
+                stage.append((intent, slots, part))
+            if stage:
+                stages.append(stage)
+        return stages or single
+
+
+class AppIndex:
+    """Alias hash map plus trigram index over the configured applications"""
+
+    PRIOR_WEIGHT = 0.1  # How far usage likelihood can lift a fuzzy match
+
+    def __init__(self, applications):
+        self.source = applications
+        self.priors = {}     # App key -> likelihood of being asked for now
+        self.aliases = {}    # Normalized alias -> app key
+        self.grams = {}      # Alias -> its trigram set
+        self.postings = {}   # Trigram -> aliases containing it
+
+        for app_key, app_data in applications.items():
+            for alias in [app_key, app_key.replace('_', ' ')] + app_data.get('commands', []):
+                alias = self.normalize(alias)
+                if alias and alias not in self.aliases:
+                    self.aliases[alias] = app_key
+
+        for alias in self.aliases:
+            self.grams[alias] = self.trigrams(alias)
+            for gram in self.grams[alias]:
+                self.postings.setdefault(gram, []).append(alias)
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase, drop punctuation and collapse whitespace"""
+        return ' '.join(re.sub(r"[^\w\s]", ' ', text.lower()).split())
+
+    @staticmethod
+    def trigrams(text):
+        """Character trigrams, padded so short words still produce some"""
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def lookup(self, query, limit=5, min_score=0.35):
+        """Return [(app_key, score)] ranked best first"""
+        query = self.normalize(query)
+        if not query:
+            return []
+
+        # Exact alias hit
+        if query in self.aliases:
+            return [(self.aliases[query], 1.0)]
+
+        # Count shared trigrams through the postings lists
+        query_grams = self.trigrams(query)
+        shared = {}
+        for gram in query_grams:
+            for alias in self.postings.get(gram, ()):
+                shared[alias] = shared.get(alias, 0) + 1
+
+        padded_query = f" {query} "
+        scores = {}
+        for alias, count in shared.items():
+            score = 2 * count / (len(query_grams) + len(self.grams[alias]))
+
+            # Whole-word containment either way is a strong signal
+            if f" {alias} " in padded_query or padded_query in f" {alias} ":
+                score = max(score, 0.9)
+
+            app_key = self.aliases[alias]
+            if score >= min_score and score > scores.get(app_key, 0):
+                scores[app_key] = score
+
+        # Among similar matches, prefer the apps the user actually opens
+        ranked = sorted(scores.items(), key=lambda item: (
+            -(item[1] + self.PRIOR_WEIGHT * self.priors.get(item[0], 0)), item[0]))
+        return ranked[:limit]
+
+    def is_prefix(self, query):
+        """True if query is the start of a longer alias ("chrome" of "chrome canary")"""
+        query = self.normalize(query) + ' '
+        return any(alias.startswith(query) for alias in self.aliases)
+
+
+class InstalledApps:
+    """Application bundles found under a set of root folders, persisted between runs
+
+    A refresh re-lists only the folders whose mtime changed since the last
+    one, so an unchanged tree costs a stat per folder. Spoken names come
+    from the bundle's file name and its Info.plist.
+    """
+
+    MAX_DEPTH = 2  # Bundles in /Applications/Utilities and one level below
+
+    def __init__(self, roots, cache_path, logger):
+        self.roots = [os.path.expanduser(root) for root in roots]
+        self.cache_path = Path(cache_path)
+        self.logger = logger
+        self.folders = {}      # Folder -> {'mtime', 'apps': {bundle: names}, 'subfolders'}
+        self.catalog = (AppIndex({}), {})  # Index and app key -> bundle path, swapped together
+        self.refresh_lock = threading.Lock()
+        self.scanner = None    # Thread of the last background refresh
+        self.load()
+
+    def load(self):
+        """Restore the last scan so lookups work before the first refresh"""
+        try:
+            saved = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable app index %s: %s", self.cache_path, e)
+            return
+        if saved.get('roots') == self.roots:
+            self.folders = saved.get('folders', {})
+            self.rebuild()
+
+    def save(self):
+        """Write the index atomically next to its final path"""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        state = {'roots': self.roots, 'folders': self.folders}
+        temp_path.write_text(json.dumps(state), encoding='utf-8')
+        os.replace(temp_path, self.cache_path)
+
+    def refresh(self):
+        """Rescan changed folders; returns True if the set of apps changed"""
+        with self.refresh_lock:
+            started = time.perf_counter()
+            folders = {}
+            listed = sum(self.walk(root, 0, folders) for root in self.roots)
+            changed = folders != self.folders
+            if changed:
+                self.folders = folders
+                self.rebuild()
+                try:
+                    self.save()
+                except OSError as e:
+                    self.logger.error("Could not save app index: %s", e)
+        self.logger.debug("App discovery: %s apps, %s/%s folders re-listed in %.1f ms",
+                          len(self.paths), listed, len(folders),
+                          (time.perf_counter() - started) * 1000)
+        return changed
+
+    def refresh_in_background(self):
+        """Start a refresh on its own thread unless one is still running"""
+        if self.scanner is not None and self.scanner.is_alive():
+            return self.scanner
+        self.scanner = threading.Thread(target=self.refresh, name='JarvisAppScan', daemon=True)
+        self.scanner.start()
+        return self.scanner
+
+    def walk(self, folder, depth, folders):
+        """Record folder and its subfolders into folders; returns how many were re-listed"""
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+        except OSError:
+            return 0
+
+        listed = 0
+        entry = self.folders.get(folder)
+        if entry is None or entry['mtime'] != mtime:
+            entry = {'mtime': mtime, 'apps': {}, 'subfolders': []}
+            listed = 1
+            try:
+                with os.scandir(folder) as entries:
+                    for item in entries:
+                        if item.name.startswith('.') or not item.is_dir():
+                            continue
+                        if item.name.endswith('.app'):
+                            entry['apps'][item.path] = self.bundle_names(item.path)
+                        elif depth < self.MAX_DEPTH:
+                            entry['subfolders'].append(item.path)
+            except OSError as e:
+                self.logger.debug("Could not list %s: %s", folder, e)
+
+        folders[folder] = entry
+        for subfolder in entry['subfolders']:
+            listed += self.walk(subfolder, depth + 1, folders)
+        return listed
+
+    @staticmethod
+    def bundle_names(path):
+        """File name of the bundle plus its display and bundle names"""
+        names = [os.path.basename(path)[:-len('.app')]]
+        try:
+            with open(os.path.join(path, 'Contents', 'Info.plist'), 'rb') as f:
+                info = plistlib.load(f)
+        except (OSError, ValueError, plistlib.InvalidFileException):
+            return names
+        for key in ('CFBundleDisplayName', 'CFBundleName'):
+            name = info.get(key)
+            if isinstance(name, str) and name.strip() and name not in names:
+                names.append(name)
+        return names
+
+    def rebuild(self):
+        """Index the scanned bundles; on duplicate names the earlier root wins"""
+        applications = {}
+        for entry in self.folders.values():
+            for path, names in entry['apps'].items():
+                key = AppIndex.normalize(names[0]).replace(' ', '_')
+                if key and key not in applications:
+                    applications[key] = {'path': path, 'commands': names}
+        paths = {key: app['path'] for key, app in applications.items()}
+        self.catalog = (AppIndex(applications), paths)
+
+    @property
+    def paths(self):
+        """App key -> bundle path of every discovered app"""
+        return self.catalog[1]
+
+    def lookup(self, name, min_score=0.6):
+        """(app key, bundle path) of the best match for name, or None"""
+        index, paths = self.catalog
+        candidates = index.lookup(name, limit=1, min_score=min_score)
+        if not candidates:
+            return None
+        app_key = candidates[0][0]
+        return app_key, paths[app_key]
+
+
+class AudioRingBuffer:
+    """Bounded, preallocated ring buffer of PCM chunks shared between threads"""
+
+    def __init__(self, chunk_bytes, capacity):
+        self.chunk_bytes = chunk_bytes
+        self.capacity = capacity
+        self.buffer = bytearray(chunk_bytes * capacity)
+        self.written = 0  # Total chunks ever written (absolute position)
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def write(self, chunk):
+        """Store one chunk, overwriting the oldest one when full"""
+        if len(chunk) != self.chunk_bytes:
+            chunk = bytes(chunk[:self.chunk_bytes]).ljust(self.chunk_bytes, b'\0')
+
+        with self.condition:
+            offset = (self.written % self.capacity) * self.chunk_bytes
+            self.buffer[offset:offset + self.chunk_bytes] = chunk
+            self.written += 1
+            self.condition.notify_all()
+
+    def read(self, position, timeout=None):
+        """Return (chunk, next_position) for an absolute chunk position"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.written > position or self.closed, timeout)
+            if self.written <= position:
+                return None, position
+
+            # Readers that fell behind skip ahead to the oldest chunk still held
+            position = max(position, self.written - self.capacity)
+            offset = (position % self.capacity) * self.chunk_bytes
+            return bytes(self.buffer[offset:offset + self.chunk_bytes]), position + 1
+
+    def close(self):
+        """Wake up all readers and refuse to block any further"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class BufferedStream:
+    """File-like stream reading sequentially from an AudioRingBuffer"""
+
+    def __init__(self, ring, position, read_timeout=2.0):
+        self.ring = ring
+        self.position = position
+        self.read_timeout = read_timeout
+
+    def read(self, size=None):
+        """Return the next chunk, blocking until the capture thread delivers it"""
+        chunk, self.position = self.ring.read(self.position, timeout=self.read_timeout)
+        if chunk is None:
+            raise OSError("Audio capture stopped")
+        return chunk
+
+    def skip_to_live(self):
+        """Drop any buffered audio and continue from the newest chunk"""
+        self.position = self.ring.written
+
+    def rewind(self, position, chunks):
+        """Continue from chunks before an absolute position, as far back as the buffer holds"""
+        self.position = max(position - chunks, self.ring.written - self.ring.capacity, 0)
+
+    def close(self):
+        """Nothing to release; the capture thread owns the buffer"""
+
+
+class BufferedAudioSource:
+    """AudioSource replaying the shared capture buffer for the recognizer"""
+
+    def __init__(self, capture, position):
+        microphone = capture.microphone
+        self.SAMPLE_RATE = microphone.SAMPLE_RATE
+        self.SAMPLE_WIDTH = microphone.SAMPLE_WIDTH
+        self.CHUNK = microphone.CHUNK
+        self.stream = BufferedStream(capture.ring, position)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+class AudioCapture(threading.Thread):
+    """Long-lived microphone capture thread feeding an AudioRingBuffer"""
+
+    def __init__(self, buffer_seconds=15, device_index=None, logger=None):
+        super().__init__(name='JarvisAudioCapture', daemon=True)
+        self.buffer_seconds = buffer_seconds
+        self.microphone = sr.Microphone(device_index=device_index)
+        self.logger = logger
+        self.ring = None
+        self.monitor = None  # EnergyMonitor while dozing
+        self.stopped = threading.Event()
+
+    def start(self):
+        """Open the device once and start filling the ring buffer"""
+        # Opening in the caller's thread surfaces device errors immediately;
+        # stop() closes it
+        self.microphone.__enter__()  # pylint: disable=unnecessary-dunder-call
+        chunks_per_second = self.microphone.SAMPLE_RATE / self.microphone.CHUNK
+        capacity = max(1, int(self.buffer_seconds * chunks_per_second))
+        self.ring = AudioRingBuffer(self.microphone.CHUNK * self.microphone.SAMPLE_WIDTH, capacity)
+        super().start()
+
+    def run(self):
+        chunk = self.microphone.CHUNK
+        try:
+            while not self.stopped.is_set():
+                monitor = self.monitor
+                if monitor is None:
+                    self.ring.write(self.microphone.stream.read(chunk))
+                    continue
+
+                # Dozing: fewer, larger reads and a cheap energy check on each.
+                # Everything still goes into the ring for lookback
+                start = self.ring.written
+                data = self.microphone.stream.read(chunk * monitor.chunks_per_read)
+                for offset in range(0, len(data), self.ring.chunk_bytes):
+                    self.ring.write(data[offset:offset + self.ring.chunk_bytes])
+                if monitor.spike(data):
+                    self.monitor = None
+                    monitor.on_spike(start)
+        except Exception as e:
+            if self.logger and not self.stopped.is_set():
+                self.logger.error("Audio capture error: %s", e)
+        finally:
+            self.ring.close()
+            # Don't leave a dozing listener waiting on a dead device
+            monitor, self.monitor = self.monitor, None
+            if monitor is not None:
+                monitor.on_spike(self.ring.written)
+
+    def doze(self, monitor):
+        """Switch to large reads checked by monitor until it fires (None: full rate)"""
+        self.monitor = monitor
+
+    def source(self):
+        """Return a recognizer source that starts at the live edge of the buffer"""
+        # The recognizer requires an AudioSource subclass; speech_recognition
+        # is imported lazily, so the subclass is created here
+        source_class = type('BufferedAudioSource', (BufferedAudioSource, sr.AudioSource), {})
+        return source_class(self, self.ring.written)
+
+    def stop(self):
+        """Stop capturing and release the device"""
+        self.stopped.set()
+        if self.is_alive():
+            self.join(timeout=2)
+        try:
+            self.microphone.__exit__(None, None, None)
+        except Exception:
+            pass
+
+
+class EnergyMonitor:
+    """Cheap energy gate the capture thread runs while Jarvis dozes
+
+    Audio is read chunks_per_read chunks at a time and its RMS taken over
+    every step-th sample only. on_spike(position) is called with the ring
+    position of the first read above threshold.
+    """
+
+    def __init__(self, threshold, sample_width, on_spike, chunks_per_read=8, step=4):
+        self.threshold = threshold
+        self.sample_width = sample_width
+        self.on_spike = on_spike
+        self.chunks_per_read = max(1, chunks_per_read)
+        self.step = max(1, step)
+
+    def spike(self, data):
+        """Whether a chunk is louder than the wake-up threshold"""
+        return chunk_rms(data, self.sample_width, self.step) > self.threshold
+
+
+class PhraseCache:
+    """On-disk, size-bounded LRU cache of pre-rendered speech clips"""
+
+    def __init__(self, directory, voice, rate, volume, max_bytes, logger):
+        self.logger = logger
+        self.max_bytes = max_bytes
+        self.extension = '.aiff' if sys.platform == 'darwin' else '.wav'
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # Clip name -> size, least recently used first
+        self.size = 0
+
+        # One directory per voice setting; changing settings invalidates the rest
+        settings = json.dumps([voice, rate, volume])
+        self.root = Path(directory)
+        self.directory = self.root / hashlib.sha1(settings.encode()).hexdigest()[:12]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.purge_stale()
+        self.load()
+
+    def purge_stale(self):
+        """Delete clips rendered with other voice settings"""
+        for entry in self.root.iterdir():
+            if entry.is_dir() and entry != self.directory:
+                shutil.rmtree(entry, ignore_errors=True)
+                self.logger.info("Voice settings changed, dropped TTS cache %s", entry.name)
+
+    def load(self):
+        """Index existing clips, oldest access first"""
+        clips = sorted(self.directory.glob(f'*{self.extension}'), key=lambda p: p.stat().st_mtime)
+        for clip in clips:
+            size = clip.stat().st_size
+            self.entries[clip.name] = size
+            self.size += size
+
+    def path_for(self, text):
+        """Cache file for text, named by a hash of it"""
+        return self.directory / (hashlib.sha1(text.encode()).hexdigest()[:20] + self.extension)
+
+    def get(self, text):
+        """Return the clip path for text, or None on a miss"""
+        path = self.path_for(text)
+        with self.lock:
+            if path.name not in self.entries:
+                return None
+            self.entries.move_to_end(path.name)
+
+        try:
+            os.utime(path)  # Persist recency across restarts
+        except OSError:
+            with self.lock:
+                self.size -= self.entries.pop(path.name, 0)
+            return None
+        return path
+
+    def contains(self, text):
+        """Whether text has a cached clip, without touching its recency"""
+        return self.path_for(text).name in self.entries
+
+    def add(self, text, rendered):
+        """Move a freshly rendered file into the cache and evict if over budget"""
+        path = self.path_for(text)
+        os.replace(rendered, path)
+        size = path.stat().st_size
+
+        with self.lock:
+            self.size += size - self.entries.pop(path.name, 0)
+            self.entries[path.name] = size
+
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                name, evicted = self.entries.popitem(last=False)
+                self.size -= evicted
+                try:
+                    (self.directory / name).unlink()
+                except OSError:
+                    pass
+        return path
+
+
+class SpeechHandle:
+    """Handle for a queued utterance that can be awaited or cancelled"""
+
+    def __init__(self, text, priority, render=False):
+        self.text = text
+        self.priority = priority
+        self.render = render  # Only synthesize into the phrase cache
+        self.cancelled = False
+        self.turn = None  # Metrics turn that queued the utterance
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Block until the utterance finished or was cancelled"""
+        return self.done.wait(timeout)
+
+    def cancel(self):
+        """Skip the utterance, or cut it off if it is already playing"""
+        self.cancelled = True
+
+    def finished(self):
+        """Whether the utterance has been spoken (or dropped)"""
+        return self.done.is_set()
+
+
+class SpeechWorker(threading.Thread):
+    """Owns the TTS engine and speaks queued utterances in priority order"""
+
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_LOW = 2
+    PRIORITY_WARM = 5
+    SHUTDOWN = 99
+
+    def __init__(self, engine_factory, logger, cache_factory=None, metrics=None):
+        super().__init__(name='JarvisSpeech', daemon=True)
+        self.metrics = metrics or NullMetrics()
+        self.engine_factory = engine_factory
+        self.cache_factory = cache_factory
+        self.logger = logger
+        self.engine = None
+        self.cache = None
+        self.player = None
+        self.playing = None
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.current = None
+        self.pending = 0
+        self.idle = threading.Condition()
+        self.idle_callbacks = []
+        self.init_seconds = None
+
+    def run(self):
+        # pyttsx3 engines must be driven from the thread that created them
+        started = time.perf_counter()
+        self.engine = self.engine_factory()
+        if self.engine:
+            self.engine.connect('started-word', self.on_word)
+            self.cache = self.open_cache()
+        self.init_seconds = time.perf_counter() - started
+
+        while True:
+            _, _, handle = self.queue.get()
+            if handle is None:
+                break
+
+            self.current = handle
+            started = time.perf_counter()
+            try:
+                if handle.cancelled or not self.engine:
+                    pass
+                elif handle.render:
+                    self.render(handle.text)
+                elif not self.play_cached(handle):
+                    self.engine.say(handle.text)
+                    self.engine.runAndWait()
+            except Exception as e:
+                self.logger.error("TTS Error: %s", e)
+            finally:
+                self.current = None
+                if not handle.render and not handle.cancelled:
+                    self.metrics.observe('speak', time.perf_counter() - started, turn=handle.turn)
+                self.complete(handle)
+
+    def open_cache(self):
+        """Create the phrase cache once the engine's voice settings are known"""
+        self.player = shutil.which('afplay') or shutil.which('aplay') or shutil.which('paplay')
+        if self.cache_factory is None or self.player is None:
+            return None
+        try:
+            return self.cache_factory(
+                self.engine.getProperty('voice'),
+                self.engine.getProperty('rate'),
+                self.engine.getProperty('volume')
+            )
+        except OSError as e:
+            self.logger.error("TTS cache unavailable: %s", e)
+            return None
+
+    def play_cached(self, handle):
+        """Play a pre-rendered clip for the handle's text if one is cached"""
+        path = self.cache.get(handle.text) if self.cache else None
+        if path is None:
+            return False
+
+        # pylint: disable-next=consider-using-with  # Kept so a barge-in can terminate it
+        self.playing = subprocess.Popen([self.player, str(path)],
+                                        stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL)
+        try:
+            if handle.cancelled:
+                self.playing.terminate()
+            self.playing.wait()
+        finally:
+            self.playing = None
+        return True
+
+    def render(self, text):
+        """Synthesize text into the phrase cache without playing it"""
+        if self.cache is None or self.cache.contains(text):
+            return
+        fd, temp_path = tempfile.mkstemp(suffix=self.cache.extension, dir=self.cache.directory)
+        os.close(fd)
+        try:
+            self.engine.save_to_file(text, temp_path)
+            self.engine.runAndWait()
+            if os.path.getsize(temp_path) > 0:
+                self.cache.add(text, temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+    def on_word(self, name, location, length):
+        """Stop playback at the next word boundary once cancelled"""
+        if self.current is not None and self.current.cancelled:
+            self.engine.stop()
+
+    def complete(self, handle):
+        """Mark handle done and wake anyone waiting for the queue to drain"""
+        handle.done.set()
+        if not handle.render:
+            with self.idle:
+                self.pending -= 1
+                self.idle.notify_all()
+                callbacks = []
+                if self.pending <= 0:
+                    callbacks, self.idle_callbacks = self.idle_callbacks, []
+            for callback in callbacks:
+                callback()
+
+    def say(self, text, priority=PRIORITY_NORMAL):
+        """Queue text and return its SpeechHandle immediately"""
+        handle = SpeechHandle(text, priority)
+        handle.turn = self.metrics.active()
+        with self.idle:
+            self.pending += 1
+        self.queue.put((priority, next(self.sequence), handle))
+        return handle
+
+    def warm(self, phrases):
+        """Render phrases into the cache whenever nothing else is queued"""
+        for text in dict.fromkeys(phrases):
+            handle = SpeechHandle(text, self.PRIORITY_WARM, render=True)
+            self.queue.put((self.PRIORITY_WARM, next(self.sequence), handle))
+
+    def busy(self):
+        """Whether anything is queued or being spoken"""
+        return self.pending > 0
+
+    def wait_idle(self, timeout=None):
+        """Block until everything queued so far has been spoken"""
+        with self.idle:
+            return self.idle.wait_for(lambda: self.pending <= 0, timeout)
+
+    def on_idle(self, callback):
+        """Call callback() once everything queued so far has been spoken"""
+        with self.idle:
+            if self.pending > 0:
+                self.idle_callbacks.append(callback)
+                return
+        callback()
+
+    def cancel_pending(self, include_warm=False):
+        """Barge-in: drop queued utterances and cut off the current one"""
+        with self.queue.mutex:
+            for _, _, handle in self.queue.queue:
+                if handle is not None and (include_warm or not handle.render):
+                    handle.cancel()
+
+        current = self.current
+        if current is not None and not current.render:
+            current.cancel()
+            player = self.playing
+            if player is not None:
+                player.terminate()
+
+    def shutdown(self, drain=True, timeout=10):
+        """Stop the worker, optionally after speaking what is still queued"""
+        if drain:
+            # Still speak pending replies, but skip cache warming
+            with self.queue.mutex:
+                for _, _, handle in self.queue.queue:
+                    if handle is not None and handle.render:
+                        handle.cancel()
+        else:
+            self.cancel_pending(include_warm=True)
+        self.queue.put((self.SHUTDOWN, next(self.sequence), None))
+        if self.is_alive():
+            self.join(timeout)
+
+
+def read_wav(path):
+    """Read a WAV file and return (mono PCM bytes, sample rate, sample width)"""
+    with wave.open(str(path), 'rb') as wav:
+        channels = wav.getnchannels()
+        sample_rate = wav.getframerate()
+        sample_width = wav.getsampwidth()
+        frames = wav.readframes(wav.getnframes())
+
+    if channels > 1:
+        samples = pcm_to_float(frames, sample_width).reshape(-1, channels).mean(axis=1)
+        frames = (samples * 32767).astype('<i2').tobytes()
+        sample_width = 2
+
+    return frames, sample_rate, sample_width
+
+
+def pcm_to_float(pcm, sample_width):
+    """Convert little-endian signed PCM bytes to float samples in [-1, 1]"""
+    if sample_width == 1:
+        return (np.frombuffer(pcm, dtype=np.uint8).astype(np.float32) - 128) / 128
+    if sample_width == 3:
+        raw = np.frombuffer(pcm, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(raw), 4), dtype=np.uint8)
+        padded[:, 1:] = raw
+        return padded.view('<i4').ravel().astype(np.float32) / 2147483648
+    dtype = {2: '<i2', 4: '<i4'}[sample_width]
+    scale = float(2 ** (8 * sample_width - 1))
+    return np.frombuffer(pcm, dtype=dtype).astype(np.float32) / scale
+
+
+class WakeWordSpotter:
+    """On-device wake word spotter: energy gate plus MFCC/DTW template matching"""
+
+    FRAME_SECONDS = 0.025
+    HOP_SECONDS = 0.010
+    MEL_FILTERS = 26
+    CEPSTRA = 13
+
+    def __init__(self, threshold=None, energy_threshold=0.01, logger=None):
+        self.threshold = threshold
+        self.energy_threshold = energy_threshold
+        self.logger = logger
+        self.templates = []
+        self.filterbanks = {}
+
+    @staticmethod
+    def available():
+        """The spotter needs NumPy; without it Jarvis falls back to the cloud"""
+        return load_numpy() is not None
+
+    def ready(self):
+        """Whether NumPy is present and at least one sample is enrolled"""
+        return self.available() and bool(self.templates)
+
+    def load_templates(self, directory):
+        """Enroll every WAV sample of the wake word found in directory"""
+        self.templates = []
+        if not self.available() or not os.path.isdir(directory):
+            return 0
+
+        for path in sorted(Path(directory).glob('*.wav')):
+            try:
+                self.enroll(*read_wav(path))
+            except (wave.Error, EOFError, KeyError) as e:
+                if self.logger:
+                    self.logger.error("Skipping wake word sample %s: %s", path, e)
+
+        if self.threshold is None:
+            self.threshold = self.calibrate_threshold()
+        return len(self.templates)
+
+    def enroll(self, pcm, sample_rate, sample_width):
+        """Add one spoken sample of the wake word as a template"""
+        features = self.features(pcm, sample_rate, sample_width)
+        if features is not None:
+            self.templates.append(features)
+
+    def calibrate_threshold(self, margin=1.25, default=0.55):
+        """Derive the match threshold from the spread between enrolled samples"""
+        if len(self.templates) < 2:
+            return default
+        distances = [
+            self.dtw_distance(a, b)
+            for i, a in enumerate(self.templates)
+            for b in self.templates[i + 1:]
+        ]
+        return max(distances) * margin
+
+    def frames(self, samples, sample_rate):
+        """Split samples into overlapping Hamming-windowed frames"""
+        frame_length = int(sample_rate * self.FRAME_SECONDS)
+        hop = int(sample_rate * self.HOP_SECONDS)
+        if len(samples) < frame_length:
+            return None
+        count = 1 + (len(samples) - frame_length) // hop
+        index = np.arange(frame_length)[None, :] + hop * np.arange(count)[:, None]
+        return samples[index] * np.hamming(frame_length)
+
+    def voiced(self, frames):
+        """Energy gate: return only frames loud enough to contain speech"""
+        rms = np.sqrt(np.mean(frames ** 2, axis=1))
+        loud = np.nonzero(rms >= self.energy_threshold)[0]
+        if len(loud) == 0:
+            return None
+        return frames[loud[0]:loud[-1] + 1]
+
+    def filterbank(self, sample_rate, nfft):
+        """Mel filterbank between 100 Hz and 4 kHz, cached per rate"""
+        key = (sample_rate, nfft)
+        if key not in self.filterbanks:
+            def to_mel(hz):
+                return 2595 * np.log10(1 + hz / 700)
+
+            high = min(4000, sample_rate / 2)
+            mels = np.linspace(to_mel(100), to_mel(high), self.MEL_FILTERS + 2)
+            hz = 700 * (10 ** (mels / 2595) - 1)
+            bins = np.floor((nfft + 1) * hz / sample_rate).astype(int)
+
+            bank = np.zeros((self.MEL_FILTERS, nfft // 2 + 1))
+            for m in range(1, self.MEL_FILTERS + 1):
+                left, center, right = bins[m - 1], bins[m], bins[m + 1]
+                if center > left:
+                    bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+                if right > center:
+                    falling = right - np.arange(center, right)
+                    bank[m - 1, center:right] = falling / (right - center)
+            self.filterbanks[key] = bank
+        return self.filterbanks[key]
+
+    def features(self, pcm, sample_rate, sample_width):
+        """Return mean-normalized MFCCs for the voiced part of a clip"""
+        samples = pcm_to_float(pcm, sample_width)
+        samples = np.append(samples[0], samples[1:] - 0.97 * samples[:-1])
+
+        frames = self.frames(samples, sample_rate)
+        if frames is None:
+            return None
+        frames = self.voiced(frames)
+        if frames is None:
+            return None
+
+        nfft = 1 << (frames.shape[1] - 1).bit_length()
+        power = np.abs(np.fft.rfft(frames, nfft)) ** 2 / nfft
+        energies = np.log(power @ self.filterbank(sample_rate, nfft).T + 1e-10)
+
+        # DCT-II, dropping c0 so overall loudness doesn't matter
+        n = np.arange(self.MEL_FILTERS)
+        k = np.arange(1, self.CEPSTRA)[:, None]
+        dct = np.cos(np.pi * k * (2 * n + 1) / (2 * self.MEL_FILTERS))
+        cepstra = energies @ dct.T
+        return cepstra - cepstra.mean(axis=0)
+
+    @staticmethod
+    def dtw_distance(template, clip):
+        """Subsequence DTW: best alignment of template anywhere inside clip"""
+        cost = np.sqrt(((template[:, None, :] - clip[None, :, :]) ** 2).sum(axis=2))
+        cost /= template.shape[1]
+
+        # Steps (1,0), (1,1), (1,2) only look at the previous row, so each
+        # row is computed in one vectorized operation
+        total = cost[0].copy()
+        for row in cost[1:]:
+            previous = total.copy()
+            previous[1:] = np.minimum(previous[1:], total[:-1])
+            previous[2:] = np.minimum(previous[2:], total[:-2])
+            total = row + previous
+        return float(total.min()) / len(template)
+
+    def score(self, pcm, sample_rate, sample_width):
+        """Return the best template distance for a clip, or None if it is silent"""
+        if not self.ready():
+            return None
+        features = self.features(pcm, sample_rate, sample_width)
+        if features is None:
+            return None
+        return min(self.dtw_distance(template, features) for template in self.templates)
+
+    def detect(self, pcm, sample_rate, sample_width):
+        """Return True when the clip contains the enrolled wake word"""
+        distance = self.score(pcm, sample_rate, sample_width)
+        if self.logger and distance is not None:
+            self.logger.debug("Wake word distance: %.3f (threshold %.3f)", distance, self.threshold)
+        return distance is not None and distance <= self.threshold
+
+    def evaluate(self, fixtures_dir):
+        """Measure false accepts/rejects and CPU cost on positive/ and negative/ WAVs"""
+        report = {
+            'positives': 0, 'negatives': 0,
+            'false_rejects': 0, 'false_accepts': 0,
+            'audio_seconds': 0.0, 'cpu_seconds': 0.0
+        }
+
+        for label in ('positive', 'negative'):
+            for path in sorted(Path(fixtures_dir, label).glob('*.wav')):
+                pcm, sample_rate, sample_width = read_wav(path)
+                report['audio_seconds'] += len(pcm) / sample_width / sample_rate
+
+                started = time.process_time()
+                hit = self.detect(pcm, sample_rate, sample_width)
+                report['cpu_seconds'] += time.process_time() - started
+
+                if label == 'positive':
+                    report['positives'] += 1
+                    report['false_rejects'] += not hit
+                else:
+                    report['negatives'] += 1
+                    report['false_accepts'] += hit
+
+        report['false_reject_rate'] = report['false_rejects'] / max(1, report['positives'])
+        report['false_accept_rate'] = report['false_accepts'] / max(1, report['negatives'])
+        audio_hours = report['audio_seconds'] / 3600
+        report['cpu_seconds_per_audio_hour'] = (report['cpu_seconds'] / audio_hours
+                                                if audio_hours else 0.0)
+        return report
+
+
+class VoiceActivityDetector:
+    """Trims silence from captured clips and rejects clips with no speech
+
+    A frame is speech when it is loud relative to the clip's noise floor,
+    tonal (low spectral flatness, unlike hiss and clicks) and has the low
+    zero-crossing rate of voiced sound. Hangover and padding keep the
+    pauses and unvoiced consonants around voiced frames. All features are
+    computed for every frame at once.
+    """
+
+    FRAME_SECONDS = 0.02
+
+    def __init__(self, energy_margin_db=10.0, min_energy_db=-50.0, flatness_max=0.45,
+                 zcr_max=0.35, hangover_seconds=0.3, padding_seconds=0.15, min_speech_seconds=0.1,
+                 logger=None):
+        self.energy_margin_db = energy_margin_db
+        self.min_energy_db = min_energy_db
+        self.flatness_max = flatness_max
+        self.zcr_max = zcr_max
+        self.hangover_seconds = hangover_seconds
+        self.padding_seconds = padding_seconds
+        self.min_speech_seconds = min_speech_seconds
+        self.logger = logger
+        # Running totals for the session
+        self.clips = 0
+        self.dropped = 0
+        self.bytes_in = 0
+        self.bytes_saved = 0
+
+    @staticmethod
+    def available():
+        """Whether NumPy, which the detector needs, is installed"""
+        return load_numpy() is not None
+
+    def speech_frames(self, samples, sample_rate):
+        """Boolean speech mask over consecutive FRAME_SECONDS frames (after hangover)"""
+        frame_length = max(1, int(sample_rate * self.FRAME_SECONDS))
+        count = len(samples) // frame_length
+        if count == 0:
+            return np.zeros(0, dtype=bool), frame_length
+        frames = samples[:count * frame_length].reshape(count, frame_length)
+
+        energy_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+        power = np.abs(np.fft.rfft(frames * np.hanning(frame_length), axis=1)) ** 2 + 1e-12
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+
+        # The quietest tenth of the clip approximates the background noise
+        floor = np.percentile(energy_db, 10)
+        loud = (energy_db > floor + self.energy_margin_db) & (energy_db > self.min_energy_db)
+        speech = loud & (flatness < self.flatness_max) & (zcr < self.zcr_max)
+
+        # Hangover: a frame stays active for a while after the last speech frame
+        hangover = max(1, int(self.hangover_seconds / self.FRAME_SECONDS))
+        active = np.convolve(speech.astype(np.int32), np.ones(hangover, dtype=np.int32))[:count] > 0
+        if speech.sum() * self.FRAME_SECONDS < self.min_speech_seconds:
+            active[:] = False
+        return active, frame_length
+
+    def trim(self, pcm, sample_rate, sample_width):
+        """Return (trimmed PCM or None if there is no speech, report dict)"""
+        samples = pcm_to_float(pcm, sample_width)
+        active, frame_length = self.speech_frames(samples, sample_rate)
+        voiced = np.nonzero(active)[0]
+
+        if len(voiced):
+            padding = int(self.padding_seconds * sample_rate)
+            start = max(0, voiced[0] * frame_length - padding)
+            end = min(len(samples), (voiced[-1] + 1) * frame_length + padding)
+            trimmed = pcm[start * sample_width:end * sample_width]
+        else:
+            trimmed = None
+
+        kept = len(trimmed) if trimmed is not None else 0
+        report = {
+            'speech': trimmed is not None,
+            'bytes_in': len(pcm),
+            'bytes_saved': len(pcm) - kept,
+            'seconds_in': round(len(pcm) / sample_width / sample_rate, 3),
+            'seconds_saved': round((len(pcm) - kept) / sample_width / sample_rate, 3),
+        }
+        self.clips += 1
+        self.dropped += trimmed is None
+        self.bytes_in += len(pcm)
+        self.bytes_saved += report['bytes_saved']
+        return trimmed, report
+
+    def evaluate(self, fixtures_dir):
+        """Measure speech/no-speech accuracy, bytes saved and CPU cost on speech/, silence/ WAVs"""
+        report = {
+            'speech_clips': 0, 'silence_clips': 0,
+            'missed_speech': 0, 'passed_silence': 0,
+            'bytes_in': 0, 'bytes_saved': 0,
+            'audio_seconds': 0.0, 'cpu_seconds': 0.0
+        }
+
+        for label in ('speech', 'silence'):
+            for path in sorted(Path(fixtures_dir, label).glob('*.wav')):
+                pcm, sample_rate, sample_width = read_wav(path)
+                report['audio_seconds'] += len(pcm) / sample_width / sample_rate
+
+                started = time.process_time()
+                trimmed, clip = self.trim(pcm, sample_rate, sample_width)
+                report['cpu_seconds'] += time.process_time() - started
+                report['bytes_in'] += clip['bytes_in']
+                report['bytes_saved'] += clip['bytes_saved']
+
+                if label == 'speech':
+                    report['speech_clips'] += 1
+                    report['missed_speech'] += trimmed is None
+                else:
+                    report['silence_clips'] += 1
+                    report['passed_silence'] += trimmed is not None
+
+        report['bytes_saved_ratio'] = report['bytes_saved'] / max(1, report['bytes_in'])
+        audio_hours = report['audio_seconds'] / 3600
+        report['cpu_seconds_per_audio_hour'] = (report['cpu_seconds'] / audio_hours
+                                                if audio_hours else 0.0)
+        return report
+
+
+class AudioPreprocessor:
+    """Downmix, resample and normalize captured audio before it is uploaded
+
+    Resampling is polyphase: a Kaiser-windowed sinc low-pass is split
+    into one sub-filter per output phase and applied to blocks of output
+    samples with a single matrix product, so no zero-stuffed signal is
+    ever built.
+    """
+
+    ZERO_CROSSINGS = 10
+    BLOCK = 8192
+
+    def __init__(self, target_rate=16000, normalize=True, target_peak_dbfs=-3.0, max_gain_db=20.0):
+        self.target_rate = target_rate
+        self.normalize = normalize
+        self.target_peak = 10 ** (target_peak_dbfs / 20)
+        self.max_gain = 10 ** (max_gain_db / 20)
+        self.filters = {}
+
+    @staticmethod
+    def available():
+        """Whether NumPy, which resampling needs, is installed"""
+        return load_numpy() is not None
+
+    def polyphase_filter(self, up, down):
+        """Sub-filters of shape (up, taps per phase), cached per ratio"""
+        key = (up, down)
+        if key not in self.filters:
+            half = self.ZERO_CROSSINGS * max(up, down)
+            n = np.arange(-half, half + 1)
+            cutoff = 0.5 / max(up, down)  # Of the upsampled rate
+            taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(len(n), 5.0) * up
+            per_phase = -(-len(taps) // up)
+            padded = np.zeros(per_phase * up)
+            padded[:len(taps)] = taps
+            self.filters[key] = (padded.reshape(per_phase, up).T.astype(np.float32), half)
+        return self.filters[key]
+
+    def resample(self, samples, rate):
+        """Resample float samples from rate to target_rate"""
+        if rate == self.target_rate or len(samples) == 0:
+            return samples
+        divisor = math.gcd(rate, self.target_rate)
+        up, down = self.target_rate // divisor, rate // divisor
+        bank, delay = self.polyphase_filter(up, down)
+        per_phase = bank.shape[1]
+
+        # y[n] = sum_k h[p + k*up] * x[base - k], where t = n*down + delay,
+        # p = t % up and base = t // up
+        count = -(-len(samples) * up // down)
+        padded = np.concatenate([np.zeros(per_phase, dtype=np.float32), samples.astype(np.float32),
+                                 np.zeros(delay // up + 2, dtype=np.float32)])
+        output = np.empty(count, dtype=np.float32)
+        offsets = per_phase - np.arange(per_phase)
+        for start in range(0, count, self.BLOCK):
+            t = np.arange(start, min(count, start + self.BLOCK), dtype=np.int64) * down + delay
+            windows = padded[(t // up)[:, None] + offsets[None, :]]
+            output[start:start + len(t)] = np.einsum('nk,nk->n', windows, bank[t % up])
+        return output
+
+    def process(self, pcm, sample_rate, sample_width, channels=1):
+        """Return (16-bit mono PCM, rate, 2); audio is only ever downsampled"""
+        samples = pcm_to_float(pcm, sample_width)
+        if channels > 1:
+            whole = len(samples) - len(samples) % channels
+            samples = samples[:whole].reshape(-1, channels).mean(axis=1)
+
+        if sample_rate > self.target_rate:
+            samples = self.resample(samples, sample_rate)
+            sample_rate = self.target_rate
+
+        if self.normalize and len(samples):
+            peak = float(np.max(np.abs(samples)))
+            if peak > 0:
+                samples = samples * min(self.max_gain, self.target_peak / peak)
+
+        pcm16 = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+        return pcm16, sample_rate, 2
+
+
+def chunk_rms(chunk, sample_width, step=1):
+    """RMS of a PCM chunk, on the same scale as the recognizer's energy_threshold
+
+    With step > 1 only every step-th sample is used, i.e. the chunk is
+    measured at a fraction of its sample rate.
+    """
+    if sample_width == 2:
+        samples = array('h', chunk[:len(chunk) - len(chunk) % 2])
+        if sys.byteorder == 'big':
+            samples.byteswap()
+        if step > 1:
+            samples = samples[::step]
+    elif load_numpy() is not None:
+        samples = (pcm_to_float(chunk, sample_width)[::step] * 2 ** (8 * sample_width - 1)).tolist()
+    else:
+        return 0.0
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(sample * sample for sample in samples) / len(samples))
+
+
+class StreamingBackend:
+    """Interface for recognizers that take audio as it is captured
+
+    start() opens an utterance, feed() takes each chunk and returns the
+    current partial hypothesis, finish() returns the final transcript.
+    """
+
+    name = 'base'
+
+    def start(self, sample_rate, sample_width):
+        """Begin a new utterance"""
+        raise NotImplementedError
+
+    def feed(self, chunk):
+        """Take one chunk of PCM; returns the partial transcript so far"""
+        raise NotImplementedError
+
+    def finish(self):
+        """End the utterance; returns the final transcript"""
+        raise NotImplementedError
+
+
+class ScriptedStreamingBackend(StreamingBackend):
+    """Local stand-in: reveals a known transcript word by word as audio arrives
+
+    Used to test streaming and early dispatch without a speech model;
+    final_latency simulates the upload and decode a real backend needs.
+    """
+
+    name = 'scripted'
+
+    def __init__(self, transcript, words_per_second=2.5, final_latency=0.4):
+        self.words = transcript.lower().split()
+        self.words_per_second = words_per_second
+        self.final_latency = final_latency
+        self.bytes_per_second = None  # Set by start()
+        self.fed = 0
+
+    def start(self, sample_rate, sample_width):
+        self.bytes_per_second = sample_rate * sample_width
+        self.fed = 0
+
+    def feed(self, chunk):
+        self.fed += len(chunk)
+        revealed = int(self.fed / self.bytes_per_second * self.words_per_second)
+        return ' '.join(self.words[:revealed])
+
+    def finish(self):
+        time.sleep(self.final_latency)
+        return ' '.join(self.words)
+
+
+class VoskStreamingBackend(StreamingBackend):
+    """Offline streaming recognition with Vosk (optional: pip install vosk)"""
+
+    name = 'vosk'
+
+    def __init__(self, model_path):
+        import vosk  # pylint: disable=import-error  # Optional, see available()
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+        self.recognizer = None  # One per utterance, from start()
+        self.segments = []
+
+    @staticmethod
+    def available():
+        """Whether the vosk package is installed"""
+        try:
+            import vosk  # noqa: F401  # pylint: disable=import-error,unused-import
+            return True
+        except ImportError:
+            return False
+
+    def start(self, sample_rate, sample_width):
+        self.recognizer = self.vosk.KaldiRecognizer(self.model, sample_rate)
+        self.segments = []
+
+    def feed(self, chunk):
+        if self.recognizer.AcceptWaveform(chunk):
+            text = json.loads(self.recognizer.Result()).get('text', '')
+            if text:
+                self.segments.append(text)
+            partial = ''
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get('partial', '')
+        return ' '.join(self.segments + [partial]).strip()
+
+    def finish(self):
+        text = json.loads(self.recognizer.FinalResult()).get('text', '')
+        return ' '.join(self.segments + [text]).strip()
+
+
+class WavStreamSource:
+    """Plays a WAV file as if it were a live microphone (for streaming tests)"""
+
+    CHUNK = 1024
+
+    def __init__(self, path, realtime=True, tail_seconds=2.0):
+        pcm, self.SAMPLE_RATE, self.SAMPLE_WIDTH = read_wav(path)
+        # Trailing silence lets end-of-speech detection run its course
+        pcm += b'\x00' * int(tail_seconds * self.SAMPLE_RATE) * self.SAMPLE_WIDTH
+        self.stream = self
+        self.pcm = pcm
+        self.position = 0
+        self.realtime = realtime
+
+    def read(self, frames):
+        """Return up to frames samples of PCM, sleeping like a live device when realtime"""
+        size = frames * self.SAMPLE_WIDTH
+        chunk = self.pcm[self.position:self.position + size]
+        self.position += len(chunk)
+        if self.realtime and chunk:
+            time.sleep(len(chunk) / self.SAMPLE_WIDTH / self.SAMPLE_RATE)
+        return chunk
+
+
+RecognitionResult = namedtuple('RecognitionResult', 'text confidence backend latency')
+
+
+class RecognitionBackend:
+    """Interface for whole-utterance recognizers used by HedgedRecognizer
+
+    recognize() returns (text, confidence), with confidence None when the
+    engine does not score its results, and raises sr.UnknownValueError or
+    sr.RequestError like the speech_recognition methods do. cancelled is
+    set once another backend has won; long-running backends may check it.
+    """
+
+    name = 'base'
+
+    def recognize(self, audio, cancelled):
+        """Return (text, confidence) for audio, or raise like speech_recognition"""
+        raise NotImplementedError
+
+
+class GoogleBackend(RecognitionBackend):
+    """Google Web Speech API through speech_recognition"""
+
+    name = 'google'
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    def recognize(self, audio, cancelled):
+        result = self.recognizer.recognize_google(audio, show_all=True)
+        if not isinstance(result, dict) or not result.get('alternative'):
+            raise sr.UnknownValueError()
+        best = max(result['alternative'], key=lambda alternative: alternative.get('confidence', 0))
+        return best['transcript'], best.get('confidence')
+
+
+class SphinxBackend(RecognitionBackend):
+    """Offline CMU Sphinx (optional: pip install pocketsphinx); unscored"""
+
+    name = 'sphinx'
+
+    def __init__(self, recognizer):
+        self.recognizer = recognizer
+
+    @staticmethod
+    def available():
+        """Whether the pocketsphinx package is installed"""
+        try:
+            import pocketsphinx  # noqa: F401  # pylint: disable=import-error,unused-import
+            return True
+        except ImportError:
+            return False
+
+    def recognize(self, audio, cancelled):
+        return self.recognizer.recognize_sphinx(audio), None
+
+
+class VoskBackend(RecognitionBackend):
+    """Offline Vosk on the whole utterance, scored by mean word confidence"""
+
+    name = 'vosk'
+
+    def __init__(self, model_path):
+        import vosk  # pylint: disable=import-error  # Optional, see available()
+        vosk.SetLogLevel(-1)
+        self.vosk = vosk
+        self.model = vosk.Model(model_path)
+
+    available = staticmethod(VoskStreamingBackend.available)
+
+    def recognize(self, audio, cancelled):
+        recognizer = self.vosk.KaldiRecognizer(self.model, audio.sample_rate)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+        words = result.get('result') or []
+        if not result.get('text') or not words:
+            raise sr.UnknownValueError()
+        return result['text'], sum(word['conf'] for word in words) / len(words)
+
+
+class FakeRecognitionBackend(RecognitionBackend):
+    """Local stand-in with an injected delay, for testing hedged recognition
+
+    delay may be a number or a callable returning one per call; error is
+    an exception instance to raise instead of answering.
+    """
+
+    def __init__(self, name, text, confidence=0.9, delay=0.1, error=None):
+        self.name = name
+        self.text = text
+        self.confidence = confidence
+        self.delay = delay
+        self.error = error
+
+    def recognize(self, audio, cancelled):
+        delay = self.delay() if callable(self.delay) else self.delay
+        if cancelled.wait(delay):
+            raise sr.RequestError(f"{self.name} cancelled")
+        if self.error is not None:
+            raise self.error
+        return self.text, self.confidence
+
+
+class BackendStats:
+    """Rolling win rate and latency of one recognition backend"""
+
+    ALPHA = 0.2  # Weight of the newest latency sample
+
+    def __init__(self, window=100):
+        self.attempts = 0
+        self.wins = 0
+        self.errors = 0
+        self.latency = None  # Exponentially weighted, seconds
+        self.samples = deque(maxlen=window)
+
+    def record(self, seconds, failed=False):
+        """Count one attempt and fold its latency into the moving average"""
+        self.attempts += 1
+        self.errors += failed
+        self.samples.append(seconds)
+        self.latency = seconds if self.latency is None else \
+            self.ALPHA * seconds + (1 - self.ALPHA) * self.latency
+
+    @property
+    def win_rate(self):
+        """Share of attempts this backend won, smoothed"""
+        # Laplace smoothing keeps a new backend from ranking first or last outright
+        return (self.wins + 1) / (self.attempts + 2)
+
+    def summary(self):
+        """Counts, latency quantiles and win rate for the report"""
+        samples = sorted(self.samples)
+        return {
+            'attempts': self.attempts,
+            'wins': self.wins,
+            'errors': self.errors,
+            'win_rate': round(self.win_rate, 3),
+            'latency_ewma': None if self.latency is None else round(self.latency, 4),
+            'latency_p50': samples[len(samples) // 2] if samples else None
+        }
+
+
+class CircuitBreaker:
+    """Stops calling a failing backend until a background probe gets through
+
+    Closed: calls go through, and failure_threshold failures in a row
+    (errors, timeouts or calls slower than slow_seconds) open it. Open:
+    calls are refused; after reset_seconds it turns half-open and on_probe
+    is called to test the backend off the listen path. A good probe closes
+    it, a failed one reopens it with the wait doubled up to max_reset_seconds.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, name, failure_threshold=3, slow_seconds=None, reset_seconds=10.0,
+                 max_reset_seconds=120.0, on_probe=None, logger=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_seconds = slow_seconds
+        self.base_reset_seconds = reset_seconds
+        self.reset_seconds = reset_seconds
+        self.max_reset_seconds = max_reset_seconds
+        self.on_probe = on_probe
+        self.logger = logger
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.reopens_at = None
+        self.timer = None
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """Whether a real call may use the backend now"""
+        return self.state == self.CLOSED
+
+    def retry_in(self):
+        """Seconds until the next probe, 0 if one is due or running"""
+        reopens_at = self.reopens_at
+        return 0.0 if reopens_at is None else max(0.0, reopens_at - time.monotonic())
+
+    def success(self, seconds):
+        """Record a good response; a slow one counts as a failure"""
+        if self.slow_seconds and seconds > self.slow_seconds:
+            self.failure(f"slow response ({seconds:.1f}s)")
+            return
+        with self.lock:
+            self.failures = 0
+            if self.state == self.CLOSED:
+                return
+            self.state = self.CLOSED
+            self.reset_seconds = self.base_reset_seconds
+            self.reopens_at = None
+        if self.logger:
+            self.logger.info("Recognition backend %s recovered", self.name)
+
+    def failure(self, reason):
+        """Record a failure, opening the circuit at the threshold"""
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN:
+                self.reset_seconds = min(self.reset_seconds * 2, self.max_reset_seconds)
+            elif self.state == self.OPEN or self.failures < self.failure_threshold:
+                return
+            self.trip()
+        if self.logger:
+            self.logger.warning("Recognition backend %s disabled for %gs after %s",
+                                self.name, self.reset_seconds, reason)
+
+    def trip(self):
+        """Open the circuit and schedule the half-open probe (lock held)"""
+        self.state = self.OPEN
+        self.trips += 1
+        self.reopens_at = time.monotonic() + self.reset_seconds
+        self.timer = threading.Timer(self.reset_seconds, self.half_open)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def half_open(self):
+        """Let one probe through after the reset timeout"""
+        with self.lock:
+            if self.state != self.OPEN:
+                return
+            self.state = self.HALF_OPEN
+        if self.on_probe is not None:
+            self.on_probe()
+
+    def summary(self):
+        """State, trip count and seconds until the next probe"""
+        return {'state': self.state, 'trips': self.trips, 'retry_in': round(self.retry_in(), 1)}
+
+    def stop(self):
+        """Cancel the pending half-open timer"""
+        if self.timer is not None:
+            self.timer.cancel()
+
+
+class HedgedRecognizer:
+    """Sends the same audio to several backends and takes the first good answer
+
+    Backends start in order of past performance: the best ranked at once,
+    each further one hedge_delay later (or as soon as an earlier one fails).
+    The first result at or above min_confidence wins and the others are
+    cancelled. If none qualifies within budget seconds, the most confident
+    answer so far is used; unscored results only ever win this way.
+
+    Each backend sits behind a CircuitBreaker (configured by breaker), so
+    one that keeps failing is skipped without waiting on it. The fallback
+    backends, typically offline ones, are only raced when the primary
+    backends all failed or are switched off by their breakers.
+    """
+
+    def __init__(self, backends, fallback=(), budget=5.0, min_confidence=0.6, hedge_delay=0.0,
+                 breaker=None, logger=None, metrics=None):
+        self.backends = list(backends)
+        self.fallback = list(fallback)
+        self.budget = budget
+        self.min_confidence = min_confidence
+        self.hedge_delay = hedge_delay
+        self.logger = logger
+        self.metrics = metrics or NullMetrics()
+        everything = self.backends + self.fallback
+        self.stats = {backend.name: BackendStats() for backend in everything}
+        self.breakers = {
+            backend.name: CircuitBreaker(
+                backend.name, logger=logger,
+                on_probe=lambda backend=backend: self.pool.submit(self.probe, backend),
+                **(breaker or {}))
+            for backend in everything
+        }
+        self.probe_audio = None  # Most recent utterance, replayed by probes
+        self.lock = threading.Lock()
+        # Losers keep running until their request returns, and probes
+        # need a thread too, so leave headroom
+        self.pool = ThreadPoolExecutor(max_workers=3 * len(everything),
+                                       thread_name_prefix='JarvisRecognize')
+
+    def ranked(self, backends):
+        """Usable backends ordered by win rate, then latency; config order breaks ties"""
+        with self.lock:
+            keys = {backend.name: (-self.stats[backend.name].win_rate,
+                                   self.stats[backend.name].latency or float('inf'))
+                    for backend in backends}
+        return sorted((backend for backend in backends if self.breakers[backend.name].allow()),
+                      key=lambda backend: keys[backend.name])
+
+    def run(self, backend, audio, cancelled, turn=None):
+        """Recognize on one backend, recording its latency even if it lost"""
+        breaker = self.breakers[backend.name]
+        started = time.perf_counter()
+        try:
+            text, confidence = backend.recognize(audio, cancelled)
+        except sr.UnknownValueError:
+            latency = time.perf_counter() - started
+            self.record(backend, latency, turn=turn)
+            if not cancelled.is_set():
+                breaker.success(latency)
+            raise
+        except Exception as e:
+            # Being cancelled says nothing about the backend
+            if not cancelled.is_set():
+                self.record(backend, time.perf_counter() - started, failed=True, turn=turn)
+                breaker.failure(str(e) or type(e).__name__)
+            raise
+        latency = time.perf_counter() - started
+        self.record(backend, latency, turn=turn)
+        if not cancelled.is_set():
+            breaker.success(latency)
+        return RecognitionResult(text, confidence, backend.name, latency)
+
+    def probe(self, backend):
+        """Half-open check: replay the last utterance (or silence) off the listen path"""
+        audio = self.probe_audio or sr.AudioData(b'\0' * 16000, 16000, 2)
+        breaker = self.breakers[backend.name]
+        started = time.perf_counter()
+        try:
+            backend.recognize(audio, threading.Event())
+        except sr.UnknownValueError:
+            pass  # The backend answered; silence is a fine answer
+        except Exception as e:
+            breaker.failure(f"failed probe: {e}")
+            return
+        breaker.success(time.perf_counter() - started)
+
+    def record(self, backend, seconds, failed=False, turn=None):
+        """Update the backend's stats and the turn's recognition timing"""
+        with self.lock:
+            self.stats[backend.name].record(seconds, failed=failed)
+        self.metrics.observe(f"recognize_{backend.name}", seconds, turn=turn)
+
+    def qualifies(self, result):
+        """Whether a result is confident enough to cancel the other backends"""
+        return result.confidence is not None and result.confidence >= self.min_confidence
+
+    def recognize(self, audio):
+        """Return the winning RecognitionResult, or raise like recognize_google()"""
+        started = time.perf_counter()
+        self.probe_audio = audio
+        try:
+            primary = self.ranked(self.backends)
+            if not primary:
+                retry = min(self.breakers[backend.name].retry_in() for backend in self.backends)
+                raise sr.RequestError(f"recognition unavailable, retrying in {math.ceil(retry)}s")
+            return self.race(primary, audio, started, started + self.budget)
+        except sr.RequestError as e:
+            fallback = self.ranked(self.fallback)
+            if not fallback:
+                raise
+            if self.logger:
+                self.logger.info("Using offline recognition: %s", e)
+            return self.race(fallback, audio, started, time.perf_counter() + self.budget)
+
+    def race(self, backends, audio, started, deadline):
+        """Run backends until one qualifies, all finish or the deadline passes"""
+        cancelled = threading.Event()
+        turn = self.metrics.active()
+        waiting = deque(backends)
+        running = {}
+        best = None
+        errors = []
+        unintelligible = False
+
+        def launch():
+            backend = waiting.popleft()
+            running[self.pool.submit(self.run, backend, audio, cancelled, turn)] = backend
+
+        launch()
+        next_launch = time.perf_counter() + self.hedge_delay
+        try:
+            while running or waiting:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                while waiting and (now >= next_launch or not running):
+                    launch()
+                    next_launch = now + self.hedge_delay
+                timeout = deadline - now
+                if waiting:
+                    timeout = min(timeout, max(next_launch - now, 0))
+                done, _ = wait_futures(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    backend = running.pop(future)
+                    try:
+                        result = future.result()
+                    except sr.UnknownValueError:
+                        unintelligible = True
+                        continue
+                    except Exception as e:
+                        errors.append(f"{backend.name}: {e}")
+                        # A failed backend gets replaced by the next one right away
+                        next_launch = 0
+                        continue
+                    if self.qualifies(result):
+                        return self.settle(result, started)
+                    if best is None or (result.confidence or 0) > (best.confidence or 0):
+                        best = result
+            if best is not None:
+                return self.settle(best, started)
+        finally:
+            cancelled.set()
+            for future, backend in running.items():
+                future.cancel()
+                # Still running at the deadline: as good as a timeout
+                if time.perf_counter() >= deadline:
+                    self.breakers[backend.name].failure("exceeding the latency budget")
+
+        if running or waiting:
+            raise sr.RequestError(f"no recognition result within {self.budget:g}s")
+        # Only a network problem if no backend heard the audio as unintelligible
+        if errors and not unintelligible:
+            raise sr.RequestError('; '.join(errors))
+        raise sr.UnknownValueError()
+
+    def settle(self, result, started):
+        """Credit the winning backend"""
+        with self.lock:
+            self.stats[result.backend].wins += 1
+        if self.logger:
+            score = ('unscored' if result.confidence is None
+                     else f"confidence {result.confidence:.2f}")
+            self.logger.debug("Recognition won by %s (%s) after %.0f ms", result.backend, score,
+                              (time.perf_counter() - started) * 1000)
+        return result
+
+    def summary(self):
+        """Per-backend stats and circuit state"""
+        with self.lock:
+            summary = {name: stats.summary() for name, stats in self.stats.items()}
+        for name, breaker in self.breakers.items():
+            summary[name]['circuit'] = breaker.summary()
+        return summary
+
+    def shutdown(self):
+        """Stop the breaker timers and abandon in-flight requests"""
+        for breaker in self.breakers.values():
+            breaker.stop()
+        try:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+        except TypeError:  # Python < 3.9
+            self.pool.shutdown(wait=False)
+
+
+def kill_process_group(process):
+    """Kill a process started in its own session along with its children"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, OSError):
+        process.kill()
+
+
+CommandResult = namedtuple('CommandResult', 'name returncode duration timed_out cancelled error')
+
+
+class CommandHandle:
+    """Future-like handle for a command running on the CommandExecutor"""
+
+    def __init__(self, name):
+        self.name = name
+        self.future = None
+        self.process = None
+        self.cancelled = False
+        self.turn = None  # Metrics turn that started the command
+
+    def cancel(self):
+        """Cancel if still queued, otherwise kill the running process"""
+        self.cancelled = True
+        if self.future is not None and self.future.cancel():
+            return
+        process = self.process
+        if process is not None and process.poll() is None:
+            kill_process_group(process)
+
+    def result(self, timeout=None):
+        """Block until the command finished and return its CommandResult"""
+        return self.future.result(timeout)
+
+    def done(self):
+        """Whether the command has finished"""
+        return self.future.done()
+
+    def add_done_callback(self, callback):
+        """Call callback(CommandResult) once the command finished"""
+        def forward(future):
+            if not future.cancelled():
+                callback(future.result())
+        self.future.add_done_callback(forward)
+
+
+class CommandExecutor:
+    """Bounded worker pool running subprocesses with timeouts and cancellation"""
+
+    def __init__(self, max_workers=4, default_timeout=10, logger=None, launcher=subprocess.Popen,
+                 metrics=None):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='JarvisExec')
+        self.metrics = metrics or NullMetrics()
+        self.default_timeout = default_timeout
+        self.logger = logger
+        self.launcher = launcher  # Swappable so benchmarks can stub process creation
+
+    def submit(self, name, args, shell=False, timeout=None, callback=None):
+        """Start a command in the background and return its CommandHandle"""
+        handle = CommandHandle(name)
+        handle.turn = self.metrics.active()
+        timeout = self.default_timeout if timeout is None else timeout
+        handle.future = self.pool.submit(self.run, handle, args, shell, timeout)
+        if callback is not None:
+            handle.add_done_callback(callback)
+        return handle
+
+    def run(self, handle, args, shell, timeout):
+        """Run the command on a worker, timed into the turn that submitted it"""
+        # Timings and log records belong to the turn that submitted the command
+        with self.metrics.bind(handle.turn):
+            return self.execute(handle, args, shell, timeout)
+
+    def execute(self, handle, args, shell, timeout):
+        """Run args (or a shell line) to completion; returns a CommandResult"""
+        started = time.perf_counter()
+        returncode, timed_out, error = None, False, None
+
+        if not handle.cancelled:
+            try:
+                # A separate session lets a timeout kill the whole shell pipeline
+                handle.process = self.launcher(args, shell=shell,
+                                               stdout=subprocess.DEVNULL,
+                                               stderr=subprocess.DEVNULL,
+                                               start_new_session=True)
+                try:
+                    returncode = handle.process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    timed_out = True
+                    kill_process_group(handle.process)
+                    returncode = handle.process.wait()
+            except Exception as e:
+                error = str(e)
+
+        result = CommandResult(handle.name, returncode, time.perf_counter() - started,
+                               timed_out, handle.cancelled, error)
+        self.metrics.observe('subprocess', result.duration)
+        if self.logger:
+            notes = (" (timed out)" if timed_out else "") + (
+                " (cancelled)" if handle.cancelled else "") + (f" error={error}" if error else "")
+            self.logger.info("Command '%s' finished: rc=%s in %.3fs%s",
+                             handle.name, returncode, result.duration, notes)
+        return result
+
+    def first_success(self, name, attempts, timeout=None, callback=None):
+        """Run alternative commands concurrently; the first to succeed wins
+
+        callback receives the winning CommandResult, or the last failure.
+        """
+        handles = [self.submit(f"{name} [{i + 1}/{len(attempts)}]", args, timeout=timeout)
+                   for i, args in enumerate(attempts)]
+        state = {'remaining': len(handles), 'settled': False}
+        lock = threading.Lock()
+
+        def settle(result):
+            with lock:
+                state['remaining'] -= 1
+                if state['settled']:
+                    return
+                won = result.returncode == 0
+                if not won and state['remaining'] > 0:
+                    return
+                state['settled'] = True
+
+            if won:
+                for other in handles:
+                    if not other.done():
+                        other.cancel()
+            if callback is not None:
+                callback(result)
+
+        for handle in handles:
+            handle.add_done_callback(settle)
+        return handles
+
+    def shutdown(self, wait=False, cancel_pending=True):
+        """Drop queued commands (unless cancel_pending is off); running ones finish or time out"""
+        try:
+            self.pool.shutdown(wait=wait, cancel_futures=cancel_pending)
+        except TypeError:  # Python < 3.9
+            self.pool.shutdown(wait=wait)
+
+
+NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
+    'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'fifteen': 15,
+    'twenty': 20, 'thirty': 30, 'forty': 40, 'forty five': 45, 'sixty': 60
+}
+UNIT_SECONDS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400, 'week': 604800}
+
+_AMOUNT = r'(\d+|' + '|'.join(sorted(NUMBER_WORDS, key=len, reverse=True)) + r')'
+_UNIT = r'(second|minute|hour|day|week)s?'
+DURATION_PATTERN = re.compile(rf'\b{_AMOUNT}\s+{_UNIT}(?:\s+and\s+{_AMOUNT}\s+{_UNIT})?\b')
+CLOCK_PATTERN = re.compile(r'\bat\s+(noon|midnight|(\d{1,2})(?::(\d{2}))?\s*(a\.?m\.?|p\.?m\.?)?)')
+EVERY_PATTERN = re.compile(
+    rf'\bevery\s+(?:(day|morning|evening|night|hour|week)|{_AMOUNT}\s+{_UNIT})\b')
+
+
+def parse_schedule(text, now=None):
+    """Parse 'in 10 minutes', 'at 5 pm' or 'every day at 9' into (due, interval, message)
+
+    due is a datetime, interval is seconds between repeats (or None),
+    and message is what is left once the timing words are removed.
+    Returns None when no time could be found.
+    """
+    now = now or datetime.now()
+
+    def amount(word):
+        return int(word) if word.isdigit() else NUMBER_WORDS[word]
+
+    def duration(match, offset=0):
+        seconds = amount(match.group(offset + 1)) * UNIT_SECONDS[match.group(offset + 2)]
+        if match.group(offset + 3):
+            seconds += amount(match.group(offset + 3)) * UNIT_SECONDS[match.group(offset + 4)]
+        return seconds
+
+    interval, due = None, None
+    every = EVERY_PATTERN.search(text)
+    clock = CLOCK_PATTERN.search(text)
+
+    if every:
+        period = every.group(1)
+        if period in ('day', 'morning', 'evening', 'night'):
+            interval = UNIT_SECONDS['day']
+        elif period:
+            interval = UNIT_SECONDS[period]
+        else:
+            interval = amount(every.group(2)) * UNIT_SECONDS[every.group(3)]
+        text = text.replace(every.group(0), ' ')
+
+    if clock:
+        if clock.group(1) in ('noon', 'midnight'):
+            hour, minute = (12 if clock.group(1) == 'noon' else 0), 0
+        else:
+            hour, minute = int(clock.group(2)), int(clock.group(3) or 0)
+            meridiem = (clock.group(4) or '').replace('.', '')
+            if meridiem == 'pm' and hour < 12:
+                hour += 12
+            elif meridiem == 'am' and hour == 12:
+                hour = 0
+            elif not meridiem and hour < 8:
+                hour += 12  # "at 5" most likely means the afternoon
+        if hour > 23 or minute > 59:
+            return None
+        due = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if due <= now:
+            due += timedelta(days=1)
+        text = text.replace(clock.group(0), ' ')
+    elif not every:
+        match = DURATION_PATTERN.search(text)
+        if not match:
+            return None
+        try:
+            due = now + timedelta(seconds=duration(match))
+        except OverflowError:
+            return None
+        text = text.replace(match.group(0), ' ')
+    else:
+        try:
+            due = now + timedelta(seconds=interval)
+        except OverflowError:
+            return None
+
+    # Whatever follows "to"/"that"/"about" is the message
+    message = re.search(r'\b(?:to|that|about)\s+(.+)', text)
+    message = ' '.join(message.group(1).split()) if message else ''
+    message = re.sub(r'(?:\s+\b(?:in|for|after|on|at))+$', '', message)
+    return due, interval, message
+
+
+class ReminderScheduler(threading.Thread):
+    """Single timer thread over a heap of deadlines, persisted to disk
+
+    Sleeps exactly until the earliest deadline (or until the heap
+    changes); cancelled entries are dropped lazily when they surface.
+    Without a path, reminders live in memory only.
+    """
+
+    def __init__(self, path, on_fire, logger):
+        super().__init__(name='JarvisScheduler', daemon=True)
+        self.path = Path(path) if path else None
+        self.on_fire = on_fire
+        self.logger = logger
+        self.condition = threading.Condition()
+        self.heap = []            # (due timestamp, reminder id)
+        self.reminders = {}       # Reminder id -> dict
+        self.ids = itertools.count(1)
+        self.stopped = False
+        self.load()
+
+    def load(self):
+        """Restore persisted reminders; ones missed while stopped fire right away"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.error("Could not read %s: %s", self.path, e)
+            return
+
+        for reminder in saved:
+            self.reminders[reminder['id']] = reminder
+            heapq.heappush(self.heap, (reminder['due'], reminder['id']))
+        self.ids = itertools.count(max(self.reminders, default=0) + 1)
+        self.logger.info("Loaded %s reminders from %s", len(self.reminders), self.path)
+
+    def save(self):
+        """Write all reminders atomically (call with the condition held)"""
+        if self.path is None:
+            return
+        temp_path = self.path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps(list(self.reminders.values()), indent=2), encoding='utf-8')
+        os.replace(temp_path, self.path)
+
+    def add(self, message, due, interval=None):
+        """Schedule a reminder at datetime due, repeating every interval seconds"""
+        with self.condition:
+            reminder = {
+                'id': next(self.ids),
+                'message': message,
+                'due': due.timestamp(),
+                'interval': interval
+            }
+            self.reminders[reminder['id']] = reminder
+            heapq.heappush(self.heap, (reminder['due'], reminder['id']))
+            self.save()
+            self.condition.notify()
+        return reminder
+
+    def cancel(self, reminder_id=None):
+        """Cancel one reminder, or all of them; returns how many were removed"""
+        with self.condition:
+            if reminder_id is None:
+                count = len(self.reminders)
+                self.reminders.clear()
+                self.heap.clear()
+            else:
+                count = 1 if self.reminders.pop(reminder_id, None) else 0
+                # Compact once tombstones dominate the heap
+                if len(self.heap) > 2 * len(self.reminders) + 16:
+                    self.heap = [(due, rid) for due, rid in self.heap if rid in self.reminders]
+                    heapq.heapify(self.heap)
+            self.save()
+            self.condition.notify()
+        return count
+
+    def upcoming(self):
+        """Active reminders ordered by next due time"""
+        with self.condition:
+            return sorted(self.reminders.values(), key=lambda r: r['due'])
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.stopped:
+                    # Discard heap entries of cancelled or rescheduled reminders
+                    while self.heap and (self.heap[0][1] not in self.reminders or
+                                         self.reminders[self.heap[0][1]]['due'] != self.heap[0][0]):
+                        heapq.heappop(self.heap)
+
+                    if not self.heap:
+                        self.condition.wait()
+                        continue
+
+                    delay = self.heap[0][0] - time.time()
+                    if delay <= 0:
+                        break
+                    self.condition.wait(delay)
+
+                if self.stopped:
+                    return
+
+                _, reminder_id = heapq.heappop(self.heap)
+                reminder = dict(self.reminders[reminder_id])
+                if reminder['interval']:
+                    # Skip occurrences missed while Jarvis wasn't running
+                    due = self.reminders[reminder_id]['due']
+                    now = time.time()
+                    while due <= now:
+                        due += reminder['interval']
+                    self.reminders[reminder_id]['due'] = due
+                    heapq.heappush(self.heap, (due, reminder_id))
+                else:
+                    del self.reminders[reminder_id]
+                self.save()
+
+            try:
+                self.on_fire(reminder)
+            except Exception as e:
+                self.logger.error("Reminder callback error: %s", e)
+
+    def stop(self):
+        """Wake the thread and let it exit"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify()
+
+
+class CommandHistory(threading.Thread):
+    """Append-only SQLite log of handled commands, with hourly usage counts
+
+    Each command adds a history row and bumps its (intent, target, hour)
+    counter in the usage table, in batches committed by this thread. The
+    counters are mirrored in memory, so predictions never touch the disk
+    and cost the same with ten rows of history or ten million.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            ts REAL NOT NULL,
+            intent TEXT NOT NULL,
+            target TEXT NOT NULL,
+            ok INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS usage (
+            intent TEXT NOT NULL,
+            target TEXT NOT NULL,
+            hour INTEGER NOT NULL,
+            count INTEGER NOT NULL,
+            last_ts REAL NOT NULL,
+            PRIMARY KEY (intent, target, hour)
+        ) WITHOUT ROWID;
+    """
+    BATCH = 512
+    # Weight of usage 0, 1, 2 and more hours away from the hour predicted for
+    HOUR_WEIGHTS = (1.0, 0.5, 0.25) + (0.05,) * 10
+
+    def __init__(self, path, logger):
+        super().__init__(name='JarvisHistory', daemon=True)
+        self.path = path
+        self.logger = logger
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.counts = {}    # (intent, target) -> uses per hour of day
+        self.version = 0    # Bumped on every record, for callers caching predictions
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.executescript(self.SCHEMA)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.load()
+
+    def load(self):
+        """Mirror the usage table in memory"""
+        rows = self.connection.execute('SELECT intent, target, hour, count FROM usage').fetchall()
+        for intent, target, hour, count in rows:
+            self.counts.setdefault((intent, target), [0] * 24)[hour] = count
+        if rows:
+            self.logger.info("Loaded usage of %s commands from %s", len(self.counts), self.path)
+
+    def record(self, intent, target='', ok=True):
+        """Queue one handled command; intent None is stored as 'unknown'"""
+        now = time.time()
+        intent = intent or 'unknown'
+        target = target or ''
+        hour = datetime.fromtimestamp(now).hour
+        with self.lock:
+            self.counts.setdefault((intent, target), [0] * 24)[hour] += 1
+            self.version += 1
+        self.queue.put((now, intent, target, hour, int(ok)))
+
+    def run(self):
+        while True:
+            rows = [self.queue.get()]
+            while rows[-1] is not None and len(rows) < self.BATCH:
+                try:
+                    rows.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopping = rows[-1] is None
+            if stopping:
+                rows.pop()
+            if rows:
+                self.write(rows)
+            if stopping:
+                self.connection.close()
+                return
+
+    def write(self, rows):
+        """Insert a batch of rows in one transaction"""
+        try:
+            with self.connection:
+                self.connection.executemany(
+                    'INSERT INTO history (ts, intent, target, ok) VALUES (?, ?, ?, ?)',
+                    [(ts, intent, target, ok) for ts, intent, target, _, ok in rows])
+                self.connection.executemany(
+                    'INSERT INTO usage (intent, target, hour, count, last_ts) '
+                    'VALUES (?, ?, ?, 1, ?) '
+                    'ON CONFLICT (intent, target, hour) DO UPDATE '
+                    'SET count = count + 1, last_ts = excluded.last_ts',
+                    [(intent, target, hour, ts) for ts, intent, target, hour, _ in rows])
+        except sqlite3.Error as e:
+            self.logger.error("Could not write command history: %s", e)
+
+    def likelihoods(self, intents, hour=None):
+        """{(intent, target): probability} around hour (default: now), best first"""
+        hour = datetime.now().hour if hour is None else hour
+        weights = [self.HOUR_WEIGHTS[min(abs(h - hour), 24 - abs(h - hour))] for h in range(24)]
+        with self.lock:
+            scores = {key: sum(count * weight for count, weight in zip(counts, weights))
+                      for key, counts in self.counts.items() if key[0] in intents and key[1]}
+        total = sum(scores.values())
+        if not total:
+            return {}
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return {key: score / total for key, score in ranked}
+
+    def stop(self, timeout=5):
+        """Flush queued rows and stop the writer"""
+        self.queue.put(None)
+        if self.is_alive():
+            self.join(timeout)
+
+
+# Config values read on every turn, precomputed once per config version
+Settings = namedtuple('Settings', [
+    'wake_word', 'listen_timeout', 'phrase_time_limit', 'energy_threshold',
+    'dynamic_energy_threshold', 'pause_threshold', 'ambient_adjust_duration', 'barge_in'
+])
+
+# An immutable view of both config files plus the structures derived from them
+ConfigSnapshot = namedtuple('ConfigSnapshot',
+                            ['config', 'apps_config', 'settings', 'system_commands'])
+
+RECOGNIZER_SETTINGS = ('energy_threshold', 'dynamic_energy_threshold', 'pause_threshold')
+
+# Changing these only takes effect after a restart
+RESTART_KEYS = ('executor_workers', 'command_timeout', 'reminders_file', 'history', 'history_file',
+                'app_discovery', 'app_discovery_roots', 'app_discovery_cache',
+                'metrics', 'metrics_file', 'metrics_port', 'metrics_window', 'daemon_socket',
+                'daemon_workers', 'voice_ipc', 'tts_cache', 'tts_cache_dir', 'voice_rate',
+                'voice_volume', 'config_reload_interval', 'log_file', 'log_format', 'log_rotation',
+                'log_max_mb', 'log_backup_count', 'log_rotate_when', 'log_debug_sample_rate',
+                'vad', 'vad_energy_margin_db', 'vad_hangover_seconds', 'vad_padding_seconds',
+                'streaming_backend', 'vosk_model', 'audio_preprocess', 'audio_sample_rate',
+                'audio_normalize', 'audio_target_peak_dbfs', 'audio_max_gain_db',
+                'recognition_backends', 'recognition_budget', 'recognition_min_confidence',
+                'recognition_hedge_delay', 'recognition_fallback', 'recognition_failure_threshold',
+                'recognition_slow_seconds', 'recognition_reset_seconds',
+                'recognition_max_reset_seconds')
+
+
+def build_settings(config):
+    """Resolve the per-turn settings from a config dict"""
+    return Settings(
+        wake_word=config.get('wake_word', 'hey jarvis').lower(),
+        listen_timeout=config.get('listen_timeout', 7),
+        phrase_time_limit=config.get('phrase_time_limit', 8),
+        energy_threshold=config.get('energy_threshold', 300),
+        dynamic_energy_threshold=config.get('dynamic_energy_threshold', True),
+        pause_threshold=config.get('pause_threshold', 0.8),
+        ambient_adjust_duration=config.get('ambient_adjust_duration', 0.5),
+        barge_in=config.get('barge_in', False)
+    )
+
+
+def build_system_commands(apps_config):
+    """Map each system intent to its (name, shell command) from apps_config"""
+    system_cmds = apps_config.get('system_commands', {})
+    table = {}
+    for intent in SYSTEM_INTENTS:
+        for cmd_key, cmd_value in system_cmds.items():
+            if intent in cmd_key:
+                table[intent] = (cmd_key, cmd_value)
+                break
+    return table
+
+
+def validate_config(config, defaults):
+    """Return a list of problems with config.json content (empty when valid)"""
+    if not isinstance(config, dict):
+        return ["top level must be an object"]
+
+    errors = []
+    for key, default in defaults.items():
+        if key not in config or default is None or config[key] is None:
+            continue
+        value = config[key]
+        if isinstance(default, bool):
+            valid = isinstance(value, bool)
+        elif isinstance(default, (int, float)):
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+        else:
+            valid = isinstance(value, type(default))
+        if not valid:
+            errors.append(f"{key}: expected {type(default).__name__}, got {value!r}")
+
+    if isinstance(config.get('wake_word'), str) and not config['wake_word'].strip():
+        errors.append("wake_word: must not be empty")
+    margin = config.get('low_power_wake_margin_db')
+    if isinstance(margin, (int, float)) and not isinstance(margin, bool) and margin > 40:
+        errors.append(f"low_power_wake_margin_db: at most 40 dB, got {margin!r}")
+    return errors
+
+
+def validate_apps_config(apps_config):
+    """Return a list of problems with apps_config.json content (empty when valid)"""
+    if not isinstance(apps_config, dict):
+        return ["top level must be an object"]
+
+    errors = []
+    applications = apps_config.get('applications', {})
+    if not isinstance(applications, dict):
+        errors.append("applications: must be an object")
+    else:
+        for key, app in applications.items():
+            if not isinstance(app, dict) or not isinstance(app.get('path'), str):
+                errors.append(f"applications.{key}: needs a 'path' string")
+            elif not all(isinstance(alias, str) for alias in app.get('commands', [])):
+                errors.append(f"applications.{key}.commands: must be a list of strings")
+
+    system_cmds = apps_config.get('system_commands', {})
+    if not isinstance(system_cmds, dict) or not all(
+            isinstance(v, str) for v in system_cmds.values()):
+        errors.append("system_commands: must map names to shell command strings")
+    return errors
+
+
+class ConfigWatcher(threading.Thread):
+    """Polls config files for changes and reports each settled edit once
+
+    A change is only acted on once the file has stopped changing for
+    the debounce period, so half-written saves are never loaded.
+    """
+
+    def __init__(self, paths, on_change, interval=1.0, debounce=0.5, logger=None):
+        super().__init__(name='JarvisConfigWatcher', daemon=True)
+        self.paths = list(paths)
+        self.on_change = on_change
+        self.interval = interval
+        self.debounce = debounce
+        self.logger = logger
+        self.stopped = threading.Event()
+        self.current = self.stamp()
+        self.pending = None
+        self.pending_since = 0.0
+
+    def stamp(self):
+        """(mtime, size) of every watched file; None for a missing one"""
+        stamps = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            stamp = self.stamp()
+            now = time.monotonic()
+            if stamp == self.current:
+                self.pending = None
+            elif stamp != self.pending:
+                self.pending, self.pending_since = stamp, now
+            elif now - self.pending_since >= self.debounce and None not in stamp:
+                self.current, self.pending = stamp, None
+                try:
+                    self.on_change()
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error("Config reload failed: %s", e)
+
+    def stop(self):
+        """Stop polling for config changes"""
+        self.stopped.set()
+
+
+class LatencyMetrics:
+    """Rolling per-stage and per-intent latency histograms for voice turns
+
+    Each thread has its own open turn, so commands handled concurrently
+    (batch jobs, daemon clients) are timed separately. Work handed to
+    another thread carries its turn along through bind().
+    """
+
+    enabled = True
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, window=1000, jsonl_path=None, logger=None):
+        self.window = window
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.stages = {}    # Stage -> deque of recent durations
+        self.intents = {}   # Intent -> deque of recent turn durations
+        self.totals = {}    # (kind, name) -> [count, sum] over the whole session
+        self.turn_ids = itertools.count(1)
+        self.local = threading.local()  # .turn: the turn open on this thread
+        self.server = None
+        self.jsonl = None
+        if jsonl_path:
+            Path(jsonl_path).parent.mkdir(parents=True, exist_ok=True)
+            # pylint: disable-next=consider-using-with  # Kept open until close()
+            self.jsonl = open(jsonl_path, 'a', buffering=1, encoding='utf-8')
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one stage of the current turn"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def observe(self, name, seconds, turn=None):
+        """Record a stage duration measured elsewhere, for turn or this thread's open turn"""
+        with self.lock:
+            self.add('stage', name, self.stages, seconds)
+            turn = turn or getattr(self.local, 'turn', None)
+            if turn is not None and 'started' in turn:
+                stages = turn['stages']
+                stages[name] = stages.get(name, 0.0) + seconds
+
+    def add(self, kind, name, windows, seconds):
+        """Append seconds to the name's window and its running totals"""
+        if name not in windows:
+            windows[name] = deque(maxlen=self.window)
+            self.totals[(kind, name)] = [0, 0.0]
+        windows[name].append(seconds)
+        total = self.totals[(kind, name)]
+        total[0] += 1
+        total[1] += seconds
+
+    def new_turn(self, source):
+        """Start timing a turn without making it this thread's; see bind()"""
+        with self.lock:
+            return {
+                'turn': next(self.turn_ids),
+                'source': source,
+                'timestamp': datetime.now().isoformat(timespec='milliseconds'),
+                'started': time.perf_counter(),  # Popped once the turn is closed
+                'stages': {}
+            }
+
+    @contextmanager
+    def bind(self, turn):
+        """Make turn the open turn of this thread for the enclosed block"""
+        previous = getattr(self.local, 'turn', None)
+        self.local.turn = turn
+        try:
+            yield turn
+        finally:
+            self.local.turn = previous
+
+    def active(self):
+        """The turn open on this thread, or None"""
+        turn = getattr(self.local, 'turn', None)
+        return turn if turn is not None and 'started' in turn else None
+
+    def begin_turn(self, source):
+        """Start timing a new turn on this thread unless one is already open there"""
+        turn = self.active()
+        if turn is None:
+            turn = self.local.turn = self.new_turn(source)
+        return turn
+
+    def current_turn(self):
+        """Id of the turn open on this thread, or None"""
+        turn = self.active()
+        return turn['turn'] if turn is not None else None
+
+    def close_turn(self, turn):
+        """Mark turn (default: this thread's) closed; returns (turn, seconds) or (None, None)"""
+        with self.lock:
+            turn = turn or getattr(self.local, 'turn', None)
+            if turn is None or 'started' not in turn:
+                return None, None
+            if getattr(self.local, 'turn', None) is turn:
+                self.local.turn = None
+            return turn, time.perf_counter() - turn.pop('started')
+
+    def discard_turn(self, turn=None):
+        """Drop a turn that never produced a command"""
+        self.close_turn(turn)
+
+    def end_turn(self, intent, turn=None):
+        """Close the turn (default: this thread's) and append it to the metrics file"""
+        turn, total = self.close_turn(turn)
+        if turn is None:
+            return None
+        with self.lock:
+            self.add('intent', intent or 'unknown', self.intents, total)
+
+        turn['intent'] = intent
+        turn['total'] = round(total, 6)
+        turn['stages'] = {name: round(seconds, 6) for name, seconds in turn['stages'].items()}
+        if self.jsonl is not None:
+            self.jsonl.write(json.dumps(turn) + '\n')
+        return turn
+
+    @classmethod
+    def quantiles(cls, samples):
+        """Nearest-rank quantiles of a window of samples"""
+        ordered = sorted(samples)
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in cls.QUANTILES}
+
+    def summary(self):
+        """Return {'stage': {...}, 'intent': {...}} with p50/p95/p99 per name"""
+        with self.lock:
+            windows = {'stage': dict(self.stages), 'intent': dict(self.intents)}
+            snapshot = {kind: {name: list(window) for name, window in group.items()}
+                        for kind, group in windows.items()}
+            totals = dict(self.totals)
+
+        result = {}
+        for kind, group in snapshot.items():
+            result[kind] = {}
+            for name, samples in group.items():
+                quantiles = self.quantiles(samples)
+                count, total = totals[(kind, name)]
+                result[kind][name] = {
+                    'count': count,
+                    'sum': total,
+                    'p50': quantiles[0.5],
+                    'p95': quantiles[0.95],
+                    'p99': quantiles[0.99]
+                }
+        return result
+
+    def prometheus(self):
+        """Render the histograms in the Prometheus text exposition format"""
+        lines = []
+        for kind, stats in self.summary().items():
+            metric = f"jarvis_{kind}_latency_seconds"
+            lines.append(f"# HELP {metric} Rolling latency per {kind}")
+            lines.append(f"# TYPE {metric} summary")
+            for name, values in sorted(stats.items()):
+                for q, key in zip(self.QUANTILES, ('p50', 'p95', 'p99')):
+                    lines.append(f'{metric}{{{kind}="{name}",quantile="{q}"}} {values[key]:.6f}')
+                lines.append(f'{metric}_sum{{{kind}="{name}"}} {values["sum"]:.6f}')
+                lines.append(f'{metric}_count{{{kind}="{name}"}} {values["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port):
+        """Expose /metrics on localhost for a Prometheus scraper"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """Answers GET /metrics; anything else is a 404"""
+
+            def do_GET(self):
+                """Serve the metrics in the Prometheus text format"""
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        threading.Thread(target=self.server.serve_forever, name='JarvisMetrics',
+                         daemon=True).start()
+        if self.logger:
+            self.logger.info("Metrics endpoint on http://127.0.0.1:%s/metrics", port)
+
+    def close(self):
+        """Write a final summary line and stop the endpoint"""
+        if self.server is not None:
+            self.server.shutdown()
+        if self.jsonl is not None:
+            self.jsonl.write(json.dumps({'summary': self.summary()}) + '\n')
+            self.jsonl.close()
+            self.jsonl = None
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record, with the turn ID and any stage timings"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for key in ('turn', 'intent', 'stages', 'total', 'vad', 'upload', 'backends', 'states'):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry)
+
+
+class LogContextFilter(logging.Filter):
+    """Stamps records with the open turn and thins out DEBUG records
+
+    Runs in the emitting thread, before the record is queued, so dropped
+    debug records cost almost nothing.
+    """
+
+    def __init__(self, current_turn, debug_sample_rate=1.0):
+        super().__init__()
+        self.current_turn = current_turn
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record):
+        if record.levelno == logging.DEBUG and self.debug_sample_rate < 1.0 \
+                and random.random() >= self.debug_sample_rate:
+            return False
+        if getattr(record, 'turn', None) is None:
+            record.turn = self.current_turn()
+        return True
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Queues records as-is; formatting happens on the writer thread"""
+
+    def prepare(self, record):
+        # Only the message is resolved here (args may not outlive the call);
+        # the stock implementation also copies and pre-formats every record
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class DeferredFlush(logging.StreamHandler):
+    """Handler mixin: skip the per-record flush; LogWriter flushes in batches"""
+
+    def flush(self):
+        """Left to LogWriter, which calls flush_now"""
+
+    def flush_now(self):
+        """Flush through the handler this is mixed into"""
+        super().flush()
+
+
+class RotatingLogFile(DeferredFlush, logging.handlers.RotatingFileHandler):
+    """Size-rotated log file flushed by LogWriter"""
+
+
+class TimedRotatingLogFile(DeferredFlush, logging.handlers.TimedRotatingFileHandler):
+    """Time-rotated log file flushed by LogWriter"""
+
+
+class LogWriter(logging.handlers.QueueListener):
+    """Background thread draining the log queue, flushing only once it runs dry"""
+
+    LINGER = 0.05  # Seconds to let records pile up after an idle spell
+
+    def dequeue(self, block):
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                getattr(handler, 'flush_now', handler.flush)()
+            record = self.queue.get()
+            # Waking per record would contend with the turn for the GIL;
+            # a short linger lets a whole turn's records be written at once
+            time.sleep(self.LINGER)
+            return record
+        return self.queue.get(block)
+
+
+# The background writer shared by every logger handler this process installs
+_log_listener = None
+
+
+def stop_log_writer():
+    """Flush queued log records and stop the background writer"""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+atexit.register(stop_log_writer)
+
+
+class NullMetrics:
+    """Drop-in for LatencyMetrics when instrumentation is disabled"""
+
+    enabled = False
+    NULL_STAGE = nullcontext()
+
+    def stage(self, name):
+        """A reusable no-op context manager"""
+        return self.NULL_STAGE
+
+    def observe(self, name, seconds, turn=None):
+        """Discard the sample"""
+
+    def new_turn(self, source):
+        """There are no turns to create"""
+        return None
+
+    def bind(self, turn):
+        """A no-op context manager"""
+        return self.NULL_STAGE
+
+    def active(self):
+        """There is never an open turn"""
+        return None
+
+    def begin_turn(self, source):
+        """There are no turns to begin"""
+        return None
+
+    def current_turn(self):
+        """There is never an open turn"""
+        return None
+
+    def discard_turn(self, turn=None):
+        """There is never an open turn to drop"""
+
+    def end_turn(self, intent, turn=None):
+        """There is never a finished turn to report"""
+        return None
+
+    def close(self):
+        """Nothing to flush or close"""
+
+
+class StartupProfiler:
+    """Wall-clock timings of each startup phase, printed with --profile-startup"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.phases = []
+        self.reported = False
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as one startup phase"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - started))
+
+    def record(self, name, seconds):
+        """Add a phase that was timed elsewhere, e.g. on a background thread"""
+        if self.enabled:
+            self.phases.append((name, seconds))
+
+    def report(self):
+        """Print the breakdown and the time until the first command is accepted"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        total = time.perf_counter() - PROCESS_START
+
+        print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}⏱️  STARTUP PROFILE{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        for name, seconds in self.phases:
+            print(f"  {name:<32} {seconds * 1000:9.1f} ms")
+        print(f"{Fore.GREEN}  {'time to first command':<32} {total * 1000:9.1f} ms"
+              f"{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
+
+
+def process_usage():
+    """(CPU seconds, wakeups, RSS bytes) for this process so far, None without getrusage
+
+    Wakeups are voluntary context switches, i.e. times a thread blocked
+    and was woken again. RSS is current on Linux, the peak elsewhere.
+    """
+    try:
+        import resource  # POSIX only
+    except ImportError:
+        return None
+
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    rss = usage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm', encoding='ascii') as f:
+                rss = int(f.read().split()[1]) * resource.getpagesize()
+        except (OSError, IndexError, ValueError):
+            pass
+    return usage.ru_utime + usage.ru_stime, usage.ru_nvcsw, rss
+
+
+class VoiceStateMachine:
+    """Event-driven run loop for the wake word and continuous modes
+
+    idle -> wake -> capturing -> recognizing -> executing -> speaking -> idle
+    (continuous mode goes back to capturing instead of idle). Blocking
+    work runs on worker threads and resumes the loop through futures;
+    the capture and speech threads post events. The loop itself never
+    sleeps or polls; the wake word listen does return every few seconds
+    when nothing is said (see dozing below), and the config watcher and
+    log writer keep their own timers. Reminders and IPC clients are
+    served from the same loop. Time, CPU, wakeups and RSS in each
+    state, and how long each transition lagged the event behind it, are
+    recorded.
+
+    In wake word mode, after low_power_after seconds without hearing
+    anything the loop dozes: the recognizer stops and the capture thread
+    only checks the energy of large, decimated reads. The first read
+    louder than the recognizer's energy threshold plus
+    low_power_wake_margin_db wakes it, and the wake word listen starts low_power_lookback seconds
+    before the spike so its start isn't lost.
+    """
+
+    IDLE, DOZING, WAKE, CAPTURING, RECOGNIZING, EXECUTING, SPEAKING, STOPPED = (
+        'idle', 'dozing', 'wake', 'capturing', 'recognizing', 'executing', 'speaking', 'stopped')
+
+    def __init__(self, assistant, wake_word=True):
+        self.assistant = assistant
+        self.wake_word = wake_word
+        self.rest_state = self.IDLE if wake_word else self.CAPTURING
+        self.states = {}        # State -> [entries, wall seconds, CPU seconds, wakeups, peak RSS]
+        self.transitions = {}   # "from->to" -> recent latencies in seconds
+        self.pending = None     # Capture or recognition still running on a worker
+        self.state = None
+        self.entered = None     # (perf_counter, CPU seconds, wakeups) when the state was entered
+        self.awake_since = time.perf_counter()
+        self.turn = None        # Metrics turn of the command in progress
+        self.command = None
+        self.failures = 0
+        self.stopping = False
+        # Created by run(), on the loop's thread
+        self.loop = None
+        self.events = None
+        self.pool = None
+
+    def post(self, event, payload=None):
+        """Queue an event for the loop; safe to call from any thread"""
+        self.loop.call_soon_threadsafe(self.events.put_nowait,
+                                       (event, payload, time.perf_counter()))
+
+    def start(self, function, *args):
+        """Run blocking work on a worker; the future yields (result, finished at)"""
+        metrics, turn = self.assistant.metrics, self.turn
+
+        def call():
+            # The worker times its stages into the turn of the command in progress
+            with metrics.bind(turn):
+                return function(*args), time.perf_counter()
+        return self.loop.run_in_executor(self.pool, call)
+
+    async def until(self, future, *events):
+        """Wait for future or one of the named events, serving other events meanwhile
+
+        Returns ('done', result, when), (event, payload, when) or
+        ('stop', None, when). Events posted before the current state was
+        entered belong to an earlier turn and are ignored.
+        """
+        while not self.stopping:
+            getter = asyncio.ensure_future(self.events.get())
+            done, _ = await asyncio.wait({future, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter not in done:
+                getter.cancel()
+                result, finished = future.result()
+                return 'done', result, finished
+
+            event, payload, posted = getter.result()
+            if event in events and posted >= self.entered[0]:
+                return event, payload, posted
+            self.handle_event(event, payload)
+        return 'stop', None, time.perf_counter()
+
+    def handle_event(self, event, payload):
+        """Events any state can receive"""
+        if event == 'stop':
+            self.stopping = True
+        elif event == 'reminder':
+            self.assistant.on_reminder(payload)
+
+    def pause(self, seconds):
+        """A future resolved after seconds, for backing off after errors"""
+        future = self.loop.create_future()
+        self.loop.call_later(
+            seconds, lambda: future.done() or future.set_result((None, time.perf_counter())))
+        return future
+
+    def speech_done(self):
+        """A future resolved once queued speech has been spoken"""
+        future = self.loop.create_future()
+
+        def resolve():
+            if not future.done():
+                future.set_result((None, time.perf_counter()))
+        self.assistant.tts.on_idle(lambda: self.loop.call_soon_threadsafe(resolve))
+        return future
+
+    def enter(self, state, since):
+        """Close the books on the current state and record the transition delay"""
+        now = time.perf_counter()
+        # Without getrusage (Windows) only CPU time is tracked
+        cpu, wakeups, rss = process_usage() or (time.process_time(), 0, 0)
+        if self.state is not None:
+            stats = self.states.setdefault(self.state, [0, 0.0, 0.0, 0, 0])
+            stats[0] += 1
+            stats[1] += now - self.entered[0]
+            stats[2] += cpu - self.entered[1]
+            stats[3] += wakeups - self.entered[2]
+            stats[4] = max(stats[4], rss)
+            if since is not None:
+                latency = now - since
+                window = self.transitions.setdefault(f"{self.state}->{state}", deque(maxlen=1000))
+                window.append(latency)
+                self.assistant.metrics.observe('state_transition', latency)
+            self.assistant.logger.debug("State %s -> %s", self.state, state)
+        self.state, self.entered = state, (now, cpu, wakeups)
+
+    async def idle(self):
+        """Listen for the wake word (or doze after a long silence)"""
+        assistant = self.assistant
+        if self.pending is None:
+            self.pending = self.start(assistant.listen, "wake_word")
+        outcome, text, when = await self.until(self.pending)
+        if outcome == 'stop':
+            return self.STOPPED, when
+        self.pending = None
+        if text and assistant.wake_word in text:
+            return self.WAKE, when
+        if self.drowsy():
+            return self.DOZING, when
+        return self.IDLE, when
+
+    def drowsy(self):
+        """True once nothing has been heard for low_power_after seconds"""
+        assistant = self.assistant
+        config = assistant.config
+        capture = assistant.capture
+        if not config.get('low_power', True) or capture is None or not capture.is_alive():
+            return False
+        heard = max(self.awake_since, assistant.heard_at or 0)
+        return time.perf_counter() - heard >= config.get('low_power_after', 120)
+
+    async def dozing(self):
+        """Watch the energy of large reads until a spike, then listen for the wake word"""
+        assistant = self.assistant
+        config = assistant.config
+        capture = assistant.capture
+        microphone = capture.microphone
+        print(f"{Fore.YELLOW}🌙 Quiet for a while, low-power listening...{Style.RESET_ALL}")
+
+        spiked = self.loop.create_future()
+
+        def resolve(position, when):
+            if not spiked.done():
+                spiked.set_result((position, when))
+        # A margin over the listening threshold keeps background noise
+        # that hovers around it from waking the loop over and over
+        margin = config.get('low_power_wake_margin_db', 6)
+        capture.doze(EnergyMonitor(
+            assistant.recognizer.energy_threshold * 10 ** (margin / 20),
+            microphone.SAMPLE_WIDTH,
+            lambda position: self.loop.call_soon_threadsafe(resolve, position, time.perf_counter()),
+            chunks_per_read=config.get('low_power_frames', 8),
+            step=config.get('low_power_decimation', 4)
+        ))
+        try:
+            outcome, position, when = await self.until(spiked)
+        finally:
+            capture.doze(None)
+        if outcome == 'stop':
+            return self.STOPPED, when
+
+        # Hand the wake word listen the audio from just before the spike
+        lookback = config.get('low_power_lookback', 1.0)
+        chunks = math.ceil(lookback * microphone.SAMPLE_RATE / microphone.CHUNK)
+        assistant.audio_source.stream.rewind(position, chunks)
+        self.awake_since = time.perf_counter()
+        assistant.logger.info("Woke from low-power listening after %.0fs", when - self.entered[0])
+        return self.IDLE, when
+
+    async def wake(self):
+        """Acknowledge the wake word and start a turn"""
+        assistant = self.assistant
+        self.awake_since = time.perf_counter()
+        self.turn = assistant.metrics.new_turn('voice')
+        print(f"\n{Fore.GREEN}✅ Wake word detected!{Style.RESET_ALL}")
+
+        # Beep sound
+        print('\a', end='', flush=True)
+        assistant.speak("Yes?", priority=SpeechWorker.PRIORITY_HIGH)
+        return self.CAPTURING, time.perf_counter()
+
+    async def capturing(self):
+        """Capture the command; the capture thread reports when speech ends"""
+        assistant = self.assistant
+        if not self.wake_word:
+            self.turn = assistant.metrics.new_turn('voice')
+        self.pending = self.start(assistant.listen, "command")
+        outcome, payload, when = await self.until(self.pending, 'captured')
+        if outcome == 'stop':
+            return self.STOPPED, when
+        if outcome == 'captured':
+            return self.RECOGNIZING, when
+
+        # Finished in one go: nothing was said, or a streaming backend recognized as it captured
+        self.pending = None
+        return self.recognized(payload), when
+
+    async def recognizing(self):
+        """Wait for the transcript of the captured command"""
+        outcome, text, when = await self.until(self.pending)
+        if outcome == 'stop':
+            return self.STOPPED, when
+        self.pending = None
+        return self.recognized(text), when
+
+    def recognized(self, text):
+        """Execute a non-empty transcript; otherwise skip to speaking"""
+        self.command = text
+        if text:
+            return self.EXECUTING
+        self.drop_turn()
+        return self.SPEAKING
+
+    def drop_turn(self):
+        """Discard the turn in progress unless run_command already closed it"""
+        self.assistant.metrics.discard_turn(self.turn)
+        self.turn = None
+
+    async def executing(self):
+        """Run the command on a worker"""
+        assistant = self.assistant
+        outcome, result, when = await self.until(self.start(assistant.run_command, self.command))
+        self.turn = None
+        if outcome == 'stop' or assistant.is_quit(result):
+            return self.STOPPED, when
+        return self.SPEAKING, when
+
+    async def speaking(self):
+        """Wait out the reply unless barge-in lets the next capture start now"""
+        assistant = self.assistant
+        when = time.perf_counter()
+        if not assistant.settings.barge_in:
+            outcome, _, when = await self.until(self.speech_done())
+            if outcome == 'stop':
+                return self.STOPPED, when
+
+        # Don't replay audio captured while the command was handled
+        if self.command:
+            assistant.skip_buffered_audio()
+        if self.wake_word:
+            print(f"\n{Fore.YELLOW}💤 Returning to sleep...{Style.RESET_ALL}\n")
+        self.command = None
+        return self.rest_state, when
+
+    async def run(self, ipc_path=None):
+        """Drive the state machine until quit, a signal, or an IPC client's quit"""
+        assistant = self.assistant
+        self.loop = asyncio.get_running_loop()
+        self.events = asyncio.Queue()
+        self.pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='JarvisVoice')
+        stop = asyncio.Event()
+
+        # Event sources: signals, the capture thread, the reminder scheduler
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(signum, stop.set)
+            except NotImplementedError:
+                pass  # Windows: Ctrl+C raises KeyboardInterrupt out of asyncio.run() instead
+        assistant.on_captured = lambda: self.post('captured')
+        on_fire = assistant.scheduler.on_fire
+        assistant.scheduler.on_fire = lambda reminder: self.post('reminder', reminder)
+
+        async def watch_stop():
+            await stop.wait()
+            self.post('stop')
+        tasks = [self.loop.create_task(watch_stop())]
+        if ipc_path is not None:
+            tasks.append(self.loop.create_task(assistant.serve_daemon(ipc_path, stopped=stop)))
+
+        handlers = {
+            self.IDLE: self.idle, self.DOZING: self.dozing, self.WAKE: self.wake,
+            self.CAPTURING: self.capturing, self.RECOGNIZING: self.recognizing,
+            self.EXECUTING: self.executing, self.SPEAKING: self.speaking
+        }
+        state, since = self.rest_state, None
+        try:
+            while state != self.STOPPED and not self.stopping:
+                self.enter(state, since)
+                try:
+                    state, since = await handlers[state]()
+                    self.failures = 0
+                except Exception as e:
+                    # Back off on repeated errors, still serving events meanwhile
+                    self.failures += 1
+                    self.pending = None
+                    self.drop_turn()
+                    assistant.logger.error("Voice loop error in %s: %s", state, e)
+                    backoff = min(0.5 * 2 ** self.failures, 30)
+                    outcome, _, since = await self.until(self.pause(backoff))
+                    state = self.STOPPED if outcome == 'stop' else self.rest_state
+            self.enter(self.STOPPED, since)
+        finally:
+            self.drop_turn()
+            assistant.is_active = False
+            assistant.on_captured = None
+            assistant.scheduler.on_fire = on_fire
+            stop.set()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.pool.shutdown(wait=False)
+            assistant.logger.info("Voice loop stopped", extra={'states': self.summary()})
+
+    def summary(self):
+        """Per state: entries, seconds, CPU share, wakeups/s and RSS; per transition: latencies"""
+        states = {
+            state: {'entries': entries, 'seconds': round(wall, 3),
+                    'cpu_percent': round(100 * cpu / wall, 2) if wall else 0.0,
+                    'wakeups_per_second': round(wakeups / wall, 1) if wall else 0.0,
+                    'rss_mb': round(rss / 2 ** 20, 1)}
+            for state, (entries, wall, cpu, wakeups, rss) in self.states.items()
+        }
+        transitions = {}
+        for name, latencies in self.transitions.items():
+            quantiles = LatencyMetrics.quantiles(latencies)
+            transitions[name] = {'count': len(latencies), 'p50_ms': round(quantiles[0.5] * 1000, 3),
+                                 'p95_ms': round(quantiles[0.95] * 1000, 3)}
+        return {'states': states, 'transitions': transitions}
 
-# ASCII Banner
-BANNER = f"""{Fore.CYAN}
-    ╔{'═' * 58}╗
-    ║{' ' * 58}║
-    ║{Fore.YELLOW}      ██╗ █████╗ ██████╗ ██╗   ██╗██╗███████╗     {Fore.CYAN}║
-    ║{Fore.YELLOW}      ██║██╔══██╗██╔══██╗██║   ██║██║██╔════╝     {Fore.CYAN}║
-    ║{Fore.YELLOW}      ██║███████║██████╔╝██║   ██║██║███████╗     {Fore.CYAN}║
-    ║{Fore.YELLOW} ██   ██║██╔══██║██╔══██╗╚██╗ ██╔╝██║╚════██║     {Fore.CYAN}║
-    ║{Fore.YELLOW} ╚█████╔╝██║  ██║██║  ██║ ╚████╔╝ ██║███████║     {Fore.CYAN}║
-    ║{Fore.YELLOW}  ╚════╝ ╚═╝  ╚═╝╚═╝  ╚═╝  ╚═══╝  ╚═╝╚══════╝     {Fore.CYAN}║
-    ║{' ' * 58}║
-    ║{Fore.GREEN}      Just A Rather Very Intelligent System      {Fore.CYAN}║
-    ║{' ' * 58}║
-    ║{Fore.MAGENTA}         macOS Assistant • Version 2.1.0          {Fore.CYAN}║
-    ║{Fore.MAGENTA}           GitHub: @its4yus4                    {Fore.CYAN}║
-    ║{Fore.MAGENTA}           License: MIT                         {Fore.CYAN}║
-    ║{' ' * 58}║
-    ╚{'═' * 58}╝
-{Style.RESET_ALL}"""
 
 class JarvisAssistant:
     """Main Jarvis Assistant Class"""
     
-    def __init__(self, debug=False, log_file=None):
+    def __init__(self, debug=False, log_file=None, speech=True, profiler=None, metrics=False,
+                 quiet=False, ephemeral=False):
         self.debug = debug
+        self.quiet = quiet  # No banner or console replies (batch mode)
+        self.ephemeral = ephemeral  # Nothing persisted or watched in the background (batch mode)
         self.version = "2.1.0"
         self.author = "its4yus4"
         self.license = "MIT"
+        self.profiler = profiler or StartupProfiler()
         
         # Initialize logging
-        self.setup_logging(log_file)
+        with self.profiler.phase('logging'):
+            self.setup_logging(log_file)
         
         # Print banner
-        self.print_banner()
+        if not self.quiet:
+            with self.profiler.phase('banner'):
+                self.print_banner()
         
         # Create necessary directories
-        self.setup_directories()
+        with self.profiler.phase('directories'):
+            self.setup_directories()
         
-        # Initialize components
-        self.recognizer = sr.Recognizer()
-        self.engine = self.init_tts()
+        # The recognizer is created on first use (see the property below)
+        self._recognizer = None
         
         # Load configurations
-        self.config = self.load_config('config.json', self.default_config())
-        self.apps_config = self.load_config('apps_config.json', self.default_apps_config())
+        with self.profiler.phase('config'):
+            self.snapshot = self.build_snapshot(
+                self.load_config('config.json', self.default_config()),
+                self.load_config('apps_config.json', self.default_apps_config())
+            )
+        
+        # Start writing the log records queued so far
+        with self.profiler.phase('log writer'):
+            self.start_log_writer()
+
+        # Per-stage latency instrumentation (a no-op unless enabled)
+        self.metrics = self.init_metrics(metrics)
+
+        # Command history feeds the app ranking and prewarming
+        self.history = None
+        if self.config.get('history', True) and not self.ephemeral:
+            try:
+                self.history = CommandHistory(self.config.get('history_file', 'history.db'),
+                                              self.logger)
+                self.history.start()
+            except sqlite3.Error as e:
+                self.logger.error("Could not open command history: %s", e)
+        self.priors_stamp = None
+        self.prewarmed = {}  # App key -> when it was last prewarmed
+
+        # Speech runs on its own thread so replies never block the listen loop;
+        # the engine itself is initialized there, concurrently with the rest
+        with self.profiler.phase('tts worker start'):
+            if speech:
+                self.tts = SpeechWorker(self.init_tts, self.logger, self.phrase_cache_factory(),
+                                        metrics=self.metrics)
+            else:
+                self.tts = SpeechWorker(lambda: None, self.logger)
+            self.tts.start()
+            if speech:
+                self.tts.warm(self.cacheable_phrases())
+
+        self.quit_commands = next(entry['phrases'] for entry in INTENTS
+                                  if entry['intent'] == 'quit')
+
+        # App launches and system commands run on a bounded worker pool
+        self.executor = CommandExecutor(
+            max_workers=self.config.get('executor_workers', 4),
+            default_timeout=self.config.get('command_timeout', 10),
+            logger=self.logger,
+            metrics=self.metrics
+        )
+
+        # Reminders and timers share one scheduler thread; scripted
+        # reminders stay out of the user's reminders file
+        self.scheduler = ReminderScheduler(
+            None if self.ephemeral else self.config.get('reminders_file', 'reminders.json'),
+            on_fire=self.on_reminder,
+            logger=self.logger
+        )
+        self.scheduler.start()
+
+        # Pick up edits to either config file without a restart
+        self.config_watcher = None
+        if self.config.get('config_reload', True) and not self.ephemeral:
+            self.config_watcher = ConfigWatcher(
+                ['config.json', 'apps_config.json'],
+                self.reload_config,
+                interval=self.config.get('config_reload_interval', 1.0),
+                logger=self.logger
+            )
+            self.config_watcher.start()
+
+        # Compile the intent table once
+        with self.profiler.phase('intent router'):
+            self.router = IntentRouter(INTENTS)
+        self.app_index = None
+        self.verified_paths = set()  # App paths known to exist
+
+        # Installed apps not in apps_config.json, loaded from the last scan
+        # and refreshed in the background (on a miss only, when ephemeral)
+        self.installed_apps = None
+        if self.config.get('app_discovery', True):
+            self.installed_apps = InstalledApps(
+                self.config.get('app_discovery_roots',
+                                ['/Applications', '/System/Applications', '~/Applications']),
+                self.config.get('app_discovery_cache', 'cache/installed_apps.json'),
+                self.logger
+            )
+            if not self.ephemeral:
+                self.installed_apps.refresh_in_background()
+
+        # Local wake word spotting keeps idle audio off the network;
+        # loaded by the voice modes only
+        self.wake_spotter = None
         
-        # Set wake word
-        self.wake_word = self.config.get('wake_word', 'hey jarvis').lower()
-        self.quit_commands = ['quit', 'exit', 'goodbye', 'stop', 'shutdown', 'close']
+        # Streaming recognition (see get_streaming_backend)
+        self.streaming_backend = None
+        self.streaming_checked = False
+        self.speech_ended = None  # perf_counter() at the end of the last spoken command
+        self.on_captured = None   # Called once a command's audio is in (voice state machine)
+        self.heard_at = None      # perf_counter() when the microphone last picked up a phrase
+
+        # Voice activity detection before recognition (see get_vad)
+        self.vad = None
+        self.preprocessor = None
+        self.recognition = None  # HedgedRecognizer over the configured backends
+        self.recognize_rate = 0.3  # Initial guess, refined by track_recognize_rate
         
         # State variables
         self.is_active = True
         self.listening = False
+
+        # Persistent audio capture (started by the voice modes)
+        self.capture = None
+        self.audio_source = None
+        
+        # Replies spoken while a command runs are collected per thread
+        self.turn_state = threading.local()
+
+        if self.quiet:
+            return
         
         # Print initialization info
-        self.print_info()
+        with self.profiler.phase('system info'):
+            self.print_info()
         
         # Speak welcome message
         self.speak(f"Jarvis initialized. Say '{self.wake_word}' to begin.")
     
+    def init_metrics(self, force=False):
+        """Create the latency metrics collector, or a no-op stand-in"""
+        if not (force or self.config.get('metrics', False)):
+            return NullMetrics()
+
+        metrics = LatencyMetrics(
+            window=self.config.get('metrics_window', 1000),
+            jsonl_path=self.config.get('metrics_file', 'logs/metrics.jsonl'),
+            logger=self.logger
+        )
+        port = self.config.get('metrics_port')
+        if port:
+            try:
+                metrics.serve(port)
+            except OSError as e:
+                self.logger.error("Could not start metrics endpoint on port %s: %s", port, e)
+        return metrics
+
+    @property
+    def recognizer(self):
+        """Speech recognizer, importing the audio stack on first use"""
+        if self._recognizer is None:
+            self._recognizer = load_speech_recognition().Recognizer()
+            self.apply_recognizer_settings()
+        return self._recognizer
+
+    @property
+    def config(self):
+        """Current config.json settings"""
+        return self.snapshot.config
+
+    @property
+    def apps_config(self):
+        """Current apps_config.json settings"""
+        return self.snapshot.apps_config
+
+    @property
+    def settings(self):
+        """Settings derived from the current config"""
+        return self.snapshot.settings
+
+    @property
+    def wake_word(self):
+        """Current wake word"""
+        return self.snapshot.settings.wake_word
+
+    def apply_recognizer_settings(self):
+        """Push thresholds to the recognizer; done on creation and on config change only"""
+        settings = self.settings
+        self._recognizer.energy_threshold = settings.energy_threshold
+        self._recognizer.dynamic_energy_threshold = settings.dynamic_energy_threshold
+        self._recognizer.pause_threshold = settings.pause_threshold
+
+    def build_snapshot(self, config, apps_config, previous=None):
+        """Build a config snapshot, reusing whatever is unchanged from the previous one"""
+        settings = build_settings(config)
+        if previous is None:
+            return ConfigSnapshot(config, apps_config, settings, build_system_commands(apps_config))
+
+        # Keeping the same applications object keeps the app index from rebuilding
+        applications = previous.apps_config.get('applications', {})
+        if apps_config.get('applications', {}) == applications:
+            apps_config = dict(apps_config, applications=applications)
+
+        if apps_config.get('system_commands') == previous.apps_config.get('system_commands'):
+            system_commands = previous.system_commands
+        else:
+            system_commands = build_system_commands(apps_config)
+
+        if settings == previous.settings:
+            settings = previous.settings
+        return ConfigSnapshot(config, apps_config, settings, system_commands)
+
+    def reload_config(self):
+        """Validate edited config files and swap in a new snapshot; False if rejected"""
+        try:
+            with open('config.json', 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            with open('apps_config.json', 'r', encoding='utf-8') as f:
+                apps_config = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error("Config reload skipped: %s", e)
+            return False
+
+        errors = validate_config(config, self.default_config()) + validate_apps_config(apps_config)
+        if errors:
+            for error in errors:
+                self.logger.error("Invalid config, keeping the previous one: %s", error)
+            return False
+
+        old = self.snapshot
+        new = self.build_snapshot(config, apps_config, previous=old)
+        self.snapshot = new  # A single assignment, so readers see old or new, never a mix
+
+        changed = sorted(key for key in set(old.config) | set(config)
+                         if old.config.get(key) != config.get(key))
+        if self._recognizer is not None and any(
+                getattr(old.settings, name) != getattr(new.settings, name)
+                for name in RECOGNIZER_SETTINGS):
+            self.apply_recognizer_settings()
+        if new.apps_config.get('applications') is not old.apps_config.get('applications') \
+                or new.system_commands is not old.system_commands:
+            self.tts.warm(self.cacheable_phrases())
+
+        restart = [key for key in changed if key in RESTART_KEYS]
+        if restart:
+            self.logger.warning("Restart Jarvis to apply: %s", ', '.join(restart))
+        self.logger.info("Config reloaded (%s)", ', '.join(changed) or 'apps only')
+        return True
+
+    def startup_complete(self):
+        """Called by each mode once it can accept its first command"""
+        if self.tts.init_seconds is not None:
+            self.profiler.record('tts engine (background)', self.tts.init_seconds)
+        self.profiler.report()
+
+    def init_wake_spotter(self):
+        """Load the offline wake word spotter if samples have been enrolled"""
+        if not self.config.get('offline_wake_word', True):
+            return None
+
+        if not WakeWordSpotter.available():
+            self.logger.info("NumPy not installed, wake word detection uses the cloud recognizer")
+            return None
+
+        spotter = WakeWordSpotter(
+            threshold=self.config.get('wake_word_threshold'),
+            energy_threshold=self.config.get('wake_word_energy', 0.01),
+            logger=self.logger
+        )
+        directory = self.config.get('wake_word_samples_dir', 'wake_word_samples')
+        if not spotter.load_templates(directory):
+            self.logger.info("No wake word samples in %s/, run --mode enroll to record some",
+                             directory)
+            return None
+
+        self.logger.info("Offline wake word spotter loaded %s samples", len(spotter.templates))
+        return spotter
+
     def setup_logging(self, log_file):
-        """Setup logging configuration"""
-        import logging
-        
-        if log_file is None:
-            log_file = 'logs/jarvis.log'
+        """Route log records through a queue so formatting and I/O happen off the calling thread
         
+        Records are queued from the start; the writer that drains the queue
+        is started by start_log_writer() once the config is loaded.
+        """
+        self.log_file = log_file
         self.logger = logging.getLogger('Jarvis')
         self.logger.setLevel(logging.DEBUG if self.debug else logging.INFO)
+        self.logger.propagate = False
+        
+        # A second instance in the same process replaces the handlers instead of stacking them
+        stop_log_writer()
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+            handler.close()
+
+        self.log_queue = queue.Queue(-1)
+        handler = LogQueueHandler(self.log_queue)
+        self.log_filter = LogContextFilter(self.current_turn)
+        handler.addFilter(self.log_filter)
+        self.logger.addHandler(handler)
+
+    def current_turn(self):
+        """Id of this thread's open metrics turn, for log records"""
+        metrics = getattr(self, 'metrics', None)
+        return metrics.current_turn() if metrics is not None else None
+
+    def start_log_writer(self):
+        """Attach the rotating file and console handlers and start the background writer"""
+        global _log_listener
         
-        # File handler
-        fh = logging.FileHandler(log_file)
+        log_file = self.log_file or self.config.get('log_file', 'logs/jarvis.log')
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        self.log_file = log_file
+
+        # Rotation keeps long continuous sessions bounded on disk
+        backups = self.config.get('log_backup_count', 5)
+        if self.config.get('log_rotation', 'size') == 'time':
+            fh = TimedRotatingLogFile(
+                log_file, when=self.config.get('log_rotate_when', 'midnight'), backupCount=backups)
+        else:
+            fh = RotatingLogFile(
+                log_file, maxBytes=int(self.config.get('log_max_mb', 10) * 1024 * 1024),
+                backupCount=backups)
         fh.setLevel(logging.DEBUG)
+        if self.config.get('log_format', 'json') == 'json':
+            fh.setFormatter(JsonLogFormatter())
+        else:
+            fh.setFormatter(
+                logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
         
         # Console handler
         ch = logging.StreamHandler()
-        ch.setLevel(logging.INFO)
+        ch.setLevel(logging.WARNING if self.quiet else logging.INFO)
+        ch.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
         
-        # Formatter
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        fh.setFormatter(formatter)
-        ch.setFormatter(formatter)
+        self.log_filter.debug_sample_rate = self.config.get('log_debug_sample_rate', 1.0)
         
-        self.logger.addHandler(fh)
-        self.logger.addHandler(ch)
+        _log_listener = LogWriter(self.log_queue, fh, ch, respect_handler_level=True)
+        _log_listener.start()
     
     def setup_directories(self):
         """Create necessary directories"""
@@ -133,22 +3741,21 @@ class JarvisAssistant:
         print(f"{Fore.BLUE}📄 License: {self.license}")
         print(f"{Fore.MAGENTA}🎤 Wake Word: '{self.wake_word}'")
         print(f"{Fore.CYAN}💻 System: macOS {self.get_macos_version()}")
-        print(f"{Fore.BLUE}📁 Logs: logs/jarvis.log")
+        print(f"{Fore.BLUE}📁 Logs: {self.log_file}")
         print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}\n")
     
     def get_macos_version(self):
         """Get macOS version"""
+        # platform reads SystemVersion.plist directly instead of spawning sw_vers
         try:
-            result = subprocess.run(['sw_vers', '-productVersion'], 
-                                  capture_output=True, text=True, check=True)
-            return result.stdout.strip()
+            return platform.mac_ver()[0] or "Unknown"
         except:
             return "Unknown"
     
     def init_tts(self):
         """Initialize text-to-speech engine"""
         try:
-            engine = pyttsx3.init()
+            engine = load_pyttsx3().init()
             
             # Get available voices
             voices = engine.getProperty('voices')
@@ -165,14 +3772,45 @@ class JarvisAssistant:
                     break
             
             # Set properties
-            engine.setProperty('rate', 185)  # Speech speed
-            engine.setProperty('volume', 0.95)  # Volume
+            engine.setProperty('rate', self.config.get('voice_rate', 185))  # Speech speed
+            engine.setProperty('volume', self.config.get('voice_volume', 0.95))  # Volume
             
             return engine
         except Exception as e:
             self.logger.error(f"Failed to initialize TTS: {e}")
             return None
     
+    def phrase_cache_factory(self):
+        """Return a callable that opens the TTS phrase cache for the engine's voice"""
+        if not self.config.get('tts_cache', True):
+            return None
+
+        def open_cache(voice, rate, volume):
+            return PhraseCache(
+                self.config.get('tts_cache_dir', 'cache/tts'),
+                voice, rate, volume,
+                max_bytes=int(self.config.get('tts_cache_max_mb', 50) * 1024 * 1024),
+                logger=self.logger
+            )
+        return open_cache
+
+    def cacheable_phrases(self):
+        """Replies that recur often enough to be worth pre-rendering"""
+        phrases = ["Yes?", "Goodbye! Shutting down.", "Here are the available commands."]
+        for responses in RESPONSES.values():
+            phrases.extend(responses)
+        # Apps in order of use, so the likely replies are rendered first
+        applications = list(self.apps_config.get('applications', {}))
+        if self.history is not None:
+            likelihoods = {target: p for (_, target), p
+                           in self.history.likelihoods(('open_app',)).items()}
+            applications.sort(key=lambda app_key: -likelihoods.get(app_key, 0))
+        for app_key in applications:
+            phrases.append(f"Opening {app_key.replace('_', ' ')}")
+        for cmd_key in self.apps_config.get('system_commands', {}):
+            phrases.append(f"Executing {cmd_key.replace('_', ' ')}")
+        return phrases
+    
     def load_config(self, filename, default_config):
         """Load configuration from file or create default"""
         if os.path.exists(filename):
@@ -201,12 +3839,76 @@ class JarvisAssistant:
             "dynamic_energy_threshold": True,
             "pause_threshold": 0.8,
             "ambient_adjust_duration": 0.5,
+            "persistent_capture": True,
+            "capture_buffer_seconds": 15,
+            "low_power": True,
+            "low_power_after": 120,
+            "low_power_frames": 8,
+            "low_power_decimation": 4,
+            "low_power_lookback": 1.0,
+            "low_power_wake_margin_db": 6.0,
+            "offline_wake_word": True,
+            "wake_word_samples_dir": "wake_word_samples",
+            "wake_word_threshold": None,
+            "wake_word_energy": 0.01,
             "voice_rate": 185,
             "voice_volume": 0.95,
+            "tts_cache": True,
+            "tts_cache_dir": "cache/tts",
+            "tts_cache_max_mb": 50,
             "log_level": "INFO",
             "auto_start": False,
             "notifications": True,
             "beep_on_wake": True,
+            "barge_in": False,
+            "app_discovery": True,
+            "app_discovery_roots": ["/Applications", "/System/Applications", "~/Applications"],
+            "app_discovery_cache": "cache/installed_apps.json",
+            "executor_workers": 4,
+            "command_timeout": 10,
+            "reminders_file": "reminders.json",
+            "history": True,
+            "history_file": "history.db",
+            "history_prewarm": False,
+            "history_prewarm_threshold": 0.3,
+            "streaming_backend": None,
+            "vosk_model": "models/vosk-model-small-en-us",
+            "stream_early_commit": True,
+            "stream_stable_seconds": 0.3,
+            "vad": True,
+            "vad_energy_margin_db": 10.0,
+            "vad_hangover_seconds": 0.3,
+            "vad_padding_seconds": 0.15,
+            "recognition_backends": ["google"],
+            "recognition_budget": 5.0,
+            "recognition_min_confidence": 0.6,
+            "recognition_hedge_delay": 0.0,
+            "recognition_fallback": [],
+            "recognition_failure_threshold": 3,
+            "recognition_slow_seconds": 4.0,
+            "recognition_reset_seconds": 10.0,
+            "recognition_max_reset_seconds": 120.0,
+            "audio_preprocess": True,
+            "audio_sample_rate": 16000,
+            "audio_normalize": True,
+            "audio_target_peak_dbfs": -3.0,
+            "audio_max_gain_db": 20.0,
+            "config_reload": True,
+            "config_reload_interval": 1.0,
+            "daemon_socket": "~/.jarvis.sock",
+            "daemon_workers": 8,
+            "voice_ipc": False,
+            "log_file": "logs/jarvis.log",
+            "log_format": "json",
+            "log_rotation": "size",
+            "log_max_mb": 10,
+            "log_backup_count": 5,
+            "log_rotate_when": "midnight",
+            "log_debug_sample_rate": 1.0,
+            "metrics": False,
+            "metrics_file": "logs/metrics.jsonl",
+            "metrics_port": None,
+            "metrics_window": 1000,
             "license": "MIT"
         }
     
@@ -286,71 +3988,117 @@ class JarvisAssistant:
             }
         }
     
-    def speak(self, text, wait=True):
-        """Convert text to speech"""
-        print(f"{Fore.CYAN}🤖 Jarvis:{Style.RESET_ALL} {text}")
+    def speak(self, text, wait=False, priority=SpeechWorker.PRIORITY_NORMAL):
+        """Queue text for speech and return a SpeechHandle"""
+        replies = getattr(self.turn_state, 'replies', None)
+        if replies is not None:
+            replies.append(text)
+            # Steps of a compound command are summarized once it has run
+            if getattr(self.turn_state, 'deferred', False):
+                handle = SpeechHandle(text, priority)
+                handle.done.set()
+                return handle
+        if not self.quiet:
+            print(f"{Fore.CYAN}🤖 Jarvis:{Style.RESET_ALL} {text}")
         self.logger.info(f"Speaking: {text}")
         
-        if self.engine:
-            try:
-                self.engine.say(text)
-                if wait:
-                    self.engine.runAndWait()
-            except Exception as e:
-                self.logger.error(f"TTS Error: {e}")
+        handle = self.tts.say(text, priority)
+        if wait:
+            handle.wait()
+        return handle
+    
+    def display(self, text):
+        """Print handler output; when quiet (batch mode) stdout is kept for results"""
+        print(text, file=sys.stderr if self.quiet else sys.stdout)
+
+    def interrupt_speech(self):
+        """Cut off replies that are stale now that the user is talking again"""
+        if self.tts.busy():
+            self.logger.debug("Barge-in: cancelling queued speech")
+            self.tts.cancel_pending()
+
+    def shutdown(self, drain=True):
+        """Stop background workers, finishing queued speech if drain is set"""
+        self.stop_capture()
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+        self.scheduler.stop()
+        if self.history is not None:
+            self.history.stop()
+        self.executor.shutdown()
+        if self.recognition is not None:
+            self.logger.info("Recognition backends", extra={'backends': self.recognition.summary()})
+            self.recognition.shutdown()
+        self.tts.shutdown(drain=drain)
+        self.metrics.close()
+        stop_log_writer()
     
+    def start_capture(self):
+        """Start the persistent microphone capture thread"""
+        if not self.config.get('persistent_capture', True) or self.capture is not None:
+            return
+
+        load_speech_recognition()
+        try:
+            capture = AudioCapture(
+                buffer_seconds=self.config.get('capture_buffer_seconds', 15),
+                logger=self.logger
+            )
+            capture.start()
+        except OSError as e:
+            self.logger.error("Persistent capture unavailable, using per-turn capture: %s", e)
+            return
+
+        self.capture = capture
+        self.audio_source = capture.source()
+
+        # Calibrate once instead of on every turn
+        self.recognizer.adjust_for_ambient_noise(
+            self.audio_source, duration=self.settings.ambient_adjust_duration)
+        self.logger.info("Persistent audio capture started")
+
+    def stop_capture(self):
+        """Stop the persistent microphone capture thread"""
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture = None
+            self.audio_source = None
+
+    def skip_buffered_audio(self):
+        """Discard audio captured while a command was being handled"""
+        # Without barge-in, Jarvis must not hear its own reply as a command
+        if not self.settings.barge_in:
+            self.tts.wait_idle()
+
+        if self.audio_source is not None:
+            self.audio_source.stream.skip_to_live()
+
     def listen(self, listen_type="command"):
         """Listen for audio input"""
+        settings = self.settings
+
+        # Half-duplex unless barge-in is enabled: let the current reply finish
+        if not settings.barge_in:
+            self.tts.wait_idle()
+
         try:
-            # Configure recognizer
-            self.recognizer.energy_threshold = self.config.get('energy_threshold', 300)
-            self.recognizer.dynamic_energy_threshold = self.config.get('dynamic_energy_threshold', True)
-            self.recognizer.pause_threshold = self.config.get('pause_threshold', 0.8)
-            
-            with sr.Microphone() as source:
+            # Read from the shared ring buffer while the capture thread runs
+            if self.capture is not None and self.capture.is_alive():
+                return self.listen_from(self.audio_source, listen_type)
+
+            microphone = sr.Microphone()
+            with self.metrics.stage('device_open'):
+                source = microphone.__enter__()  # pylint: disable=unnecessary-dunder-call
+            try:
                 # Adjust for ambient noise
-                adjust_duration = self.config.get('ambient_adjust_duration', 0.5)
-                self.recognizer.adjust_for_ambient_noise(source, duration=adjust_duration)
-                
-                # Set timeout based on listen type
-                if listen_type == "wake_word":
-                    print(f"{Fore.YELLOW}👂 Listening for '{self.wake_word}'...{Style.RESET_ALL}")
-                    timeout = 3
-                    phrase_limit = 3
-                else:
-                    print(f"{Fore.GREEN}🎤 Speak your command...{Style.RESET_ALL}")
-                    timeout = self.config.get('listen_timeout', 7)
-                    phrase_limit = self.config.get('phrase_time_limit', 8)
-                
-                try:
-                    # Listen for audio
-                    audio = self.recognizer.listen(
-                        source, 
-                        timeout=timeout,
-                        phrase_time_limit=phrase_limit
-                    )
-                    
-                    # Recognize speech
-                    text = self.recognizer.recognize_google(audio).lower()
-                    self.logger.info(f"Recognized: {text}")
-                    
-                    return text
-                    
-                except sr.WaitTimeoutError:
-                    if listen_type == "wake_word":
-                        print(f"{Fore.YELLOW}⏳ No wake word detected{Style.RESET_ALL}", end='\r')
-                    else:
-                        print(f"{Fore.YELLOW}⏳ No command detected{Style.RESET_ALL}")
-                    return None
-                    
-                except sr.UnknownValueError:
-                    print(f"{Fore.RED}❓ Could not understand audio{Style.RESET_ALL}")
-                    return None
-                    
-                except sr.RequestError as e:
-                    print(f"{Fore.RED}🌐 Network error: {e}{Style.RESET_ALL}")
-                    return None
-                    
+                with self.metrics.stage('ambient_adjust'):
+                    self.recognizer.adjust_for_ambient_noise(
+                        source, duration=settings.ambient_adjust_duration)
+
+                return self.listen_from(source, listen_type)
+            finally:
+                microphone.__exit__(None, None, None)
+
         except OSError as e:
             print(f"{Fore.RED}🎤 Microphone error: {e}{Style.RESET_ALL}")
             print(f"{Fore.YELLOW}Please check microphone permissions in System Preferences{Style.RESET_ALL}")
@@ -358,6 +4106,312 @@ class JarvisAssistant:
         except Exception as e:
             self.logger.error(f"Listen error: {e}")
             return None
+
+    def listen_from(self, source, listen_type):
+        """Capture one phrase from an open source and recognize it"""
+        settings = self.settings
+
+        # Set timeout based on listen type
+        if listen_type == "wake_word":
+            print(f"{Fore.YELLOW}👂 Listening for '{self.wake_word}'...{Style.RESET_ALL}")
+            timeout = 3
+            phrase_limit = 3
+        else:
+            print(f"{Fore.GREEN}🎤 Speak your command...{Style.RESET_ALL}")
+            timeout = settings.listen_timeout
+            phrase_limit = settings.phrase_time_limit
+
+            # Stream commands to the backend as they are spoken when one is configured
+            backend = self.get_streaming_backend()
+            if backend is not None:
+                try:
+                    return self.listen_streaming(source, backend)
+                except Exception as e:
+                    self.logger.error("Streaming recognition error: %s", e)
+                    return None
+
+        try:
+            # Listen for audio
+            with self.metrics.stage('wake_capture' if listen_type == "wake_word" else 'capture'):
+                audio = self.recognizer.listen(
+                    source,
+                    timeout=timeout,
+                    phrase_time_limit=phrase_limit
+                )
+            self.heard_at = time.perf_counter()
+            if listen_type != "wake_word":
+                # listen() returns once pause_threshold of silence has passed
+                self.speech_ended = time.perf_counter() - settings.pause_threshold
+                if self.on_captured is not None:
+                    self.on_captured()
+
+            # New speech from the user makes anything still being said stale
+            if settings.barge_in:
+                self.interrupt_speech()
+
+            # Spot the wake word locally; only real commands reach the cloud
+            if listen_type == "wake_word" and self.wake_spotter is not None:
+                with self.metrics.stage('wake_spot'):
+                    hit = self.wake_spotter.detect(audio.get_raw_data(), audio.sample_rate,
+                                                   audio.sample_width)
+                if hit:
+                    self.logger.info("Wake word spotted locally")
+                    return self.wake_word
+                return None
+
+            started = time.perf_counter()
+
+            # Trim silence locally; clips with no speech never reach the network
+            vad = self.get_vad()
+            if vad is not None:
+                audio = self.trim_audio(vad, audio)
+                if audio is None:
+                    return None
+
+            # Shrink to 16 kHz mono before upload
+            preprocessor = self.get_preprocessor()
+            if preprocessor is not None:
+                audio = self.preprocess_audio(preprocessor, audio)
+
+            # Recognize speech
+            recognize_started = time.perf_counter()
+            with self.metrics.stage('recognize'):
+                result = self.get_recognition().recognize(audio)
+            text = result.text.lower()
+            self.track_recognize_rate(audio, time.perf_counter() - recognize_started)
+            self.metrics.observe('recognition_total', time.perf_counter() - started)
+            self.logger.info("Recognized: %s", text)
+
+            return text
+
+        except sr.WaitTimeoutError:
+            if listen_type == "wake_word":
+                print(f"{Fore.YELLOW}⏳ No wake word detected{Style.RESET_ALL}", end='\r')
+            else:
+                print(f"{Fore.YELLOW}⏳ No command detected{Style.RESET_ALL}")
+            return None
+
+        except sr.UnknownValueError:
+            print(f"{Fore.RED}❓ Could not understand audio{Style.RESET_ALL}")
+            return None
+
+        except sr.RequestError as e:
+            print(f"{Fore.RED}🌐 Network error: {e}{Style.RESET_ALL}")
+            return None
+
+    def get_streaming_backend(self):
+        """Streaming recognizer from config, created on first use (None when not configured)"""
+        if not self.streaming_checked:
+            self.streaming_checked = True
+            backend = self.config.get('streaming_backend')
+            if backend == 'vosk':
+                if not VoskStreamingBackend.available():
+                    self.logger.warning("streaming_backend is 'vosk' but vosk is not installed")
+                else:
+                    try:
+                        self.streaming_backend = VoskStreamingBackend(
+                            self.config.get('vosk_model', 'models/vosk-model-small-en-us'))
+                    except Exception as e:
+                        self.logger.error("Could not load the Vosk model: %s", e)
+            elif backend:
+                self.logger.warning("Unknown streaming_backend '%s'", backend)
+        return self.streaming_backend
+
+    def listen_streaming(self, source, backend, early=None):
+        """Feed a command to a streaming backend chunk by chunk
+
+        Returns as soon as a partial result has been stable for
+        stream_stable_seconds and routes to an unambiguous intent, or
+        else the final transcript once the speaker pauses.
+        """
+        settings = self.settings
+        energy_threshold = self.recognizer.energy_threshold
+        stable_seconds = self.config.get('stream_stable_seconds', 0.3)
+        if early is None:
+            early = self.config.get('stream_early_commit', True)
+        chunk_seconds = source.CHUNK / source.SAMPLE_RATE
+
+        backend.start(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+        audio_seconds, first_voice, last_voice = 0.0, None, None
+        partial, changed_at = '', 0.0
+
+        # Audio time rather than wall time, so replayed files behave like a microphone
+        with self.metrics.stage('capture'):
+            while True:
+                chunk = source.stream.read(source.CHUNK)
+                if not chunk:
+                    break
+                audio_seconds += chunk_seconds
+
+                if chunk_rms(chunk, source.SAMPLE_WIDTH) > energy_threshold:
+                    if first_voice is None:
+                        first_voice = audio_seconds
+                    last_voice = audio_seconds
+                    self.speech_ended = time.perf_counter()
+                elif first_voice is None:
+                    if audio_seconds > settings.listen_timeout:
+                        print(f"{Fore.YELLOW}⏳ No command detected{Style.RESET_ALL}")
+                        return None
+                    continue
+
+                text = backend.feed(chunk)
+                if text != partial:
+                    partial, changed_at = text, audio_seconds
+                    print(f"\r{Fore.CYAN}💬 {partial}{Style.RESET_ALL}", end='', flush=True)
+
+                if early and partial and audio_seconds - changed_at >= stable_seconds \
+                        and self.early_intent(partial):
+                    print()
+                    self.logger.info("Committed early on partial result: %s", partial)
+                    return partial
+
+                if audio_seconds - last_voice >= settings.pause_threshold \
+                        or audio_seconds - first_voice >= settings.phrase_time_limit:
+                    break
+
+        if first_voice is None:
+            return None
+        print()
+
+        with self.metrics.stage('recognize'):
+            text = backend.finish().lower()
+        self.logger.info("Recognized (streaming): %s", text)
+        return text or None
+
+    def early_intent(self, text):
+        """Intent to act on before the utterance ends, or None while it could still change"""
+        text = self.normalize_command(text)
+        if not text or self.wake_word.startswith(text) or self.router.incomplete(text):
+            return None
+
+        intent, slots = self.router.route(text)
+        if intent in self.router.early:
+            return intent
+
+        # Slot-taking intents decide for themselves via early_<intent>
+        check = f"early_{intent}"
+        if hasattr(self, check) and getattr(self, check)(slots):
+            return intent
+        return None
+
+    def early_open_app(self, slots):
+        """Commit only on an exact alias that no longer alias starts with"""
+        index = self.get_app_index()
+        candidates = index.lookup(slots['app'], limit=1)
+        return bool(candidates) and candidates[0][1] == 1.0 and not index.is_prefix(slots['app'])
+
+    def get_vad(self):
+        """Voice activity detector, created on first use (None if disabled or NumPy is missing)"""
+        if self.vad is None and self.config.get('vad', True) and VoiceActivityDetector.available():
+            self.vad = VoiceActivityDetector(
+                energy_margin_db=self.config.get('vad_energy_margin_db', 10.0),
+                hangover_seconds=self.config.get('vad_hangover_seconds', 0.3),
+                padding_seconds=self.config.get('vad_padding_seconds', 0.15),
+                logger=self.logger
+            )
+        return self.vad
+
+    def trim_audio(self, vad, audio):
+        """Return audio with silence trimmed, or None if it holds no speech"""
+        with self.metrics.stage('vad'):
+            trimmed, report = vad.trim(audio.get_raw_data(), audio.sample_rate, audio.sample_width)
+
+        # Recognition time scales roughly with clip length, so the trimmed
+        # seconds times the observed seconds-per-second estimate the saving
+        saved = report['seconds_in'] if trimmed is None else report['seconds_saved']
+        report['latency_saved'] = round(saved * self.recognize_rate, 3)
+
+        if trimmed is None:
+            self.logger.info("VAD: no speech in %ss clip, skipped recognition (~%.0f ms saved)",
+                             report['seconds_in'], report['latency_saved'] * 1000,
+                             extra={'vad': report})
+            return None
+
+        self.logger.info("VAD: trimmed %s of %s bytes (~%.0f ms saved)",
+                         report['bytes_saved'], report['bytes_in'], report['latency_saved'] * 1000,
+                         extra={'vad': report})
+        return sr.AudioData(trimmed, audio.sample_rate, audio.sample_width)
+
+    def get_recognition(self):
+        """Hedged recognizer over recognition_backends, created on first use"""
+        if self.recognition is None:
+            backends = self.load_recognition_backends(
+                self.config.get('recognition_backends', ['google']))
+            if not backends:
+                backends.append(GoogleBackend(self.recognizer))
+
+            self.recognition = HedgedRecognizer(
+                backends,
+                fallback=self.load_recognition_backends(
+                    self.config.get('recognition_fallback', [])),
+                budget=self.config.get('recognition_budget', 5.0),
+                min_confidence=self.config.get('recognition_min_confidence', 0.6),
+                hedge_delay=self.config.get('recognition_hedge_delay', 0.0),
+                breaker={
+                    'failure_threshold': self.config.get('recognition_failure_threshold', 3),
+                    'slow_seconds': self.config.get('recognition_slow_seconds', 4.0),
+                    'reset_seconds': self.config.get('recognition_reset_seconds', 10.0),
+                    'max_reset_seconds': self.config.get('recognition_max_reset_seconds', 120.0)
+                },
+                logger=self.logger,
+                metrics=self.metrics
+            )
+        return self.recognition
+
+    def load_recognition_backends(self, names):
+        """Create the named recognition backends, skipping any that cannot load"""
+        backends = []
+        for name in names:
+            try:
+                if name == 'google':
+                    backends.append(GoogleBackend(self.recognizer))
+                elif name == 'sphinx' and SphinxBackend.available():
+                    backends.append(SphinxBackend(self.recognizer))
+                elif name == 'vosk' and VoskBackend.available():
+                    model = self.config.get('vosk_model', 'models/vosk-model-small-en-us')
+                    backends.append(VoskBackend(model))
+                elif name in ('sphinx', 'vosk'):
+                    self.logger.warning("Recognition backend '%s' is not installed", name)
+                else:
+                    self.logger.warning("Unknown recognition backend '%s'", name)
+            except Exception as e:
+                self.logger.error("Could not load recognition backend '%s': %s", name, e)
+        return backends
+
+    def get_preprocessor(self):
+        """Audio preprocessor, created on first use (None if disabled or NumPy is missing)"""
+        if self.preprocessor is None and self.config.get('audio_preprocess', True) \
+                and AudioPreprocessor.available():
+            self.preprocessor = AudioPreprocessor(
+                target_rate=self.config.get('audio_sample_rate', 16000),
+                normalize=self.config.get('audio_normalize', True),
+                target_peak_dbfs=self.config.get('audio_target_peak_dbfs', -3.0),
+                max_gain_db=self.config.get('audio_max_gain_db', 20.0)
+            )
+        return self.preprocessor
+
+    def preprocess_audio(self, preprocessor, audio):
+        """Downsample and normalize audio, logging the upload size saved"""
+        with self.metrics.stage('preprocess'):
+            pcm, sample_rate, sample_width = preprocessor.process(
+                audio.get_raw_data(), audio.sample_rate, audio.sample_width)
+
+        # recognize_google() FLAC-encodes what it is given, so the PCM
+        # size is what its encode time and upload size scale with
+        upload = {
+            'rate_in': audio.sample_rate, 'rate_out': sample_rate,
+            'bytes_in': len(audio.frame_data), 'bytes_out': len(pcm)
+        }
+        self.logger.info("Upload audio: %s -> %s bytes (%s -> %s Hz)",
+                         upload['bytes_in'], upload['bytes_out'], audio.sample_rate, sample_rate,
+                         extra={'upload': upload})
+        return sr.AudioData(pcm, sample_rate, sample_width)
+
+    def track_recognize_rate(self, audio, seconds):
+        """Keep a moving average of recognition seconds per second of audio"""
+        audio_seconds = len(audio.frame_data) / audio.sample_width / audio.sample_rate
+        if audio_seconds > 0:
+            self.recognize_rate = 0.8 * self.recognize_rate + 0.2 * (seconds / audio_seconds)
     
     def open_application(self, app_name):
         """Open an application"""
@@ -370,200 +4424,423 @@ class JarvisAssistant:
         
         self.logger.info(f"Opening application: {app_name}")
         
-        # Search in configured applications
-        for app_key, app_data in self.apps_config.get('applications', {}).items():
-            # Check app_key
-            if app_name == app_key:
-                return self.launch_app(app_key, app_data['path'])
-            
-            # Check commands
-            for cmd in app_data.get('commands', []):
-                if app_name == cmd:
-                    return self.launch_app(app_key, app_data['path'])
-            
-            # Check partial matches
-            if app_name in app_key or any(app_name in cmd for cmd in app_data.get('commands', [])):
-                return self.launch_app(app_key, app_data['path'])
+        # Look the name up in the prebuilt alias index
+        candidates = self.get_app_index().lookup(app_name)
+        if candidates:
+            self.logger.debug("App candidates for '%s': %s", app_name, candidates)
+            app_key = candidates[0][0]
+            self.turn_state.target = app_key
+            return self.launch_app(app_key, self.apps_config['applications'][app_key]['path'])
         
-        # Try to open using Spotlight
+        # Then the apps installed on disk; an unknown name triggers a
+        # background refresh (which only re-lists folders that changed) so
+        # the next request sees a newly installed app
+        installed = self.installed_apps
+        if installed is not None:
+            found = installed.lookup(app_name)
+            if found is not None:
+                app_key, app_path = found
+                self.turn_state.target = app_key
+                return self.launch_app(app_key, app_path, verified=True)
+            installed.refresh_in_background()
+
+        # Not indexed (yet): try to open using Spotlight
+        self.turn_state.target = app_name
         return self.launch_via_spotlight(app_name)
     
-    def launch_app(self, app_name, app_path):
-        """Launch application by path"""
-        if os.path.exists(app_path):
-            try:
-                self.speak(f"Opening {app_name.replace('_', ' ')}")
-                subprocess.Popen(['open', app_path], 
-                               stdout=subprocess.DEVNULL,
-                               stderr=subprocess.DEVNULL)
-                return True
-            except Exception as e:
-                self.speak(f"Failed to open {app_name}")
-                self.logger.error(f"Launch error: {e}")
-                return False
+    def get_app_index(self):
+        """Return the app alias index, rebuilding it only if the apps config changed"""
+        applications = self.apps_config.get('applications', {})
+        if self.app_index is None or self.app_index.source is not applications:
+            self.app_index = AppIndex(applications)
+            self.priors_stamp = None
+            self.logger.debug("Built app index with %s aliases", len(self.app_index.aliases))
+
+        # Refresh usage priors when the history or the hour changed
+        if self.history is not None:
+            stamp = (self.history.version, datetime.now().hour)
+            if stamp != self.priors_stamp:
+                self.priors_stamp = stamp
+                self.app_index.priors = {target: p for (_, target), p
+                                         in self.history.likelihoods(('open_app',)).items()}
+        return self.app_index
+
+    def prewarm_next(self, exclude=None):
+        """Launch the app most likely to be asked for next, hidden, ahead of time"""
+        if self.history is None or not self.config.get('history_prewarm', False):
+            return None
+
+        applications = self.apps_config.get('applications', {})
+        threshold = self.config.get('history_prewarm_threshold', 0.3)
+        for (_, app_key), likelihood in self.history.likelihoods(('open_app',)).items():
+            if likelihood < threshold:
+                return None
+            if app_key == exclude or app_key not in applications:
+                continue
+            # At most once an hour per app; a prewarmed app stays resident
+            if time.time() - self.prewarmed.get(app_key, 0) < 3600:
+                return None
+            path = applications[app_key]['path']
+            if not os.path.exists(path):
+                continue
+            self.prewarmed[app_key] = time.time()
+            self.logger.info("Prewarming %s (likelihood %.2f)", app_key, likelihood)
+            return self.executor.submit(f"prewarm {app_key}", ['open', '-g', '-j', path])
+        return None
+
+    def launch_app(self, app_name, app_path, verified=False):
+        """Launch application by path (checked on first use unless verified)"""
+        if verified or app_path in self.verified_paths or os.path.exists(app_path):
+            self.verified_paths.add(app_path)
+            self.speak(f"Opening {app_name.replace('_', ' ')}")
+
+            def on_done(result):
+                if result.returncode != 0 and not result.cancelled:
+                    # Check the path again next time; the app may be gone
+                    self.verified_paths.discard(app_path)
+                    self.speak(f"Failed to open {app_name}")
+
+            return self.executor.submit(f"open {app_name}", ['open', app_path], callback=on_done)
         else:
             self.speak(f"{app_name} not found at {app_path}")
-            return False
+            return None
     
     def launch_via_spotlight(self, app_name):
         """Launch application using Spotlight"""
-        try:
-            self.speak(f"Trying to open {app_name}")
-            
-            # Try without .app extension
-            result = subprocess.run(['open', '-a', app_name],
-                                  capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                return True
-            
-            # Try with .app extension
-            result = subprocess.run(['open', '-a', f"{app_name}.app"],
-                                  capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                return True
-            
-            self.speak(f"Sorry, I couldn't find {app_name}")
-            return False
-            
-        except Exception as e:
-            self.logger.error(f"Spotlight launch error: {e}")
-            self.speak(f"Error opening {app_name}")
-            return False
+        self.speak(f"Trying to open {app_name}")
+
+        def on_done(result):
+            if result.returncode != 0:
+                self.speak(f"Sorry, I couldn't find {app_name}")
+
+        # Try with and without the .app extension at the same time
+        return self.executor.first_success(
+            f"open -a {app_name}",
+            [['open', '-a', app_name], ['open', '-a', f"{app_name}.app"]],
+            callback=on_done
+        )
     
     def execute_system_command(self, command):
         """Execute system command"""
-        system_cmds = self.apps_config.get('system_commands', {})
+        entry = self.snapshot.system_commands.get(command)
+        if entry is None:
+            return None
         
-        for cmd_key, cmd_value in system_cmds.items():
-            if command in cmd_key:
-                try:
-                    action_name = cmd_key.replace('_', ' ')
-                    self.speak(f"Executing {action_name}")
-                    
-                    subprocess.run(cmd_value, shell=True, check=True,
-                                 stdout=subprocess.DEVNULL,
-                                 stderr=subprocess.DEVNULL)
-                    return True
-                except subprocess.CalledProcessError as e:
-                    self.speak(f"Failed to execute {cmd_key}")
-                    self.logger.error(f"Command error: {e}")
-                    return False
+        cmd_key, cmd_value = entry
+        action_name = cmd_key.replace('_', ' ')
+        self.speak(f"Executing {action_name}")
         
-        return False
+        def on_done(result):
+            if result.timed_out:
+                self.speak(f"{action_name} timed out")
+            elif result.returncode != 0 and not result.cancelled:
+                self.speak(f"Failed to execute {cmd_key}")
+
+        return self.executor.submit(cmd_key, cmd_value, shell=True, callback=on_done)
     
     def process_command(self, command_text):
         """Process voice command"""
         if not command_text:
             return True
         
-        original_text = command_text
-        command_text = command_text.lower().strip()
-        
-        # Remove wake word if present
-        command_text = command_text.replace(self.wake_word, '').strip()
+        return not self.is_quit(self.run_command(command_text))
+
+    def normalize_command(self, command_text):
+        """Lowercase the command and remove the wake word if present"""
+        return command_text.lower().strip().replace(self.wake_word, '').strip()
+
+    def run_command(self, command_text, plan=None):
+        """Route and execute one command, returning what was done
         
-        self.logger.info(f"Processing command: {original_text}")
+        The result dict holds the command, intent, slots, action
+        ('command', 'reply' or 'unknown'), names of launched commands,
+        the replies spoken and the duration in milliseconds. Compound
+        commands have the intent 'compound' and list each step under
+        'actions'. A plan from plan_command() skips routing it again.
+        """
+        started = time.perf_counter()
+        original_text = command_text
+        command_text = self.normalize_command(command_text)
         
-        # Check for quit commands
-        if any(cmd in original_text for cmd in self.quit_commands):
-            self.speak("Goodbye! Shutting down.")
-            return False
+        self.metrics.begin_turn('text')
+        self.logger.info("Processing command: %s", original_text)
+        self.turn_state.replies = replies = []
+        self.turn_state.target = None
+        actions = None
         
-        # Check for license information
-        if any(word in command_text for word in ['license', 'mit', 'open source']):
-            self.speak("This project is licensed under the MIT License.")
-            print(f"\n{Fore.CYAN}License:{Style.RESET_ALL} MIT")
-            print(f"{Fore.CYAN}Details:{Style.RESET_ALL} See LICENSE file")
-            return True
+        try:
+            # Route, splitting compound commands into an action plan
+            with self.metrics.stage('routing'):
+                if plan is None:
+                    plan = self.router.plan(command_text, resolves=self.resolves)
+
+            # End of speech to action, for spoken commands
+            ended, self.speech_ended = self.speech_ended, None
+            if ended is not None:
+                self.metrics.observe('eos_to_action', time.perf_counter() - ended)
+
+            with self.metrics.stage('handler'):
+                if len(plan) == 1 and len(plan[0]) == 1:
+                    intent, slots, _ = plan[0][0]
+                    handles = self.dispatch(intent, slots, original_text)
+                else:
+                    intent, slots = 'compound', {}
+                    actions, handles = self.run_plan(plan)
+                    # One reply for the whole plan
+                    summary = self.summarize_replies(replies)
+                    replies.clear()
+                    if summary:
+                        self.speak(summary)
+
+            # Get ahead of what is likely next
+            if self.history is not None:
+                self.prewarm_next(exclude=self.turn_state.target)
+
+            # LatencyMetrics returns the finished turn; only NullMetrics returns None
+            turn = self.metrics.end_turn(intent)  # pylint: disable=assignment-from-none
+        finally:
+            self.turn_state.replies = None
+            # A handler that raised must not leave its turn open for the next command
+            self.metrics.discard_turn()
         
-        # Check for application opening
-        app_patterns = [
-            r'open\s+(.+)',
-            r'launch\s+(.+)',
-            r'start\s+(.+)',
-            r'run\s+(.+)'
-        ]
+        if turn is not None:
+            self.logger.info("Turn %s handled as '%s' in %.1f ms",
+                             turn['turn'], intent, turn['total'] * 1000,
+                             extra={'turn': turn['turn'], 'intent': intent,
+                                    'stages': turn['stages'], 'total': turn['total']})
         
-        for pattern in app_patterns:
-            match = re.search(pattern, command_text)
-            if match:
-                app_name = match.group(1)
-                return self.open_application(app_name)
-        
-        # System commands
-        if 'lock' in command_text or 'sleep' in command_text:
-            return self.execute_system_command('lock_screen')
-        elif 'screenshot' in command_text:
-            return self.execute_system_command('screenshot')
-        elif 'desktop' in command_text:
-            return self.execute_system_command('show_desktop')
-        elif any(word in command_text for word in ['volume up', 'louder', 'increase volume']):
-            return self.execute_system_command('volume_up')
-        elif any(word in command_text for word in ['volume down', 'quieter', 'decrease volume']):
-            return self.execute_system_command('volume_down')
-        elif 'mute' in command_text:
-            return self.execute_system_command('mute')
-        elif any(word in command_text for word in ['max volume', 'full volume', 'volume max']):
-            return self.execute_system_command('max_volume')
-        
-        # Information queries
-        elif 'time' in command_text:
-            current_time = datetime.now().strftime('%I:%M %p')
-            self.speak(f"The time is {current_time}")
-            return True
-        elif 'date' in command_text:
-            current_date = datetime.now().strftime('%A, %B %d, %Y')
-            self.speak(f"Today is {current_date}")
+        result = {
+            'command': original_text,
+            'intent': intent,
+            'slots': slots,
+            'action': 'unknown' if intent is None else 'command' if handles else 'reply',
+            'commands': [handle.name for handle in handles],
+            'replies': replies,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3)
+        }
+        if actions is not None:
+            result['actions'] = actions
+        return result
+
+    def dispatch(self, intent, slots, text):
+        """Run the handler for one routed intent; returns the CommandHandles it started"""
+        self.turn_state.target = None
+        if intent is None:
+            self.speak(f"I'm not sure how to '{text}'. Try saying 'help'.")
+            outcome = None
+        elif intent in SYSTEM_INTENTS:
+            outcome = self.execute_system_command(intent)
+        else:
+            outcome = getattr(self, f"handle_{intent}")(slots)
+
+        # Remember what was done
+        if self.history is not None:
+            target = intent if intent in SYSTEM_INTENTS else self.turn_state.target
+            self.history.record(intent, target, ok=intent is not None)
+
+        # Launch handlers return a CommandHandle, or a list of them for Spotlight
+        return outcome if isinstance(outcome, list) else [outcome] if outcome else []
+
+    def run_plan(self, plan):
+        """Run a compound command's stages in order, the actions within a stage together
+
+        Handlers only queue their commands, so the launches of a stage
+        overlap on the executor; a stage starts once the commands of the
+        one before have finished, and serial intents wait for each other.
+        Replies are collected rather than spoken. Returns (actions, handles).
+        """
+        actions, handles = [], []
+        self.turn_state.deferred = True
+        try:
+            for number, stage in enumerate(plan):
+                if number:
+                    self.wait_for(handles)
+                serial_handles = []
+                for intent, slots, text in stage:
+                    if intent in self.router.serial:
+                        self.wait_for(serial_handles)
+                    launched = self.dispatch(intent, slots, text)
+                    if intent in self.router.serial:
+                        serial_handles.extend(launched)
+                    handles.extend(launched)
+                    actions.append({'command': text, 'intent': intent, 'slots': slots,
+                                    'commands': [handle.name for handle in launched]})
+        finally:
+            self.turn_state.deferred = False
+        return actions, handles
+
+    def wait_for(self, handles):
+        """Block until the given commands finished (or the command timeout passed)"""
+        pending = [handle.future for handle in handles if not handle.done()]
+        if pending:
+            wait_futures(pending, timeout=self.config.get('command_timeout', 10))
+
+    @staticmethod
+    def summarize_replies(replies):
+        """Merge a plan's replies into one: "Opening chrome and spotify. Executing mute." """
+        groups = []
+        for reply in dict.fromkeys(replies):
+            # Consecutive "Opening x", "Opening y" (or "Trying to open x", ...) share their verb
+            match = REPLY_VERB.match(reply)
+            if match is None:
+                groups.append((reply, []))
+            elif groups and groups[-1][0] == match.group('verb') and groups[-1][1]:
+                groups[-1][1].append(match.group('rest'))
+            else:
+                groups.append((match.group('verb'), [match.group('rest')]))
+
+        sentences = []
+        for verb, rests in groups:
+            if len(rests) > 1:
+                rests = [', '.join(rests[:-1]) + ' and ' + rests[-1]]
+            sentence = ' '.join([verb] + rests)
+            sentences.append(sentence if sentence[-1] in '.!?' else sentence + '.')
+        return ' '.join(sentences)
+
+    @staticmethod
+    def is_quit(result):
+        """Whether a run_command() result asked Jarvis to shut down"""
+        return result.get('intent') == 'quit' or any(
+            action['intent'] == 'quit' for action in result.get('actions', ()))
+
+    def resolves(self, intent, slots):
+        """Whether a compound command's part names something that exists (see IntentRouter.plan)"""
+        if intent != 'open_app':
             return True
-        elif 'day' in command_text:
-            current_day = datetime.now().strftime('%A')
-            self.speak(f"Today is {current_day}")
+        name = slots['app']
+        if self.get_app_index().lookup(name, limit=1, min_score=0.6):
             return True
+        installed = self.installed_apps
+        return installed is not None and installed.lookup(name) is not None
+
+    def plan_command(self, text):
+        """The action plan run_command would route text to"""
+        return self.router.plan(self.normalize_command(text), resolves=self.resolves)
+
+    def is_serial(self, plan):
+        """Whether a plan includes an intent that must not run concurrently"""
+        return any(intent in self.router.serial for stage in plan for intent, _, _ in stage)
+
+    def handle_quit(self, slots):
+        """Say goodbye before shutting down"""
+        self.speak("Goodbye! Shutting down.")
+
+    def handle_license(self, slots):
+        """Show license information"""
+        self.speak("This project is licensed under the MIT License.")
+        self.display(f"\n{Fore.CYAN}License:{Style.RESET_ALL} MIT")
+        self.display(f"{Fore.CYAN}Details:{Style.RESET_ALL} See LICENSE file")
+
+    def handle_open_app(self, slots):
+        """Open the application named in the command"""
+        return self.open_application(slots['app'])
+
+    def handle_time(self, slots):
+        """Tell the current time"""
+        current_time = datetime.now().strftime('%I:%M %p')
+        self.speak(f"The time is {current_time}")
+
+    def handle_date(self, slots):
+        """Tell today's date"""
+        current_date = datetime.now().strftime('%A, %B %d, %Y')
+        self.speak(f"Today is {current_date}")
+
+    def handle_day(self, slots):
+        """Tell the day of the week"""
+        current_day = datetime.now().strftime('%A')
+        self.speak(f"Today is {current_day}")
+
+    def handle_greeting(self, slots):
+        """Say hello"""
+        self.speak_response('greeting')
+
+    def handle_name(self, slots):
+        """Say who Jarvis is"""
+        self.speak("I am Jarvis, your personal assistant.")
+
+    def handle_identity(self, slots):
+        """Spell out the name"""
+        self.speak("I am J.A.R.V.I.S., Just A Rather Very Intelligent System.")
+
+    def handle_how_are_you(self, slots):
+        """Answer how Jarvis is doing"""
+        self.speak_response('how_are_you')
+
+    def handle_thanks(self, slots):
+        """Reply to thanks"""
+        self.speak_response('thanks')
+
+    def handle_help(self, slots):
+        """Show the help text"""
+        self.show_help()
+
+    def handle_reminder(self, slots, kind='reminder'):
+        """Schedule a reminder, e.g. 'remind me in 10 minutes to stretch'"""
+        schedule = parse_schedule(slots['details'])
+        if schedule is None:
+            self.speak(f"When should I set the {kind}? Try 'remind me in 10 minutes to stretch'.")
+            return
         
-        # Conversational
-        elif any(word in command_text for word in ['hello', 'hi ', 'hey ', 'greetings']):
-            responses = [
-                "Hello! How can I assist you?",
-                "Hi there!",
-                "Greetings!",
-                "Hello! Ready to help."
-            ]
-            self.speak(responses[datetime.now().second % len(responses)])
-            return True
-        elif 'your name' in command_text:
-            self.speak("I am Jarvis, your personal assistant.")
-            return True
-        elif 'who are you' in command_text:
-            self.speak("I am J.A.R.V.I.S., Just A Rather Very Intelligent System.")
-            return True
-        elif 'how are you' in command_text:
-            responses = [
-                "I'm functioning optimally, thank you.",
-                "All systems are operational.",
-                "I'm well, thank you for asking.",
-                "Running smoothly as always."
-            ]
-            self.speak(responses[datetime.now().second % len(responses)])
-            return True
-        elif any(word in command_text for word in ['thank', 'thanks']):
-            responses = [
-                "You're welcome!",
-                "My pleasure.",
-                "Happy to help!",
-                "Anytime!"
-            ]
-            self.speak(responses[datetime.now().second % len(responses)])
-            return True
-        elif 'help' in command_text:
-            self.show_help()
-            return True
+        due, interval, message = schedule
+        if not message:
+            message = "Your timer is done" if kind == 'timer' else "This is your reminder"
+        self.scheduler.add(message, due, interval)
         
-        # Default response
+        if interval:
+            every = "every day" if interval == 86400 else f"every {self.describe_seconds(interval)}"
+            when = f"{every} at {due.strftime('%I:%M %p')}" if interval % 86400 == 0 else every
+        elif due - datetime.now() < timedelta(hours=1):
+            when = f"in {self.describe_seconds(round((due - datetime.now()).total_seconds()))}"
         else:
-            self.speak(f"I'm not sure how to '{original_text}'. Try saying 'help'.")
-            return True
+            when = f"at {due.strftime('%I:%M %p')}"
+        
+        if kind == 'timer':
+            self.speak(f"Timer set, {when}.")
+        else:
+            self.speak(f"I'll remind you {when}.")
+
+    def handle_timer(self, slots):
+        """Set a timer, e.g. 'set a timer for 5 minutes'"""
+        self.handle_reminder(slots, kind='timer')
+
+    def handle_list_reminders(self, slots):
+        """List upcoming reminders"""
+        upcoming = self.scheduler.upcoming()
+        if not upcoming:
+            self.speak("You have no reminders.")
+            return
+        
+        for reminder in upcoming:
+            due = datetime.fromtimestamp(reminder['due']).strftime('%a %I:%M %p')
+            repeat = (f" (every {self.describe_seconds(reminder['interval'])})"
+                      if reminder['interval'] else "")
+            self.display(f"  ⏰ {due}{repeat}: {reminder['message']}")
+        self.speak(f"You have {len(upcoming)} reminder{'s' if len(upcoming) != 1 else ''}.")
+
+    def handle_cancel_reminders(self, slots):
+        """Cancel every pending reminder"""
+        count = self.scheduler.cancel()
+        self.speak(f"Cancelled {count} reminder{'s' if count != 1 else ''}.")
+
+    def on_reminder(self, reminder):
+        """Scheduler callback; speaking is queued so the listen loop isn't blocked"""
+        self.display(f"\n{Fore.MAGENTA}⏰ Reminder:{Style.RESET_ALL} {reminder['message']}")
+        self.speak(f"Reminder: {reminder['message']}", priority=SpeechWorker.PRIORITY_HIGH)
+
+    @staticmethod
+    def describe_seconds(seconds):
+        """Turn a number of seconds into words like '1 hour 30 minutes'"""
+        parts = []
+        for unit in ('day', 'hour', 'minute', 'second'):
+            count, seconds = divmod(seconds, UNIT_SECONDS[unit])
+            if count:
+                parts.append(f"{count} {unit}{'s' if count != 1 else ''}")
+        return ' '.join(parts) or '0 seconds'
+
+    def speak_response(self, kind):
+        """Speak one of the canned responses, rotated by the current second"""
+        responses = RESPONSES[kind]
+        self.speak(responses[datetime.now().second % len(responses)])
     
     def show_help(self):
         """Show help information"""
@@ -588,6 +4865,16 @@ class JarvisAssistant:
   • "What's today's date?" - Today's date
   • "What day is it?" - Day of week
 
+{Fore.GREEN}⏰ Reminders:{Style.RESET_ALL}
+  • "Remind me in 10 minutes to stretch" - One-off reminder
+  • "Remind me every day at 9 to take vitamins" - Recurring reminder
+  • "Set a timer for 5 minutes" - Timer
+  • "List reminders" / "Cancel reminders" - Manage them
+
+{Fore.BLUE}🔗 Combined Commands:{Style.RESET_ALL}
+  • "Open Chrome and Spotify" - Run actions together
+  • "Mute then lock screen" - Run actions in order
+
 {Fore.CYAN}💬 Conversation:{Style.RESET_ALL}
   • "Hello" - Greet Jarvis
   • "How are you?" - Check status
@@ -602,62 +4889,65 @@ class JarvisAssistant:
 
 {Fore.CYAN}{'='*60}{Style.RESET_ALL}
 """
-        print(help_text)
+        self.display(help_text)
         self.speak("Here are the available commands.")
     
     def wake_word_mode(self):
         """Run in wake word detection mode"""
         self.speak(f"Wake word mode activated. Say '{self.wake_word}' to begin.")
         print(f"\n{Fore.YELLOW}💤 Sleeping... Say '{self.wake_word}' to wake me up.{Style.RESET_ALL}\n")
+
+        # Load wake word templates while the microphone opens and calibrates
+        def load_spotter():
+            with self.profiler.phase('wake word spotter'):
+                self.wake_spotter = self.init_wake_spotter()
+        spotter_thread = threading.Thread(target=load_spotter, daemon=True)
+        spotter_thread.start()
         
-        while self.is_active:
-            try:
-                # Listen for wake word
-                text = self.listen("wake_word")
-                
-                if text and self.wake_word in text:
-                    print(f"\n{Fore.GREEN}✅ Wake word detected!{Style.RESET_ALL}")
-                    
-                    # Beep sound
-                    print('\a', end='', flush=True)
-                    
-                    # Listen for command
-                    self.speak("Yes?")
-                    command = self.listen("command")
-                    
-                    if command:
-                        self.is_active = self.process_command(command)
-                    
-                    print(f"\n{Fore.YELLOW}💤 Returning to sleep...{Style.RESET_ALL}\n")
-                
-                # Small delay to prevent CPU overuse
-                time.sleep(0.1)
-                
-            except KeyboardInterrupt:
-                print(f"\n{Fore.YELLOW}🛑 Keyboard interrupt detected.{Style.RESET_ALL}")
-                self.is_active = False
-            except Exception as e:
-                self.logger.error(f"Wake word loop error: {e}")
-                time.sleep(1)
+        with self.profiler.phase('audio capture + calibration'):
+            self.start_capture()
+        spotter_thread.join()
+        self.startup_complete()
+        try:
+            self.run_voice_loop(wake_word=True)
+        finally:
+            self.stop_capture()
     
     def continuous_mode(self):
         """Run in continuous listening mode"""
         self.speak("Continuous mode activated. I'm always listening.")
         print(f"\n{Fore.GREEN}🎧 Always listening... Speak commands anytime.{Style.RESET_ALL}\n")
-        
-        while self.is_active:
-            try:
-                command = self.listen("command")
-                
-                if command:
-                    self.is_active = self.process_command(command)
-                
-            except KeyboardInterrupt:
-                print(f"\n{Fore.YELLOW}🛑 Keyboard interrupt detected.{Style.RESET_ALL}")
-                self.is_active = False
-            except Exception as e:
-                self.logger.error(f"Continuous mode error: {e}")
-                time.sleep(1)
+
+        with self.profiler.phase('audio capture + calibration'):
+            self.start_capture()
+        self.startup_complete()
+        try:
+            self.run_voice_loop(wake_word=False)
+        finally:
+            self.stop_capture()
+
+    def run_voice_loop(self, wake_word=True):
+        """Run the voice state machine, also serving the daemon socket if voice_ipc is set"""
+        ipc_path = None
+        if self.config.get('voice_ipc', False):
+            ipc_path = daemon_socket_path(self.config)
+            if not self.claim_socket(ipc_path):
+                ipc_path = None
+
+        machine = VoiceStateMachine(self, wake_word=wake_word)
+        try:
+            asyncio.run(machine.run(ipc_path))
+        finally:
+            if ipc_path is not None and os.path.exists(ipc_path):
+                os.unlink(ipc_path)
+
+        if self.debug:
+            for state, stats in machine.summary()['states'].items():
+                print(f"  {state:<12} {stats['entries']:>5} entries  {stats['seconds']:>9.1f}s  "
+                      f"{stats['cpu_percent']:>6.2f}% CPU  "
+                      f"{stats['wakeups_per_second']:>7.1f} wakeups/s  "
+                      f"{stats['rss_mb']:>7.1f} MB")
+        print(f"\n{Fore.YELLOW}🛑 Voice loop stopped.{Style.RESET_ALL}")
     
     def manual_mode(self):
         """Run in manual input mode"""
@@ -666,6 +4956,7 @@ class JarvisAssistant:
         print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
         print(f"{Fore.GREEN}Type commands or 'quit' to exit.{Style.RESET_ALL}\n")
         
+        self.startup_complete()
         while self.is_active:
             try:
                 command = input(f"{Fore.BLUE}Command > {Style.RESET_ALL}").strip()
@@ -686,6 +4977,253 @@ class JarvisAssistant:
                 print(f"\n{Fore.YELLOW}👋 Goodbye!{Style.RESET_ALL}")
                 break
     
+    def batch_mode(self, input_path=None, output_path=None, jobs=1):
+        """Stream newline-delimited commands from a file or stdin, writing one JSON result per line
+
+        With jobs > 1, independent commands run concurrently; serial intents
+        wait for everything before them. Results keep the input order.
+        """
+        # pylint: disable=consider-using-with  # Closed at the end unless they are stdin/stdout
+        infile = (open(input_path, 'r', encoding='utf-8')
+                  if input_path and input_path != '-' else sys.stdin)
+        outfile = (open(output_path, 'w', encoding='utf-8')
+                   if output_path and output_path != '-' else sys.stdout)
+        # pylint: enable=consider-using-with
+        # Flush per line only when another process is reading as we go
+        live = outfile is sys.stdout and not outfile.isatty()
+        pool = (ThreadPoolExecutor(max_workers=jobs, thread_name_prefix='JarvisBatch')
+                if jobs > 1 else None)
+        started = time.perf_counter()
+
+        def write(result):
+            outfile.write(json.dumps(result) + '\n')
+            if live:
+                outfile.flush()
+
+        # Handler output (help text, reminder lists) goes to stderr via
+        # display(), since this instance is quiet
+        try:
+            count = self.run_batch(infile, write, pool, jobs)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+            # Let launched commands finish rather than dropping them on exit
+            self.executor.shutdown(wait=True, cancel_pending=False)
+            outfile.flush()
+            if outfile is not sys.stdout:
+                outfile.close()
+            if infile is not sys.stdin:
+                infile.close()
+
+        elapsed = time.perf_counter() - started
+        self.logger.info("Batch: %d commands in %.3fs", count, elapsed)
+        print(f"Processed {count} commands in {elapsed:.3f}s "
+              f"({count / elapsed if elapsed else 0:,.0f}/s)", file=sys.stderr)
+
+    def run_batch(self, lines, write, pool, jobs):
+        """Run each non-empty line, passing results to write in input order; returns the count
+
+        Lines are planned once here: serial plans wait for everything
+        before them, the rest go to pool (if any) with at most jobs * 4
+        results outstanding.
+        """
+        window = deque()
+        count = 0
+        for line in lines:
+            text = line.strip()
+            if not text:
+                continue
+            count += 1
+
+            plan = self.plan_command(text)
+            if pool is None or self.is_serial(plan):
+                while window:
+                    write(window.popleft().result())
+                result = self.run_batch_command(text, plan)
+                write(result)
+                if self.is_quit(result):
+                    break
+                continue
+
+            window.append(pool.submit(self.run_batch_command, text, plan))
+            while window and (window[0].done() or len(window) >= jobs * 4):
+                write(window.popleft().result())
+
+        while window:
+            write(window.popleft().result())
+        return count
+
+    def run_batch_command(self, text, plan):
+        """run_command, turning an exception into an error result for the output"""
+        try:
+            return self.run_command(text, plan)
+        except Exception as e:
+            self.logger.error("Batch command failed: %r: %s", text, e)
+            return {'command': text, 'intent': None, 'error': str(e)}
+
+    def daemon_mode(self):
+        """Keep this instance warm and serve commands over a Unix socket"""
+        path = daemon_socket_path(self.config)
+        if not self.claim_socket(path):
+            return
+
+        print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}🔌 DAEMON MODE{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Listening on {path}{Style.RESET_ALL}")
+        print(f"Send commands with: {sys.argv[0]} --send \"open chrome\"\n")
+
+        try:
+            asyncio.run(self.serve_daemon(path))
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def claim_socket(self, path):
+        """Clear a stale socket at path; False if a live daemon already owns it"""
+        if os.path.exists(path):
+            try:
+                send_command(None, path, timeout=1)
+                print(f"{Fore.RED}❌ A Jarvis daemon is already listening on {path}"
+                      f"{Style.RESET_ALL}")
+                return False
+            except OSError:
+                os.unlink(path)  # Left behind by a daemon that didn't exit cleanly
+        return True
+
+    async def serve_daemon(self, path, stopped=None):
+        """asyncio server: one JSON request per line in, one JSON result per line out
+
+        A request is {"command": "...", "id": ...} or a bare line of text;
+        {"ping": true} just checks the daemon is alive. Clients are served
+        concurrently, but serial intents run one at a time. When stopped is
+        given the server shares its owner's loop and stops with it.
+        """
+        loop = asyncio.get_running_loop()
+        pool = ThreadPoolExecutor(max_workers=self.config.get('daemon_workers', 8),
+                                  thread_name_prefix='JarvisDaemon')
+        serial_lock = asyncio.Lock()
+        standalone = stopped is None
+        if standalone:
+            stopped = asyncio.Event()
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signum, stopped.set)
+        clients = set()
+
+        async def execute(text):
+            plan = self.plan_command(text)
+            if self.is_serial(plan):
+                async with serial_lock:
+                    return await loop.run_in_executor(pool, self.run_command, text, plan)
+            return await loop.run_in_executor(pool, self.run_command, text, plan)
+
+        async def handle_client(reader, writer):
+            clients.add(writer)
+            try:
+                await self.serve_daemon_client(reader, writer, execute, stopped)
+            finally:
+                clients.discard(writer)
+                writer.close()
+
+        # Bound owner-only from the start; a chmod afterwards would leave a
+        # window in which other users could connect
+        umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(handle_client, path=path)
+        finally:
+            os.umask(umask)
+        self.logger.info("Daemon listening on %s", path)
+        if standalone:
+            self.startup_complete()
+        try:
+            await stopped.wait()
+        finally:
+            server.close()
+            # Idle clients see EOF instead of being cancelled mid-read
+            for writer in list(clients):
+                writer.close()
+            await asyncio.sleep(0)
+            await server.wait_closed()
+            pool.shutdown(wait=True)
+            if standalone:
+                print(f"\n{Fore.YELLOW}👋 Daemon stopped.{Style.RESET_ALL}")
+
+    async def serve_daemon_client(self, reader, writer, execute, stopped):
+        """Answer one connection's requests in order until it closes or asks to quit"""
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # Longer than the stream limit
+                    writer.write(b'{"error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                result = await self.daemon_response(line, execute)
+                writer.write((json.dumps(result) + '\n').encode())
+                await writer.drain()
+                if self.is_quit(result):
+                    stopped.set()
+        except ConnectionError:
+            pass
+
+    async def daemon_response(self, line, execute):
+        """The result for one request line; failures come back as an error result"""
+        text, request_id = line.decode('utf-8', 'replace').strip(), None
+        if text.startswith('{'):
+            try:
+                request = json.loads(text)
+            except ValueError:
+                return {'error': 'invalid JSON'}
+            if request.get('ping'):
+                return {'pong': True}
+            text, request_id = str(request.get('command') or ''), request.get('id')
+        if not text:
+            return {'error': 'empty command', 'id': request_id}
+
+        try:
+            result = await execute(text)
+        except Exception as e:
+            self.logger.error("Daemon command failed: %r: %s", text, e)
+            result = {'command': text, 'intent': None, 'error': str(e)}
+        if request_id is not None:
+            result['id'] = request_id
+        return result
+
+    def enroll_wake_word(self, samples=3):
+        """Record spoken samples of the wake word for the offline spotter"""
+        directory = Path(self.config.get('wake_word_samples_dir', 'wake_word_samples'))
+        directory.mkdir(exist_ok=True)
+
+        print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+        print(f"{Fore.YELLOW}🎙️  WAKE WORD ENROLLMENT{Style.RESET_ALL}")
+        print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+
+        recorded = 0
+        load_speech_recognition()
+        try:
+            with sr.Microphone() as source:
+                self.recognizer.adjust_for_ambient_noise(
+                    source, duration=self.settings.ambient_adjust_duration)
+                while recorded < samples:
+                    print(f"{Fore.GREEN}🎤 Say '{self.wake_word}' ({recorded + 1}/{samples})..."
+                          f"{Style.RESET_ALL}")
+                    try:
+                        audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=3)
+                    except sr.WaitTimeoutError:
+                        print(f"{Fore.YELLOW}⏳ Nothing heard, try again{Style.RESET_ALL}")
+                        continue
+
+                    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    path = directory / f"sample_{stamp}_{recorded}.wav"
+                    path.write_bytes(audio.get_wav_data())
+                    recorded += 1
+        except OSError as e:
+            print(f"{Fore.RED}🎤 Microphone error: {e}{Style.RESET_ALL}")
+
+        print(f"{Fore.GREEN}✅ Saved {recorded} samples to {directory}/{Style.RESET_ALL}")
+        self.wake_spotter = self.init_wake_spotter()
+    
     def test_mode(self):
         """Run system tests"""
         print(f"\n{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
@@ -734,14 +5272,14 @@ class JarvisAssistant:
     def test_tts(self):
         """Test text-to-speech"""
         try:
-            self.speak("Testing text to speech.")
-            return True
+            return self.speak("Testing text to speech.").wait(timeout=15)
         except:
             return False
     
     def test_microphone(self):
         """Test microphone"""
         try:
+            load_speech_recognition()
             with sr.Microphone() as source:
                 self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
                 return True
@@ -788,7 +5326,10 @@ class JarvisAssistant:
             'wake': self.wake_word_mode,
             'continuous': self.continuous_mode,
             'manual': self.manual_mode,
-            'test': self.test_mode
+            'batch': self.batch_mode,
+            'daemon': self.daemon_mode,
+            'test': self.test_mode,
+            'enroll': self.enroll_wake_word
         }
         
         if mode in modes:
@@ -797,8 +5338,215 @@ class JarvisAssistant:
             print(f"{Fore.RED}Error: Unknown mode '{mode}'{Style.RESET_ALL}")
             print(f"Available modes: {', '.join(modes.keys())}")
 
-def main():
-    """Main entry point"""
+def evaluate_vad(fixtures_dir):
+    """Print speech detection accuracy, bytes saved and CPU cost of the VAD"""
+    if not VoiceActivityDetector.available():
+        print(f"{Fore.RED}NumPy is required for voice activity detection{Style.RESET_ALL}")
+        return False
+
+    report = VoiceActivityDetector().evaluate(fixtures_dir)
+    if not report['speech_clips'] + report['silence_clips']:
+        print(f"{Fore.RED}No WAVs found in {fixtures_dir}/speech or {fixtures_dir}/silence"
+              f"{Style.RESET_ALL}")
+        return False
+
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}📊 VOICE ACTIVITY DETECTION REPORT{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"Missed speech:    {report['missed_speech']}/{report['speech_clips']}")
+    print(f"Passed silence:   {report['passed_silence']}/{report['silence_clips']}")
+    print(f"Bytes saved:      {report['bytes_saved']:,} of {report['bytes_in']:,} "
+          f"({report['bytes_saved_ratio']:.1%})")
+    print(f"Audio processed:  {report['audio_seconds']:.1f}s")
+    print(f"CPU per hour:     {report['cpu_seconds_per_audio_hour']:.1f}s of CPU per hour of audio")
+    return True
+
+def evaluate_streaming(wav_path, transcript):
+    """Replay a WAV through the scripted streaming backend, with and without early commit"""
+    jarvis = JarvisAssistant(speech=False, quiet=True, ephemeral=True)
+    backend = ScriptedStreamingBackend(transcript)
+
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}📊 STREAMING RECOGNITION REPORT{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    try:
+        for label, early in (('Early commit', True), ('Full utterance', False)):
+            text = jarvis.listen_streaming(WavStreamSource(wav_path), backend, early=early)
+            if text is None or jarvis.speech_ended is None:
+                print(f"{Fore.RED}No speech detected in {wav_path}{Style.RESET_ALL}")
+                return False
+            latency = time.perf_counter() - jarvis.speech_ended
+            intent, _ = jarvis.router.route(jarvis.normalize_command(text))
+            print(f"{label + ':':<16} '{text}' -> {intent or 'unknown'}, "
+                  f"{latency * 1000:.0f} ms from end of speech to action")
+    finally:
+        jarvis.shutdown(drain=False)
+    return True
+
+def daemon_socket_path(config):
+    """Where the daemon listens, from config.json's daemon_socket"""
+    return os.path.expanduser(config.get('daemon_socket', '~/.jarvis.sock'))
+
+def send_command(text, socket_path, timeout=30):
+    """Send one command to a running daemon and return its result (None pings)"""
+    import socket
+
+    request = {'ping': True} if text is None else {'command': text}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(socket_path)
+        client.sendall((json.dumps(request) + '\n').encode())
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = client.recv(65536)
+            if not chunk:
+                raise ConnectionError("daemon closed the connection")
+            data += chunk
+    return json.loads(data)
+
+def evaluate_hedging(rounds=40, seed=7):
+    """Simulate a fast, unsure local backend against a slow, jittery remote one,
+    then a remote outage with and without circuit breakers"""
+    load_speech_recognition()
+    rng = random.Random(seed)
+
+    def remote_delay():
+        # Mostly quick, with the occasional stalled request
+        return 2.0 if rng.random() < 0.1 else rng.uniform(0.15, 0.4)
+
+    def local():
+        return FakeRecognitionBackend('local', 'open safari', confidence=0.7,
+                                      delay=lambda: rng.uniform(0.05, 0.1))
+
+    def remote():
+        return FakeRecognitionBackend('remote', 'open safari', confidence=0.95, delay=remote_delay)
+
+    def offline_remote():
+        # Requests hang until the network stack gives up
+        return FakeRecognitionBackend('remote', 'open safari', delay=1.5,
+                                      error=sr.RequestError('connection timed out'))
+
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}📊 HEDGED RECOGNITION REPORT{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    never_trip = {'failure_threshold': float('inf')}
+    configurations = (
+        ('Remote only', lambda: [remote()], lambda: [], {}),
+        ('Hedged', lambda: [local(), remote()], lambda: [], {}),
+        ('Hedged, strict', lambda: [local(), remote()], lambda: [], {'min_confidence': 0.9}),
+        ('Outage', lambda: [offline_remote()], lambda: [local()], {'breaker': never_trip}),
+        ('Outage, breaker', lambda: [offline_remote()], lambda: [local()], {}),
+    )
+    for label, primary, fallback, options in configurations:
+        recognition = HedgedRecognizer(primary(), fallback=fallback(), budget=1.0, **options)
+        latencies = []
+        failures = 0
+        for _ in range(rounds):
+            started = time.perf_counter()
+            try:
+                recognition.recognize(None)
+            except sr.RequestError:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+        recognition.shutdown()
+
+        quantiles = LatencyMetrics.quantiles(latencies)
+        p50, p95 = quantiles[0.5], quantiles[0.95]
+        wins = ', '.join(f"{name} {stats['wins']}" for name, stats in recognition.summary().items())
+        print(f"{label + ':':<16} p50 {p50 * 1000:4.0f} ms, p95 {p95 * 1000:4.0f} ms, "
+              f"{failures} failed; wins: {wins}")
+    return True
+
+def history_stats(path, limit=5):
+    """Print usage statistics from the command history database"""
+    if not os.path.exists(path):
+        print(f"{Fore.RED}No command history at {path}{Style.RESET_ALL}")
+        return False
+
+    started = time.perf_counter()
+    connection = sqlite3.connect(path)
+    try:
+        # Queries read the per-hour usage table, never the full history
+        total = connection.execute('SELECT max(id) FROM history').fetchone()[0] or 0
+        intents = connection.execute(
+            'SELECT intent, sum(count) AS uses FROM usage '
+            'GROUP BY intent ORDER BY uses DESC LIMIT ?',
+            (limit,)).fetchall()
+        apps = connection.execute(
+            "SELECT target, sum(count) AS uses FROM usage WHERE intent = 'open_app' "
+            'GROUP BY target ORDER BY uses DESC LIMIT ?', (limit,)).fetchall()
+        hours = connection.execute(
+            'SELECT hour, sum(count) AS uses FROM usage '
+            'GROUP BY hour ORDER BY uses DESC LIMIT 3').fetchall()
+    finally:
+        connection.close()
+
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}📊 COMMAND HISTORY{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"Commands:       {total}")
+    print(f"Top intents:    {', '.join(f'{intent} ({uses})' for intent, uses in intents) or '-'}")
+    print(f"Top apps:       {', '.join(f'{app} ({uses})' for app, uses in apps) or '-'}")
+    print(f"Busiest hours:  {', '.join(f'{hour:02d}:00 ({uses})' for hour, uses in hours) or '-'}")
+    print(f"Query time:     {(time.perf_counter() - started) * 1000:.1f} ms")
+    return True
+
+def evaluate_app_discovery(roots):
+    """Time a cold scan and an unchanged refresh of the installed-app index over roots"""
+    logger = logging.getLogger('jarvis.discovery')
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, 'installed_apps.json')
+
+        started = time.perf_counter()
+        installed = InstalledApps(roots, cache_path, logger)
+        installed.refresh()
+        cold = time.perf_counter() - started
+
+        # A new process: load the saved index, then refresh with nothing changed
+        started = time.perf_counter()
+        installed = InstalledApps(roots, cache_path, logger)
+        loaded = time.perf_counter() - started
+        started = time.perf_counter()
+        installed.refresh()
+        warm = time.perf_counter() - started
+
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}📊 APP DISCOVERY REPORT{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"Apps found:       {len(installed.paths)} in {len(installed.folders)} folders")
+    print(f"Cold scan:        {cold * 1000:.1f} ms")
+    print(f"Load from disk:   {loaded * 1000:.1f} ms")
+    print(f"Refresh:          {warm * 1000:.1f} ms with nothing changed")
+    for app_key in list(installed.paths)[:5]:
+        print(f"  {app_key:<24} {installed.paths[app_key]}")
+    return bool(installed.paths)
+
+def evaluate_wake_word(fixtures_dir, samples_dir='wake_word_samples', threshold=None):
+    """Print false accept/reject rates and CPU cost of the offline spotter"""
+    if not WakeWordSpotter.available():
+        print(f"{Fore.RED}NumPy is required for the offline wake word spotter{Style.RESET_ALL}")
+        return False
+
+    spotter = WakeWordSpotter(threshold=threshold)
+    if not spotter.load_templates(samples_dir):
+        print(f"{Fore.RED}No wake word samples found in {samples_dir}/{Style.RESET_ALL}")
+        return False
+
+    report = spotter.evaluate(fixtures_dir)
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"{Fore.YELLOW}📊 WAKE WORD SPOTTER REPORT{Style.RESET_ALL}")
+    print(f"{Fore.CYAN}{'='*60}{Style.RESET_ALL}")
+    print(f"Templates:        {len(spotter.templates)} (threshold {spotter.threshold:.3f})")
+    print(f"False rejects:    {report['false_rejects']}/{report['positives']} "
+          f"({report['false_reject_rate']:.1%})")
+    print(f"False accepts:    {report['false_accepts']}/{report['negatives']} "
+          f"({report['false_accept_rate']:.1%})")
+    print(f"Audio processed:  {report['audio_seconds']:.1f}s")
+    print(f"CPU per hour:     {report['cpu_seconds_per_audio_hour']:.1f}s of CPU per hour of audio")
+    return True
+
+def build_parser():
+    """Command-line options for main()"""
     parser = argparse.ArgumentParser(
         description='Jarvis Assistant - Voice-controlled macOS assistant',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -807,17 +5555,45 @@ Examples:
   {sys.argv[0]} --mode wake      # Wake word mode (default)
   {sys.argv[0]} --mode continuous # Always listening
   {sys.argv[0]} --mode manual     # Type commands
+  {sys.argv[0]} --mode batch < commands.txt > results.jsonl  # Scripted commands
+  {sys.argv[0]} --mode daemon     # Stay resident, serve commands on a socket
+  {sys.argv[0]} --send "open chrome"  # Send a command to the daemon
   {sys.argv[0]} --mode test       # Run system tests
+  {sys.argv[0]} --mode enroll     # Record wake word samples
+  {sys.argv[0]} --wake-word-eval fixtures/  # Score the wake word spotter
+  {sys.argv[0]} --vad-eval fixtures/  # Score voice activity detection
+  {sys.argv[0]} --stream-test cmd.wav "open chrome"  # Streaming latency
+  {sys.argv[0]} --hedge-test          # Hedged recognition with fake backends
+  {sys.argv[0]} --history-stats       # Most used commands and apps
+  {sys.argv[0]} --app-scan /Applications  # Time installed-app discovery
   {sys.argv[0]} --debug          # Enable debug mode
+  {sys.argv[0]} --mode manual --no-speech  # Text only, no audio stack
+  {sys.argv[0]} --profile-startup # Print startup timing breakdown
   {sys.argv[0]} --license        # Show license information
         """
     )
     
     parser.add_argument('--mode', '-m',
-                       choices=['wake', 'continuous', 'manual', 'test'],
+                       choices=['wake', 'continuous', 'manual', 'batch', 'daemon', 'test',
+                                'enroll'],
                        default='wake',
                        help='Operation mode (default: wake)')
     
+    parser.add_argument('--input', '-i',
+                       help='Batch mode: read commands from this file (default: stdin)')
+
+    parser.add_argument('--output', '-o',
+                       help='Batch mode: write JSONL results to this file (default: stdout)')
+
+    parser.add_argument('--jobs', '-j',
+                       type=int,
+                       default=1,
+                       help='Batch mode: run up to this many independent commands at once')
+
+    parser.add_argument('--send',
+                       metavar='COMMAND',
+                       help='Send COMMAND to a running daemon and print the JSON result')
+    
     parser.add_argument('--debug', '-d',
                        action='store_true',
                        help='Enable debug logging')
@@ -825,15 +5601,106 @@ Examples:
     parser.add_argument('--log', '-l',
                        help='Log file path')
     
+    parser.add_argument('--no-speech',
+                       action='store_true',
+                       help='Print replies only, without loading the TTS engine')
+
+    parser.add_argument('--metrics',
+                       action='store_true',
+                       help='Record per-stage latency metrics (see metrics_* in config.json)')
+
+    parser.add_argument('--profile-startup',
+                       action='store_true',
+                       help='Print a per-phase startup timing breakdown')
+
     parser.add_argument('--version', '-v',
                        action='version',
                        version='Jarvis Assistant v2.1.0 (MIT License)')
     
+    parser.add_argument('--wake-word-eval',
+                       metavar='DIR',
+                       help='Evaluate the offline wake word spotter on DIR/positive and '
+                            'DIR/negative WAVs')
+
+    parser.add_argument('--vad-eval',
+                       metavar='DIR',
+                       help='Evaluate voice activity detection on DIR/speech and DIR/silence WAVs')
+
+    parser.add_argument('--stream-test',
+                       nargs=2,
+                       metavar=('WAV', 'TRANSCRIPT'),
+                       help='Measure end-of-speech-to-action latency of streaming '
+                            'recognition on WAV')
+
+    parser.add_argument('--hedge-test',
+                       nargs='?',
+                       const=40,
+                       type=int,
+                       metavar='ROUNDS',
+                       help='Simulate hedged recognition and outages over fake backends '
+                            'with injected delays')
+
+    parser.add_argument('--history-stats',
+                       action='store_true',
+                       help='Show usage statistics from the command history')
+
+    parser.add_argument('--app-scan',
+                       nargs='+',
+                       metavar='ROOT',
+                       help='Time installed-app discovery over the given folders')
+    
     parser.add_argument('--license', 
                        action='store_true',
                        help='Show license information')
-    
-    args = parser.parse_args()
+    return parser
+
+
+def load_local_config():
+    """config.json from the working directory, or {} without one"""
+    if not os.path.exists('config.json'):
+        return {}
+    with open('config.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run_tool(args):
+    """Handle the one-shot options that run without a JarvisAssistant; exits if one was given"""
+    # Hand the command to the resident daemon instead of starting up
+    if args.send:
+        path = daemon_socket_path(load_local_config())
+        try:
+            result = send_command(args.send, path)
+        except OSError as e:
+            print(f"{Fore.RED}❌ No Jarvis daemon on {path} ({e}). "
+                  f"Start one with --mode daemon{Style.RESET_ALL}")
+            sys.exit(1)
+        print(json.dumps(result))
+        sys.exit(1 if result.get('error') else 0)
+
+    # Evaluate the wake word spotter against WAV fixtures
+    if args.wake_word_eval:
+        sys.exit(0 if evaluate_wake_word(args.wake_word_eval) else 1)
+
+    if args.vad_eval:
+        sys.exit(0 if evaluate_vad(args.vad_eval) else 1)
+
+    if args.stream_test:
+        sys.exit(0 if evaluate_streaming(*args.stream_test) else 1)
+
+    if args.hedge_test:
+        sys.exit(0 if evaluate_hedging(args.hedge_test) else 1)
+
+    if args.app_scan:
+        sys.exit(0 if evaluate_app_discovery(args.app_scan) else 1)
+
+    if args.history_stats:
+        history_file = load_local_config().get('history_file', 'history.db')
+        sys.exit(0 if history_stats(history_file) else 1)
+
+
+def main():
+    """Main entry point"""
+    args = build_parser().parse_args()
     
     # Show license if requested
     if args.license:
@@ -856,12 +5723,27 @@ Examples:
         print(f"\n{Fore.GREEN}For full license text, see LICENSE file.{Style.RESET_ALL}")
         return
     
+    run_tool(args)
+
     try:
         # Create Jarvis instance
-        jarvis = JarvisAssistant(debug=args.debug, log_file=args.log)
+        profiler = StartupProfiler(enabled=args.profile_startup)
+        profiler.record('imports', time.perf_counter() - PROCESS_START)
+        batch = args.mode == 'batch'
+        jarvis = JarvisAssistant(debug=args.debug, log_file=args.log,
+                                 speech=not (args.no_speech or batch), profiler=profiler,
+                                 metrics=args.metrics, quiet=batch, ephemeral=batch)
         
         # Run in selected mode
-        jarvis.run(args.mode)
+        try:
+            if batch:
+                jarvis.batch_mode(args.input, args.output, max(1, args.jobs))
+            else:
+                jarvis.run(args.mode)
+        except KeyboardInterrupt:
+            jarvis.shutdown(drain=False)
+            raise
+        jarvis.shutdown()
         
     except KeyboardInterrupt:
         print(f"\n{Fore.YELLOW}👋 Jarvis terminated by user.{Style.RESET_ALL}")
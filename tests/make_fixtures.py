@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Generate the synthetic fixtures used by the tests
+Writes small 8 kHz WAVs for the VAD and wake word evaluations (committed
+under tests/fixtures/) and builds throwaway .app trees for app discovery.
+Only the standard library is used, and the output is the same on every run.
+
+Usage:
+    python tests/make_fixtures.py              # rewrite tests/fixtures/
+    python tests/make_fixtures.py --apps DIR   # build an .app tree under DIR
+"""
+
+import argparse
+import math
+import plistlib
+import random
+import struct
+import wave
+from pathlib import Path
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+SAMPLE_RATE = 8000
+SEED = 2024  # Each fixture set seeds its own generator, so one can change alone
+
+# Vowel-like (formant Hz, seconds) sequences: the wake word and words that aren't it
+WAKE_WORD = [(700, 0.18), (1200, 0.14), (500, 0.22)]
+OTHER_WORDS = [
+    [(300, 0.25), (2200, 0.25)],
+    [(900, 0.12), (400, 0.12), (900, 0.12), (400, 0.12)],
+    [(1800, 0.5)],
+    [(500, 0.22), (1200, 0.14), (700, 0.18)],  # The wake word backwards
+]
+
+# Bundles for the discovery tree: (folder relative to the root, bundle, Info.plist names)
+APPS = [
+    ('', 'Safari', {'CFBundleName': 'Safari'}),
+    ('', 'Google Chrome', {'CFBundleDisplayName': 'Chrome'}),
+    ('', 'Visual Studio Code', {'CFBundleName': 'Code'}),
+    ('', 'Spotify', None),
+    ('Utilities', 'Terminal', {'CFBundleName': 'Terminal'}),
+    ('Utilities', 'Activity Monitor', None),
+    ('Utilities/Extras', 'Disk Utility', {'CFBundleDisplayName': 'Disks'}),
+    ('Utilities/Extras/Deeper', 'Too Deep', None),  # Below InstalledApps.MAX_DEPTH
+]
+
+
+def voiced(formants, f0, rng, speed=1.0, amplitude=0.3):
+    """Harmonics of f0 shaped by a moving formant, one segment per formant"""
+    samples = []
+    phase = 0.0
+    for formant, seconds in formants:
+        count = int(seconds * speed * SAMPLE_RATE)
+        for i in range(count):
+            # Smooth syllable envelope and a slight pitch drift
+            pitch = f0 * (1 + 0.05 * math.sin(2 * math.pi * i / count))
+            phase += 2 * math.pi * pitch / SAMPLE_RATE
+            # Every harmonic below 3.5 kHz, loudest near the formant
+            value = sum((math.exp(-((k * pitch - formant) / 250) ** 2) + 0.1 / k)
+                        * math.sin(k * phase) for k in range(1, int(3500 / pitch) + 1))
+            envelope = math.sin(math.pi * i / count) ** 0.5
+            samples.append(amplitude * envelope * value / 3 + rng.gauss(0, 0.002))
+    return samples
+
+
+def noise(seconds, level, rng):
+    """Gaussian background noise"""
+    return [rng.gauss(0, level) for _ in range(int(seconds * SAMPLE_RATE))]
+
+
+def padded(samples, before, after, level, rng):
+    """Surround samples with background noise"""
+    noisy = [s + rng.gauss(0, level) for s in samples]
+    return noise(before, level, rng) + noisy + noise(after, level, rng)
+
+
+def write_wav(path, samples):
+    """Write mono 16-bit PCM at SAMPLE_RATE"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    clipped = (max(-32768, min(32767, int(s * 32767))) for s in samples)
+    with wave.Wave_write(str(path)) as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(struct.pack(f'<{len(samples)}h', *clipped))
+
+
+def wake_word_fixtures(root):
+    """samples/ to enroll, positive/ and negative/ clips to score"""
+    rng = random.Random(SEED)
+    for i, (f0, speed) in enumerate([(120, 1.0), (135, 0.95), (110, 1.05)]):
+        write_wav(root / 'samples' / f'sample_{i}.wav', voiced(WAKE_WORD, f0, rng, speed))
+    for i, (f0, speed) in enumerate([(125, 1.0), (115, 0.92), (140, 1.08), (130, 1.0)]):
+        clip = voiced(WAKE_WORD, f0, rng, speed, amplitude=rng.uniform(0.2, 0.4))
+        write_wav(root / 'positive' / f'wake_{i}.wav', padded(clip, 0.3, 0.3, 0.003, rng))
+    for i, word in enumerate(OTHER_WORDS):
+        clip = voiced(word, rng.uniform(110, 140), rng)
+        write_wav(root / 'negative' / f'other_{i}.wav', padded(clip, 0.3, 0.3, 0.003, rng))
+    write_wav(root / 'negative' / 'hiss.wav', noise(1.0, 0.1, rng))
+    write_wav(root / 'negative' / 'quiet.wav', noise(1.0, 0.001, rng))
+
+
+def vad_fixtures(root):
+    """speech/ clips with silence around them, silence/ clips of hiss, hum and clicks"""
+    rng = random.Random(SEED)
+    # A lone 1800 Hz formant crosses zero too often to count as voiced, so it isn't used here
+    for i, word in enumerate([WAKE_WORD, OTHER_WORDS[0], OTHER_WORDS[1], OTHER_WORDS[3]]):
+        clip = voiced(word, rng.uniform(100, 180), rng)
+        write_wav(root / 'speech' / f'speech_{i}.wav', padded(clip, 0.8, 0.8, 0.003, rng))
+    write_wav(root / 'silence' / 'quiet.wav', noise(2.0, 0.002, rng))
+    write_wav(root / 'silence' / 'hiss.wav', noise(2.0, 0.08, rng))
+    hum = [0.2 * math.sin(2 * math.pi * 60 * i / SAMPLE_RATE) for i in range(2 * SAMPLE_RATE)]
+    write_wav(root / 'silence' / 'hum.wav', [s + rng.gauss(0, 0.002) for s in hum])
+    clicks = noise(2.0, 0.002, rng)
+    for start in range(400, len(clicks), 3000):
+        for i in range(8):
+            clicks[start + i] = rng.choice((-0.8, 0.8))
+    write_wav(root / 'silence' / 'clicks.wav', clicks)
+
+
+def build_app_tree(root, apps=tuple(APPS)):
+    """Create empty .app bundles (with Info.plist where given) under root; returns their paths"""
+    paths = []
+    for folder, name, info in apps:
+        bundle = Path(root, folder, f'{name}.app')
+        (bundle / 'Contents').mkdir(parents=True, exist_ok=True)
+        if info is not None:
+            with open(bundle / 'Contents' / 'Info.plist', 'wb') as f:
+                plistlib.dump(info, f)
+        paths.append(str(bundle))
+    return paths
+
+
+def main():
+    """Rewrite the committed WAV fixtures, or build an app tree"""
+    parser = argparse.ArgumentParser(description='Generate synthetic test fixtures')
+    parser.add_argument('--apps', metavar='DIR', help='Build an .app tree under DIR instead')
+    args = parser.parse_args()
+
+    if args.apps:
+        for path in build_app_tree(args.apps):
+            print(path)
+        return
+
+    wake_word_fixtures(FIXTURES / 'wake_word')
+    vad_fixtures(FIXTURES / 'vad')
+    for path in sorted(FIXTURES.rglob('*.wav')):
+        print(f"{path.relative_to(FIXTURES)}  {path.stat().st_size:,} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""AppIndex: exact aliases, trigram ranking and usage priors"""
+
+import unittest
+
+from jarvis import AppIndex
+
+APPLICATIONS = {
+    'chrome': {'path': '/Applications/Google Chrome.app', 'commands': ['chrome', 'browser']},
+    'chrome_canary': {'path': '/Applications/Google Chrome Canary.app',
+                      'commands': ['chrome canary']},
+    'vscode': {'path': '/Applications/Visual Studio Code.app',
+               'commands': ['code', 'visual studio code', 'vs code']},
+    'facetime': {'path': '/System/Applications/FaceTime.app',
+                 'commands': ['facetime', 'video call']},
+    'safari': {'path': '/Applications/Safari.app', 'commands': ['safari']},
+}
+
+
+class AppIndexTest(unittest.TestCase):
+    """Spoken names resolve to the right app key, best first"""
+
+    def setUp(self):
+        self.index = AppIndex(APPLICATIONS)
+
+    def top(self, query):
+        """The best app key for query, or None"""
+        ranked = self.index.lookup(query)
+        return ranked[0][0] if ranked else None
+
+    def test_exact_alias_wins(self):
+        """'code' is an alias of vscode, however many trigrams facetime shares"""
+        self.assertEqual(self.index.lookup('code'), [('vscode', 1.0)])
+        self.assertEqual(self.top('FaceTime!'), 'facetime')
+        self.assertEqual(self.top('video call'), 'facetime')
+
+    def test_partial_name_ranks_by_trigrams(self):
+        """'chrom' and a misspelling find chrome ahead of the longer chrome canary"""
+        for query in ('chrom', 'crome', 'google chrom'):
+            with self.subTest(query=query):
+                ranked = self.index.lookup(query)
+                self.assertEqual(ranked[0][0], 'chrome')
+                self.assertNotIn('facetime', [key for key, _ in ranked])
+
+    def test_whole_words_inside_a_phrase(self):
+        """An alias contained in the query scores as a strong match"""
+        self.assertEqual(self.top('visual studio'), 'vscode')
+        self.assertEqual(self.top('the safari app please'), 'safari')
+
+    def test_no_match(self):
+        """Unrelated or empty queries return nothing"""
+        self.assertEqual(self.index.lookup('xylophone'), [])
+        self.assertEqual(self.index.lookup('  ?! '), [])
+
+    def test_priors_break_near_ties(self):
+        """Usage likelihood reorders similar matches but not a clearly better one"""
+        self.assertEqual(self.top('chrome cana'), 'chrome')
+        self.index.priors = {'chrome_canary': 1.0}
+        self.assertEqual(self.top('chrome cana'), 'chrome_canary')
+        self.assertEqual(self.top('chrom'), 'chrome')
+
+    def test_is_prefix(self):
+        """'chrome' may still grow into 'chrome canary'"""
+        self.assertTrue(self.index.is_prefix('chrome'))
+        self.assertFalse(self.index.is_prefix('safari'))
+
+
+if __name__ == '__main__':
+    unittest.main()
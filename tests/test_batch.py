@@ -0,0 +1,33 @@
+"""Batch mode leaves no state behind"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+JARVIS = str(Path(__file__).resolve().parent.parent / 'jarvis.py')
+
+
+class BatchModeTest(unittest.TestCase):
+    """Scripted commands must not touch the user's reminders or history"""
+
+    def test_no_persistent_state(self):
+        """Reminders live in memory and no history database is created"""
+        with tempfile.TemporaryDirectory() as workdir:
+            commands = "remind me in 5 minutes to stretch\nwhat time is it\nlist reminders\n"
+            completed = subprocess.run([sys.executable, JARVIS, '--mode', 'batch', '--jobs', '2'],
+                                       input=commands, cwd=workdir, capture_output=True, text=True,
+                                       timeout=60, check=True)
+            results = [json.loads(line) for line in completed.stdout.splitlines()]
+            self.assertEqual([result['intent'] for result in results],
+                             ['reminder', 'time', 'list_reminders'])
+            self.assertEqual(results[2]['replies'], ["You have 1 reminder."])
+            for name in ('reminders.json', 'history.db'):
+                self.assertFalse(os.path.exists(os.path.join(workdir, name)), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
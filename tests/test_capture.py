@@ -0,0 +1,202 @@
+"""Ring-buffered audio capture on synthetic bytes, no audio devices needed"""
+
+import threading
+import time
+import types
+import unittest
+from array import array
+from unittest import mock
+
+import jarvis
+from jarvis import AudioCapture, AudioRingBuffer, BufferedStream, EnergyMonitor
+
+
+def chunk(number, size=4):
+    """A chunk whose bytes all hold its sequence number"""
+    return bytes([number]) * size
+
+
+class FakeMicrophone:
+    """sr.Microphone stand-in whose stream yields numbered chunks
+
+    After `limit` chunks the stream fails, as an unplugged device would;
+    without a limit it delivers a chunk every millisecond until closed.
+    """
+
+    SAMPLE_RATE = 8
+    SAMPLE_WIDTH = 2
+    CHUNK = 2  # 4 chunks a second, 4 bytes each
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.count = 0
+        self.exhausted = threading.Event()
+        self.closed = threading.Event()
+        self.stream = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.closed.set()
+
+    def read(self, size):
+        """The next chunk(s) in sequence"""
+        if self.closed.is_set():
+            raise OSError("device closed")
+        if self.limit is None:
+            time.sleep(0.001)
+        elif self.count >= self.limit:
+            self.exhausted.set()
+            raise OSError("device unplugged")
+        data = b''.join(chunk(self.count + i) for i in range(size // self.CHUNK))
+        self.count += size // self.CHUNK
+        return data
+
+
+class AudioRingBufferTest(unittest.TestCase):
+    """Writes wrap around a fixed buffer; readers address chunks by absolute position"""
+
+    def test_wraps_and_overwrites_oldest(self):
+        """Six writes into four slots keep chunks 2-5"""
+        ring = AudioRingBuffer(4, 4)
+        for number in range(6):
+            ring.write(chunk(number))
+        self.assertEqual(ring.written, 6)
+        self.assertEqual(len(ring.buffer), 16)
+
+        position, read = 2, []
+        while position < ring.written:
+            data, position = ring.read(position, timeout=0)
+            read.append(data)
+        self.assertEqual(read, [chunk(n) for n in range(2, 6)])
+
+    def test_lagging_reader_skips_to_oldest_held(self):
+        """A reader at a position already overwritten loses the chunks in between"""
+        ring = AudioRingBuffer(4, 4)
+        for number in range(10):
+            ring.write(chunk(number))
+        data, position = ring.read(0, timeout=0)
+        self.assertEqual((data, position), (chunk(6), 7))
+
+    def test_odd_sized_chunks_are_padded_or_cut(self):
+        """Every slot holds exactly chunk_bytes"""
+        ring = AudioRingBuffer(4, 2)
+        ring.write(b'\x01')
+        ring.write(b'\x02' * 6)
+        self.assertEqual(ring.read(0, timeout=0)[0], b'\x01\0\0\0')
+        self.assertEqual(ring.read(1, timeout=0)[0], b'\x02' * 4)
+
+    def test_read_ahead_times_out_and_close_wakes(self):
+        """Reading past the live edge waits, and close() releases a blocked reader"""
+        ring = AudioRingBuffer(4, 2)
+        self.assertEqual(ring.read(0, timeout=0.01), (None, 0))
+
+        results = []
+        reader = threading.Thread(target=lambda: results.append(ring.read(0)))
+        reader.start()
+        ring.close()
+        reader.join(timeout=2)
+        self.assertEqual(results, [(None, 0)])
+
+    def test_rewind_stops_at_the_oldest_chunk(self):
+        """BufferedStream.rewind can't go further back than the ring holds"""
+        ring = AudioRingBuffer(4, 4)
+        for number in range(10):
+            ring.write(chunk(number))
+        stream = BufferedStream(ring, 10)
+        stream.rewind(9, 2)
+        self.assertEqual(stream.read(), chunk(7))
+        stream.rewind(9, 100)
+        self.assertEqual(stream.read(), chunk(6))
+
+
+class AudioCaptureTest(unittest.TestCase):
+    """The capture thread fills the ring from a fake device"""
+
+    def capture(self, microphone, buffer_seconds, monitor=None):
+        """An AudioCapture reading from microphone, dozing on monitor if given"""
+        fake_sr = types.SimpleNamespace(Microphone=lambda device_index=None: microphone)
+        with mock.patch.object(jarvis, 'sr', fake_sr):
+            capture = AudioCapture(buffer_seconds=buffer_seconds)
+        capture.doze(monitor)
+        capture.start()
+        self.addCleanup(capture.stop)
+        return capture
+
+    def test_lagging_reader_loses_oldest_chunks(self):
+        """A reader from position 0 starts at the oldest of the last buffer_seconds"""
+        microphone = FakeMicrophone(limit=20)
+        capture = self.capture(microphone, buffer_seconds=2)
+        self.assertTrue(microphone.exhausted.wait(5))
+        self.assertEqual(capture.ring.capacity, 8)
+        self.assertEqual(capture.ring.written, 20)
+
+        stream = BufferedStream(capture.ring, 0)
+        self.assertEqual([stream.read() for _ in range(8)], [chunk(n) for n in range(12, 20)])
+
+    def test_stop_closes_device_and_ring(self):
+        """After stop() the thread is gone and readers get an error instead of blocking"""
+        microphone = FakeMicrophone(limit=None)
+        capture = self.capture(microphone, buffer_seconds=2)
+        stream = BufferedStream(capture.ring, 0)
+        stream.read()
+        capture.stop()
+        self.assertFalse(capture.is_alive())
+        self.assertTrue(microphone.closed.is_set())
+        stream.skip_to_live()
+        with self.assertRaises(OSError):
+            stream.read()
+
+    def test_doze_wakes_on_spike_with_lookback(self):
+        """Dozing reads still fill the ring; the spike reports where it began"""
+        spikes = []
+        # chunk(n) is n * 257 RMS as 16-bit samples: chunks 10 and up are loud
+        monitor = EnergyMonitor(2500, FakeMicrophone.SAMPLE_WIDTH, spikes.append,
+                                chunks_per_read=2, step=1)
+        microphone = FakeMicrophone(limit=20)
+        capture = self.capture(microphone, buffer_seconds=10, monitor=monitor)
+        self.assertTrue(microphone.exhausted.wait(5))
+        capture.join(5)
+
+        self.assertEqual(spikes, [10])
+        self.assertIsNone(capture.monitor)
+        self.assertEqual(capture.ring.written, 20)  # Back to single-chunk reads after waking
+
+        # The listener rewinds past the spike to catch the start of the word
+        stream = BufferedStream(capture.ring, capture.ring.written)
+        stream.rewind(spikes[0], 2)
+        self.assertEqual([stream.read() for _ in range(3)], [chunk(8), chunk(9), chunk(10)])
+
+    def test_doze_released_when_the_device_fails(self):
+        """A dozing listener is woken at the live edge rather than left waiting"""
+        spikes = []
+        monitor = EnergyMonitor(10 ** 6, FakeMicrophone.SAMPLE_WIDTH, spikes.append,
+                                chunks_per_read=4)
+        microphone = FakeMicrophone(limit=12)
+        capture = self.capture(microphone, buffer_seconds=10, monitor=monitor)
+        self.assertTrue(microphone.exhausted.wait(5))
+        capture.join(5)
+        self.assertEqual(spikes, [12])
+
+
+class EnergyMonitorTest(unittest.TestCase):
+    """The wake-up gate measures decimated RMS against its threshold"""
+
+    def test_step_skips_samples(self):
+        """With step 2 only every other sample is measured"""
+        data = array('h', [1000, 0] * 8).tobytes()
+        self.assertTrue(EnergyMonitor(900, 2, None, step=2).spike(data))
+        self.assertFalse(EnergyMonitor(900, 2, None, step=1).spike(data))
+
+    def test_silence_and_threshold(self):
+        """Silence never spikes; the threshold itself is not above it"""
+        monitor = EnergyMonitor(1000, 2, None)
+        self.assertFalse(monitor.spike(bytes(64)))
+        self.assertFalse(monitor.spike(array('h', [1000] * 32).tobytes()))
+        self.assertTrue(monitor.spike(array('h', [-1001] * 32).tobytes()))
+        self.assertEqual((monitor.chunks_per_read, monitor.step), (8, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""Config hot reload: ConfigWatcher debounce and snapshot reuse"""
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from jarvis import ConfigWatcher, JarvisAssistant
+
+CONFIG = {'wake_word': 'hey jarvis', 'listen_timeout': 7, 'voice_rate': 185}
+APPS_CONFIG = {
+    'applications': {'chrome': {'path': '/Applications/Google Chrome.app',
+                                'commands': ['chrome', 'browser']}},
+    'system_commands': {'lock_screen': 'pmset displaysleepnow'}
+}
+
+
+def snapshot(config, apps_config, previous=None):
+    """JarvisAssistant.build_snapshot without starting an assistant"""
+    return JarvisAssistant.build_snapshot(None, config, apps_config, previous=previous)
+
+
+class ConfigWatcherTest(unittest.TestCase):
+    """Edits are reported once, after the file has stopped changing"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = Path(directory) / 'config.json'
+        self.path.write_text('{}', encoding='utf-8')
+        self.changes = []
+        self.changed = threading.Event()
+
+    def watcher(self, debounce):
+        """A started watcher polling every 10 ms"""
+        def on_change():
+            self.changes.append(self.path.read_text(encoding='utf-8'))
+            self.changed.set()
+
+        watcher = ConfigWatcher([self.path], on_change, interval=0.01, debounce=debounce)
+        watcher.start()
+        self.addCleanup(watcher.join, 1)
+        self.addCleanup(watcher.stop)
+        return watcher
+
+    def test_settled_edit_reported_once(self):
+        """One save is one callback, with the final content"""
+        self.watcher(debounce=0.05)
+        self.path.write_text('{"wake_word": "computer"}', encoding='utf-8')
+        self.assertTrue(self.changed.wait(5))
+        time.sleep(0.2)
+        self.assertEqual(self.changes, ['{"wake_word": "computer"}'])
+
+    def test_changing_file_is_not_reported(self):
+        """While the file keeps changing within the debounce period nothing is loaded"""
+        self.watcher(debounce=0.3)
+        for size in range(1, 11):
+            self.path.write_text('{' + ' ' * size, encoding='utf-8')  # A save in progress
+            time.sleep(0.02)
+        self.assertEqual(self.changes, [])
+
+        self.path.write_text('{"wake_word": "computer"}', encoding='utf-8')
+        self.assertTrue(self.changed.wait(5))
+        self.assertEqual(self.changes, ['{"wake_word": "computer"}'])
+
+    def test_missing_file_waits_for_it_to_return(self):
+        """A file deleted mid-save is not reported until it is back"""
+        self.watcher(debounce=0.02)
+        self.path.unlink()
+        self.assertFalse(self.changed.wait(0.2))
+        self.path.write_text('{"listen_timeout": 5}', encoding='utf-8')
+        self.assertTrue(self.changed.wait(5))
+
+    def test_stop(self):
+        """stop() ends the polling thread"""
+        watcher = self.watcher(debounce=0.05)
+        watcher.stop()
+        watcher.join(1)
+        self.assertFalse(watcher.is_alive())
+
+
+class ConfigSnapshotTest(unittest.TestCase):
+    """A reload only rebuilds the parts of the snapshot whose config changed"""
+
+    def setUp(self):
+        self.old = snapshot(dict(CONFIG), dict(APPS_CONFIG))
+
+    def test_unchanged_parts_are_reused(self):
+        """Identical settings, applications and system commands keep their objects"""
+        new = snapshot(dict(CONFIG, voice_rate=200), {
+            'applications': {'chrome': {'path': '/Applications/Google Chrome.app',
+                                        'commands': ['chrome', 'browser']}},
+            'system_commands': {'lock_screen': 'pmset displaysleepnow'}
+        }, previous=self.old)
+        self.assertIsNot(new, self.old)
+        self.assertEqual(new.config['voice_rate'], 200)
+        self.assertIs(new.settings, self.old.settings)
+        self.assertIs(new.apps_config['applications'], self.old.apps_config['applications'])
+        self.assertIs(new.system_commands, self.old.system_commands)
+
+    def test_changed_parts_are_rebuilt(self):
+        """A new wake word or app list shows up in the new snapshot only"""
+        apps_config = dict(APPS_CONFIG, applications={
+            'safari': {'path': '/Applications/Safari.app', 'commands': ['safari']}})
+        new = snapshot(dict(CONFIG, wake_word='Computer'), apps_config, previous=self.old)
+        self.assertEqual(new.settings.wake_word, 'computer')
+        self.assertEqual(self.old.settings.wake_word, 'hey jarvis')
+        self.assertEqual(list(new.apps_config['applications']), ['safari'])
+        self.assertIs(new.system_commands, self.old.system_commands)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Daemon mode: an owner-only socket, and concurrent clients timed as separate turns"""
+
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+JARVIS = str(Path(__file__).resolve().parent.parent / 'jarvis.py')
+CLIENTS = 12
+
+# The first step stands in for a slow system command, so concurrent
+# clients are all inside run_command at the same time
+COMMAND = "take a screenshot then what time is it"
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "daemon mode needs Unix sockets")
+class ConcurrentSendTest(unittest.TestCase):
+    """N concurrent --send calls must produce N distinct turn records"""
+
+    def setUp(self):
+        # Unix socket paths are limited to ~100 bytes, so keep the directory short
+        self.workdir = tempfile.mkdtemp(prefix='jarvis',
+                                        dir='/tmp' if os.path.isdir('/tmp') else None)
+        self.socket_path = os.path.join(self.workdir, 'jarvis.sock')
+        config = {'daemon_socket': self.socket_path, 'history': False, 'app_discovery': False,
+                  'config_reload': False}
+        apps_config = {'applications': {}, 'system_commands': {'screenshot': 'sleep 0.3'}}
+        for name, content in (('config.json', config), ('apps_config.json', apps_config)):
+            with open(os.path.join(self.workdir, name), 'w', encoding='utf-8') as f:
+                json.dump(content, f)
+        self.daemon = subprocess.Popen(  # pylint: disable=consider-using-with
+            [sys.executable, JARVIS, '--mode', 'daemon', '--no-speech', '--metrics'],
+            cwd=self.workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.addCleanup(self.stop_daemon)
+        self.wait_for_socket()
+
+    def wait_for_socket(self, timeout=20):
+        """Block until the daemon accepts connections"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            self.assertIsNone(self.daemon.poll(), "daemon exited during startup")
+            if os.path.exists(self.socket_path):
+                return
+            time.sleep(0.05)
+        self.fail("daemon did not start listening")
+
+    def stop_daemon(self):
+        """SIGTERM the daemon, killing it if it doesn't exit"""
+        if self.daemon.poll() is None:
+            self.daemon.send_signal(signal.SIGTERM)
+            try:
+                self.daemon.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.daemon.kill()
+                self.daemon.wait()
+
+    def send(self, text):
+        """Run one --send client; returns its JSON result"""
+        completed = subprocess.run([sys.executable, JARVIS, '--send', text], cwd=self.workdir,
+                                   capture_output=True, text=True, timeout=60, check=False)
+        self.assertEqual(completed.returncode, 0, completed.stdout + completed.stderr)
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    def test_socket_is_owner_only(self):
+        """The socket is created without group or other permissions"""
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o077, 0)
+
+    def test_concurrent_sends_get_distinct_turns(self):
+        """Each client's command is timed as its own turn"""
+        with ThreadPoolExecutor(max_workers=CLIENTS) as pool:
+            results = list(pool.map(self.send, [COMMAND] * CLIENTS))
+        self.assertTrue(all(result['intent'] == 'compound' for result in results), results)
+
+        self.stop_daemon()
+        with open(os.path.join(self.workdir, 'logs', 'metrics.jsonl'), encoding='utf-8') as f:
+            turns = [record for record in map(json.loads, f) if 'turn' in record]
+        self.assertEqual(len(turns), CLIENTS)
+        self.assertEqual(len({turn['turn'] for turn in turns}), CLIENTS)
+        for turn in turns:
+            self.assertEqual(turn['intent'], 'compound')
+            self.assertEqual(set(turn['stages']), {'routing', 'handler', 'subprocess'})
+            # Each turn timed its own command, not its neighbours' as well
+            self.assertGreaterEqual(turn['total'], 0.3)
+            self.assertLess(turn['stages']['subprocess'], 0.6)
+
+
+if __name__ == '__main__':
+    unittest.main()
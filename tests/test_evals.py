@@ -0,0 +1,117 @@
+"""The --vad-eval, --wake-word-eval and --app-scan reports on the generated fixtures"""
+
+import contextlib
+import io
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from make_fixtures import FIXTURES, build_app_tree
+from jarvis import (InstalledApps, VoiceActivityDetector, WakeWordSpotter, evaluate_app_discovery,
+                    evaluate_vad, evaluate_wake_word)
+
+HAS_NUMPY = VoiceActivityDetector.available()
+
+
+def run_report(evaluate, *args, **kwargs):
+    """(return value, printed lines) of an evaluate_* function"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = evaluate(*args, **kwargs)
+    return result, output.getvalue().splitlines()
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is required")
+class VadEvalTest(unittest.TestCase):
+    """Every synthetic voiced clip is kept and every hiss, hum and click clip dropped"""
+
+    def test_report(self):
+        """Counts from VoiceActivityDetector.evaluate"""
+        report = VoiceActivityDetector().evaluate(FIXTURES / 'vad')
+        self.assertEqual((report['speech_clips'], report['missed_speech']), (4, 0))
+        self.assertEqual((report['silence_clips'], report['passed_silence']), (4, 0))
+        self.assertGreater(report['bytes_saved_ratio'], 0.5)
+
+    def test_printed_numbers(self):
+        """What --vad-eval prints"""
+        result, lines = run_report(evaluate_vad, FIXTURES / 'vad')
+        self.assertTrue(result)
+        self.assertIn("Missed speech:    0/4", lines)
+        self.assertIn("Passed silence:   0/4", lines)
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is required")
+class WakeWordEvalTest(unittest.TestCase):
+    """The spotter enrolled on samples/ accepts positive/ and rejects negative/"""
+
+    def test_report(self):
+        """Counts from WakeWordSpotter.evaluate"""
+        spotter = WakeWordSpotter()
+        self.assertEqual(spotter.load_templates(FIXTURES / 'wake_word' / 'samples'), 3)
+        report = spotter.evaluate(FIXTURES / 'wake_word')
+        self.assertEqual((report['positives'], report['false_rejects']), (4, 0))
+        self.assertEqual((report['negatives'], report['false_accepts']), (6, 0))
+
+    def test_printed_numbers(self):
+        """What --wake-word-eval prints"""
+        result, lines = run_report(evaluate_wake_word, FIXTURES / 'wake_word',
+                                   samples_dir=FIXTURES / 'wake_word' / 'samples')
+        self.assertTrue(result)
+        self.assertTrue(any(line.startswith("Templates:        3 ") for line in lines), lines)
+        self.assertIn("False rejects:    0/4 (0.0%)", lines)
+        self.assertIn("False accepts:    0/6 (0.0%)", lines)
+
+
+class AppDiscoveryEvalTest(unittest.TestCase):
+    """Bundles two folders deep are found, named from Info.plist, and refreshed"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        # The index is saved outside the scanned tree so saving it doesn't change a folder mtime
+        self.root = os.path.join(directory, 'Applications')
+        self.cache_path = os.path.join(directory, 'installed_apps.json')
+        build_app_tree(self.root)
+
+    def test_printed_numbers(self):
+        """What --app-scan prints"""
+        result, lines = run_report(evaluate_app_discovery, [self.root])
+        self.assertTrue(result)
+        # Root, Utilities and Utilities/Extras; Utilities/Extras/Deeper is past MAX_DEPTH
+        self.assertIn("Apps found:       7 in 3 folders", lines)
+
+    def test_lookup_and_refresh(self):
+        """Info.plist names resolve, and only a real change rescans"""
+        installed = InstalledApps([self.root], self.cache_path, logging.getLogger('test'))
+        self.assertTrue(installed.refresh())
+        self.assertNotIn('too_deep', installed.paths)
+        disk_utility = os.path.join(self.root, 'Utilities', 'Extras', 'Disk Utility.app')
+        self.assertEqual(installed.lookup('disks'), ('disk_utility', disk_utility))
+
+        self.assertFalse(installed.refresh())
+        build_app_tree(self.root, [('Utilities', 'Notes', None)])
+        self.assertTrue(installed.refresh())
+        self.assertEqual(installed.lookup('notes')[0], 'notes')
+
+        # A new process starts from the saved index
+        reloaded = InstalledApps([self.root], self.cache_path, logging.getLogger('test'))
+        self.assertEqual(reloaded.paths, installed.paths)
+        self.assertFalse(reloaded.refresh())
+
+    def test_background_refresh(self):
+        """A miss rescans off the caller's thread, one scan at a time"""
+        installed = InstalledApps([self.root], self.cache_path, logging.getLogger('test'))
+        installed.refresh()
+        build_app_tree(self.root, [('', 'Notes', None)])
+        self.assertIsNone(installed.lookup('notes'))
+        with installed.refresh_lock:  # Holds the scan so it is still running
+            scanner = installed.refresh_in_background()
+            self.assertIs(installed.refresh_in_background(), scanner)
+        scanner.join(timeout=10)
+        self.assertEqual(installed.lookup('notes')[0], 'notes')
+
+
+if __name__ == '__main__':
+    unittest.main()
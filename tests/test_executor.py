@@ -0,0 +1,88 @@
+"""CommandExecutor: timeouts, cancellation and failures as results"""
+
+import sys
+import threading
+import time
+import unittest
+
+from jarvis import CommandExecutor, CommandResult
+
+SLEEP = [sys.executable, '-c', 'import time; time.sleep(30)']
+SUCCEED = [sys.executable, '-c', 'pass']
+FAIL = [sys.executable, '-c', 'raise SystemExit(3)']
+
+
+class CommandExecutorTest(unittest.TestCase):
+    """Commands never block or raise into the caller; outcomes come back as CommandResults"""
+
+    def setUp(self):
+        self.executor = CommandExecutor(max_workers=2, default_timeout=10)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_success_and_exit_status(self):
+        """The exit status is reported as is"""
+        ok = self.executor.submit('ok', SUCCEED).result(timeout=30)
+        failed = self.executor.submit('fail', FAIL).result(timeout=30)
+        self.assertIsInstance(ok, CommandResult)
+        self.assertEqual((ok.name, ok.returncode, ok.timed_out, ok.error), ('ok', 0, False, None))
+        self.assertEqual(failed.returncode, 3)
+
+    def test_timeout_kills_the_process(self):
+        """A command over its timeout is killed and marked timed out"""
+        started = time.perf_counter()
+        result = self.executor.submit('sleep', SLEEP, timeout=0.5).result(timeout=30)
+        self.assertTrue(result.timed_out)
+        self.assertNotEqual(result.returncode, 0)
+        self.assertLess(time.perf_counter() - started, 10)
+
+    def test_bad_command_is_a_failed_result(self):
+        """A missing program is an error in the result, not an exception"""
+        handle = self.executor.submit('missing', ['/nonexistent/jarvis-test-program'])
+        result = handle.result(timeout=30)
+        self.assertIsNone(result.returncode)
+        self.assertIn('jarvis-test-program', result.error)
+
+    def test_cancel_running_and_queued(self):
+        """Cancelling kills a running command and skips a queued one"""
+        executor = CommandExecutor(max_workers=1, default_timeout=30)
+        self.addCleanup(executor.shutdown)
+        running = executor.submit('running', SLEEP)
+        queued = executor.submit('queued', SUCCEED)
+        while running.process is None:
+            time.sleep(0.01)
+
+        queued.cancel()
+        running.cancel()
+        result = running.result(timeout=30)
+        self.assertTrue(result.cancelled)
+        self.assertFalse(result.timed_out)
+        self.assertTrue(queued.future.cancelled())
+
+    def test_shutdown_drops_pending(self):
+        """shutdown() with cancel_pending drops queued commands but lets the running one end"""
+        executor = CommandExecutor(max_workers=1, default_timeout=30)
+        gate = threading.Event()
+        results = []
+        running = executor.submit('running', [sys.executable, '-c', 'import time; time.sleep(0.3)'],
+                                  callback=lambda result: gate.set())
+        pending = [executor.submit(f'pending {i}', SUCCEED, callback=results.append)
+                   for i in range(3)]
+        executor.shutdown(wait=True, cancel_pending=True)
+        self.assertTrue(gate.is_set())
+        self.assertEqual(running.result().returncode, 0)
+        self.assertTrue(all(handle.future.cancelled() for handle in pending))
+        self.assertEqual(results, [])
+
+    def test_first_success_cancels_the_rest(self):
+        """The first zero exit wins; slower alternatives are cancelled"""
+        done = threading.Event()
+        outcome = []
+        handles = self.executor.first_success(
+            'open', [SLEEP, SUCCEED], callback=lambda result: (outcome.append(result), done.set()))
+        self.assertTrue(done.wait(30))
+        self.assertEqual(outcome[0].returncode, 0)
+        self.assertTrue(handles[0].result(timeout=30).cancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()
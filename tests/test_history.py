@@ -0,0 +1,82 @@
+"""CommandHistory: persisted hourly usage and the likelihoods derived from it"""
+
+import logging
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from jarvis import CommandHistory
+
+LOGGER = logging.getLogger('test_history')
+
+
+class CommandHistoryTest(unittest.TestCase):
+    """Usage near the asked-for hour counts most, and survives a restart"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = str(Path(directory) / 'history.db')
+
+    def history(self, usage=()):
+        """A history over the test database, seeded with (intent, target, hour, uses) rows"""
+        seed = CommandHistory(self.path, LOGGER)
+        seed.write([(time.time(), intent, target, hour, 1)
+                    for intent, target, hour, uses in usage for _ in range(uses)])
+        seed.connection.close()
+        history = CommandHistory(self.path, LOGGER)
+        self.addCleanup(history.connection.close)
+        return history
+
+    def test_likelihoods_follow_the_hour(self):
+        """Morning usage wins in the morning, evening usage in the evening"""
+        history = self.history([('open_app', 'chrome', 9, 4), ('open_app', 'spotify', 21, 4)])
+        morning = history.likelihoods(['open_app'], hour=9)
+        self.assertEqual(list(morning), [('open_app', 'chrome'), ('open_app', 'spotify')])
+        self.assertAlmostEqual(sum(morning.values()), 1.0)
+        self.assertAlmostEqual(morning[('open_app', 'chrome')], 1.0 / 1.05)
+
+        evening = history.likelihoods(['open_app'], hour=21)
+        self.assertEqual(next(iter(evening)), ('open_app', 'spotify'))
+        afternoon = history.likelihoods(['open_app'], hour=15)
+        self.assertAlmostEqual(afternoon[('open_app', 'chrome')], 0.5)
+
+    def test_hours_wrap_around_midnight(self):
+        """11 pm is one hour from midnight, not 23"""
+        history = self.history([('open_app', 'chrome', 23, 1), ('open_app', 'safari', 3, 1)])
+        likely = history.likelihoods(['open_app'], hour=0)
+        self.assertAlmostEqual(likely[('open_app', 'chrome')] / likely[('open_app', 'safari')],
+                               0.5 / 0.05)
+
+    def test_only_asked_intents_with_a_target(self):
+        """Other intents and target-less commands are left out"""
+        history = self.history([('open_app', 'chrome', 9, 1), ('time', '', 9, 5),
+                                ('lock_screen', 'lock_screen', 9, 5)])
+        self.assertEqual(list(history.likelihoods(['open_app', 'time'], hour=9)),
+                         [('open_app', 'chrome')])
+        self.assertEqual(history.likelihoods(['volume_up'], hour=9), {})
+
+    def test_recorded_commands_persist(self):
+        """record() is counted at once and written by the thread before stop() returns"""
+        history = CommandHistory(self.path, LOGGER)
+        history.start()
+        history.record('open_app', 'chrome')
+        history.record('open_app', 'chrome')
+        history.record(None)
+        self.assertEqual(history.version, 3)
+        self.assertEqual(list(history.likelihoods(['open_app'])), [('open_app', 'chrome')])
+        history.stop()
+        self.assertFalse(history.is_alive())
+
+        reloaded = CommandHistory(self.path, LOGGER)
+        self.addCleanup(reloaded.connection.close)
+        self.assertEqual(sum(reloaded.counts[('open_app', 'chrome')]), 2)
+        self.assertEqual(sum(reloaded.counts[('unknown', '')]), 1)
+        rows = reloaded.connection.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+        self.assertEqual(rows, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Queued logging: JSON records and one set of handlers per process"""
+
+import json
+import logging
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import jarvis
+from jarvis import JarvisAssistant, JsonLogFormatter, LatencyMetrics, stop_log_writer
+
+
+class LoggingHost:  # pylint: disable=too-few-public-methods
+    """Just the logging setup of JarvisAssistant, on a given config"""
+
+    setup_logging = JarvisAssistant.setup_logging
+    start_log_writer = JarvisAssistant.start_log_writer
+    current_turn = JarvisAssistant.current_turn
+
+    def __init__(self, log_file, **config):
+        self.debug = False
+        self.quiet = True
+        self.config = config
+        self.metrics = LatencyMetrics()
+        self.logger = self.log_file = None
+        self.setup_logging(log_file)
+        self.start_log_writer()
+
+
+def read_lines(path):
+    """The lines written to path so far"""
+    return Path(path).read_text(encoding='utf-8').splitlines()
+
+
+class LoggingTest(unittest.TestCase):
+    """Records reach the file once, formatted on the writer thread"""
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(self.reset_logger)
+
+    @staticmethod
+    def reset_logger():
+        """Leave the Jarvis logger as an import left it"""
+        stop_log_writer()
+        logger = logging.getLogger('Jarvis')
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+            handler.close()
+
+    def test_json_records_carry_the_turn(self):
+        """Each line is one JSON object, stamped with the turn open on the logging thread"""
+        host = LoggingHost(self.directory / 'jarvis.log', log_format='json')
+        turn = host.metrics.begin_turn('test')
+        host.logger.info("Opening %s", "chrome")
+        host.metrics.end_turn('open_app')
+        host.logger.warning("Between turns", extra={'stages': {'recognize': 0.5}})
+        stop_log_writer()
+
+        first, second = [json.loads(line) for line in read_lines(host.log_file)]
+        self.assertEqual((first['level'], first['msg'], first['turn']),
+                         ('INFO', "Opening chrome", turn['turn']))
+        self.assertNotIn('turn', second)
+        self.assertEqual(second['stages'], {'recognize': 0.5})
+
+    def test_exception_text_survives_the_queue(self):
+        """Tracebacks are captured in the emitting thread and written as 'exc'"""
+        host = LoggingHost(self.directory / 'jarvis.log')
+        try:
+            raise ValueError("bad config")
+        except ValueError:
+            host.logger.exception("Reload failed")
+        stop_log_writer()
+
+        record = json.loads(read_lines(host.log_file)[0])
+        self.assertIn("ValueError: bad config", record['exc'])
+
+    def test_text_format(self):
+        """log_format 'text' keeps the classic line layout"""
+        host = LoggingHost(self.directory / 'jarvis.log', log_format='text')
+        host.logger.info("plain")
+        stop_log_writer()
+        self.assertTrue(read_lines(host.log_file)[0].endswith("Jarvis - INFO - plain"))
+
+    def test_reinit_replaces_handlers(self):
+        """A second setup in the same process leaves one handler and one writer"""
+        first = LoggingHost(self.directory / 'first.log')
+        first_writer = jarvis._log_listener  # pylint: disable=protected-access
+        second = LoggingHost(self.directory / 'second.log')
+        self.assertIs(first.logger, second.logger)
+        self.assertEqual(len(second.logger.handlers), 1)
+        self.assertIsNot(jarvis._log_listener, first_writer)  # pylint: disable=protected-access
+
+        second.logger.info("once")
+        stop_log_writer()
+        self.assertEqual(read_lines(first.log_file), [])
+        self.assertEqual([json.loads(line)['msg'] for line in read_lines(second.log_file)],
+                         ["once"])
+
+    def test_debug_sampling(self):
+        """A zero sample rate drops DEBUG records but keeps everything above"""
+        host = LoggingHost(self.directory / 'jarvis.log', log_debug_sample_rate=0.0)
+        host.logger.setLevel(logging.DEBUG)
+        host.logger.debug("dropped")
+        host.logger.info("kept")
+        stop_log_writer()
+        self.assertEqual([json.loads(line)['msg'] for line in read_lines(host.log_file)],
+                         ["kept"])
+
+    def test_formatter_fields(self):
+        """JsonLogFormatter emits the fixed fields and only the extras that are set"""
+        record = logging.LogRecord('Jarvis', logging.ERROR, __file__, 1, "rc=%s", (1,), None)
+        record.intent = 'open_app'
+        entry = json.loads(JsonLogFormatter().format(record))
+        self.assertEqual(set(entry), {'ts', 'level', 'thread', 'msg', 'intent'})
+        self.assertEqual(entry['msg'], "rc=1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""LatencyMetrics: rolling quantiles, per-turn records and the Prometheus text format"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from jarvis import LatencyMetrics
+
+
+class LatencyMetricsTest(unittest.TestCase):
+    """Stage and intent windows summarize to nearest-rank p50/p95/p99"""
+
+    def setUp(self):
+        self.metrics = LatencyMetrics(window=100)
+
+    def test_quantiles(self):
+        """Nearest rank over an unordered window"""
+        samples = list(range(100, 0, -1))
+        self.assertEqual(LatencyMetrics.quantiles(samples), {0.5: 51, 0.95: 96, 0.99: 100})
+        self.assertEqual(LatencyMetrics.quantiles([0.25]), {0.5: 0.25, 0.95: 0.25, 0.99: 0.25})
+
+    def test_window_rolls_but_totals_do_not(self):
+        """Quantiles cover the last window samples; count and sum cover the session"""
+        metrics = LatencyMetrics(window=10)
+        for seconds in [5.0] * 10 + [1.0] * 10:
+            metrics.observe('recognize', seconds)
+        stats = metrics.summary()['stage']['recognize']
+        self.assertEqual((stats['p50'], stats['p99']), (1.0, 1.0))
+        self.assertEqual((stats['count'], stats['sum']), (20, 60.0))
+
+    def test_turns_record_stages_per_thread(self):
+        """Each thread times its own turn; end_turn adds it to the intent window"""
+        turns = {}
+
+        def voice_turn(name, seconds):
+            self.metrics.begin_turn(name)
+            self.metrics.observe('recognize', seconds)
+            self.metrics.observe('execute', seconds)
+            turns[name] = self.metrics.end_turn(name)
+
+        threads = [threading.Thread(target=voice_turn, args=(name, seconds))
+                   for name, seconds in (('open_app', 0.1), ('weather', 0.2))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(turns['open_app']['stages'], {'recognize': 0.1, 'execute': 0.1})
+        self.assertEqual(turns['weather']['stages'], {'recognize': 0.2, 'execute': 0.2})
+        self.assertNotEqual(turns['open_app']['turn'], turns['weather']['turn'])
+        self.assertEqual(sorted(self.metrics.summary()['intent']), ['open_app', 'weather'])
+        self.assertIsNone(self.metrics.end_turn('open_app'))
+
+    def test_prometheus_text(self):
+        """One summary per kind with quantile, _sum and _count samples"""
+        for seconds in (0.1, 0.2, 0.3, 0.4):
+            self.metrics.observe('recognize', seconds)
+        self.metrics.begin_turn('test')
+        self.metrics.end_turn(None)
+
+        lines = self.metrics.prometheus().splitlines()
+        self.assertIn('# TYPE jarvis_stage_latency_seconds summary', lines)
+        self.assertIn('jarvis_stage_latency_seconds{stage="recognize",quantile="0.5"} 0.300000',
+                      lines)
+        self.assertIn('jarvis_stage_latency_seconds{stage="recognize",quantile="0.99"} 0.400000',
+                      lines)
+        self.assertIn('jarvis_stage_latency_seconds_sum{stage="recognize"} 1.000000', lines)
+        self.assertIn('jarvis_stage_latency_seconds_count{stage="recognize"} 4', lines)
+        self.assertIn('jarvis_intent_latency_seconds_count{intent="unknown"} 1', lines)
+
+    def test_jsonl_turns_and_summary(self):
+        """Every turn is one line in the metrics file, followed by a summary on close"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'metrics', 'latency.jsonl')
+        metrics = LatencyMetrics(jsonl_path=path)
+        metrics.begin_turn('voice')
+        metrics.observe('recognize', 0.5)
+        metrics.end_turn('open_app')
+        metrics.close()
+
+        with open(path, encoding='utf-8') as f:
+            turn, summary = [json.loads(line) for line in f]
+        self.assertEqual((turn['source'], turn['intent']), ('voice', 'open_app'))
+        self.assertEqual(turn['stages'], {'recognize': 0.5})
+        self.assertEqual(summary['summary']['stage']['recognize']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
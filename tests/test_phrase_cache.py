@@ -0,0 +1,81 @@
+"""PhraseCache: size-bounded LRU eviction and invalidation on voice changes"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from jarvis import PhraseCache
+
+LOGGER = logging.getLogger('test_phrase_cache')
+
+
+class PhraseCacheTest(unittest.TestCase):
+    """Clips are evicted least recently used first and dropped when the voice changes"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def cache(self, voice='alex', max_bytes=250):
+        """A cache under the test directory with the given voice"""
+        return PhraseCache(self.root, voice, 185, 0.95, max_bytes, LOGGER)
+
+    @staticmethod
+    def add(cache, text, size=100):
+        """Add a rendered clip of size bytes for text"""
+        fd, rendered = tempfile.mkstemp(suffix=cache.extension)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(b'\0' * size)
+        return cache.add(text, rendered)
+
+    def test_least_recently_used_is_evicted(self):
+        """Going over max_bytes drops the clip that was used longest ago"""
+        cache = self.cache()
+        first = self.add(cache, "Opening chrome")
+        second = self.add(cache, "Here you go")
+        self.assertEqual(cache.get("Opening chrome"), first)  # Now the most recent
+
+        self.add(cache, "Goodbye")
+        self.assertEqual(cache.size, 200)
+        self.assertFalse(cache.contains("Here you go"))
+        self.assertFalse(second.exists())
+        self.assertIsNone(cache.get("Here you go"))
+        self.assertTrue(cache.contains("Opening chrome"))
+        self.assertTrue(cache.contains("Goodbye"))
+
+    def test_clip_larger_than_the_cache_is_kept_alone(self):
+        """The newest clip always stays, even over the limit"""
+        cache = self.cache(max_bytes=50)
+        self.add(cache, "one")
+        self.add(cache, "two")
+        self.assertEqual(list(cache.entries), [cache.path_for("two").name])
+
+    def test_reload_with_same_voice(self):
+        """A new process finds the clips rendered before"""
+        self.add(self.cache(), "Opening chrome")
+        reloaded = self.cache()
+        self.assertTrue(reloaded.contains("Opening chrome"))
+        self.assertEqual(reloaded.size, 100)
+
+    def test_voice_change_invalidates(self):
+        """Clips rendered with other voice settings are deleted"""
+        old = self.cache(voice='alex')
+        self.add(old, "Opening chrome")
+        new = self.cache(voice='samantha')
+        self.assertNotEqual(new.directory, old.directory)
+        self.assertFalse(old.directory.exists())
+        self.assertIsNone(new.get("Opening chrome"))
+        self.assertFalse(self.cache(voice='alex').contains("Opening chrome"))
+
+    def test_missing_file_is_a_miss(self):
+        """A clip deleted behind the cache's back is forgotten"""
+        cache = self.cache()
+        self.add(cache, "Opening chrome").unlink()
+        self.assertIsNone(cache.get("Opening chrome"))
+        self.assertEqual(cache.size, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""AudioPreprocessor: polyphase resampling, downmix and peak normalization"""
+
+import math
+import unittest
+
+from jarvis import AudioPreprocessor, load_numpy
+
+np = load_numpy()
+
+
+def tone(frequency, rate, seconds=1.0, amplitude=0.5):
+    """A float32 sine wave"""
+    t = np.arange(int(rate * seconds)) / rate
+    return (amplitude * np.sin(2 * math.pi * frequency * t)).astype(np.float32)
+
+
+def to_pcm16(samples):
+    """Little-endian 16-bit PCM bytes of float samples"""
+    return (samples * 32767).astype('<i2').tobytes()
+
+
+def rms(samples):
+    """Root mean square, ignoring the filter's ramp at either end"""
+    middle = samples[len(samples) // 10:-len(samples) // 10]
+    return float(np.sqrt(np.mean(middle.astype(np.float64) ** 2)))
+
+
+@unittest.skipUnless(np is not None, "NumPy is required")
+class ResampleTest(unittest.TestCase):
+    """Output length follows the rate ratio and the passband survives"""
+
+    def setUp(self):
+        self.preprocessor = AudioPreprocessor(target_rate=16000)
+
+    def test_output_length(self):
+        """len(out) == ceil(len(in) * target / rate) for common capture rates"""
+        for rate, count in ((48000, 48000), (44100, 44100), (22050, 1001), (32000, 7)):
+            with self.subTest(rate=rate, count=count):
+                samples = np.zeros(count, dtype=np.float32)
+                out = self.preprocessor.resample(samples, rate)
+                self.assertEqual(len(out), math.ceil(count * 16000 / rate))
+
+    def test_same_rate_and_empty_are_untouched(self):
+        """Nothing to do returns the input itself"""
+        samples = tone(440, 16000)
+        self.assertIs(self.preprocessor.resample(samples, 16000), samples)
+        empty = np.zeros(0, dtype=np.float32)
+        self.assertIs(self.preprocessor.resample(empty, 48000), empty)
+
+    def test_passband_tone_keeps_frequency_and_level(self):
+        """A 440 Hz tone at 44.1 kHz is still 440 Hz at the same level at 16 kHz"""
+        samples = tone(440, 44100)
+        out = self.preprocessor.resample(samples, 44100)
+        spectrum = np.abs(np.fft.rfft(out))
+        peak_hz = np.argmax(spectrum) * 16000 / len(out)
+        self.assertAlmostEqual(peak_hz, 440, delta=2)
+        self.assertAlmostEqual(rms(out), rms(samples), delta=0.02)
+
+    def test_above_nyquist_is_filtered(self):
+        """A 12 kHz tone can't be represented at 16 kHz and must not alias down"""
+        out = self.preprocessor.resample(tone(12000, 48000), 48000)
+        self.assertLess(rms(out), 0.01)
+
+    def test_filters_are_cached_per_ratio(self):
+        """Each rate pair builds its filter bank once"""
+        self.preprocessor.resample(tone(440, 48000, 0.1), 48000)
+        self.preprocessor.resample(tone(440, 48000, 0.1), 48000)
+        self.preprocessor.resample(tone(440, 44100, 0.1), 44100)
+        self.assertEqual(sorted(self.preprocessor.filters), [(1, 3), (160, 441)])
+
+
+@unittest.skipUnless(np is not None, "NumPy is required")
+class ProcessTest(unittest.TestCase):
+    """process() returns 16-bit mono at no more than the target rate"""
+
+    def test_stereo_48k_to_mono_16k(self):
+        """Channels are averaged and the rate comes down to 16 kHz"""
+        left, right = tone(440, 48000), tone(440, 48000)
+        stereo = np.stack([left, right], axis=1).reshape(-1)
+        preprocessor = AudioPreprocessor(normalize=False)
+        pcm, rate, width = preprocessor.process(to_pcm16(stereo), 48000, 2, channels=2)
+        self.assertEqual((rate, width), (16000, 2))
+        self.assertEqual(len(pcm), 16000 * 2)
+
+    def test_low_rates_are_not_upsampled(self):
+        """8 kHz audio stays 8 kHz"""
+        pcm, rate, _ = AudioPreprocessor(normalize=False).process(
+            to_pcm16(tone(440, 8000)), 8000, 2)
+        self.assertEqual(rate, 8000)
+        self.assertEqual(len(pcm), 8000 * 2)
+
+    def test_normalization(self):
+        """Quiet audio is raised to the target peak, but by no more than max_gain_db"""
+        preprocessor = AudioPreprocessor(target_peak_dbfs=-6.0, max_gain_db=20.0)
+        pcm, _, _ = preprocessor.process(to_pcm16(tone(440, 16000, amplitude=0.1)), 16000, 2)
+        peak = np.max(np.abs(np.frombuffer(pcm, '<i2'))) / 32767
+        self.assertAlmostEqual(peak, 10 ** (-6 / 20), delta=0.01)
+
+        pcm, _, _ = preprocessor.process(to_pcm16(tone(440, 16000, amplitude=0.001)), 16000, 2)
+        peak = np.max(np.abs(np.frombuffer(pcm, '<i2'))) / 32767
+        self.assertAlmostEqual(peak, 0.01, delta=0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+"""HedgedRecognizer races and circuit breakers over fake backends with injected delays"""
+
+import threading
+import time
+import unittest
+
+from jarvis import (CircuitBreaker, FakeRecognitionBackend, HedgedRecognizer,
+                    load_speech_recognition)
+
+sr = load_speech_recognition()
+
+
+class CountingBackend(FakeRecognitionBackend):  # pylint: disable=too-few-public-methods
+    """FakeRecognitionBackend that records when it was started and whether it was cut off"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = 0
+        self.cancelled = threading.Event()
+
+    def recognize(self, audio, cancelled):
+        self.calls += 1
+        try:
+            return super().recognize(audio, cancelled)
+        finally:
+            if cancelled.is_set():
+                self.cancelled.set()
+
+
+class HedgedRecognizerTest(unittest.TestCase):
+    """The first confident answer wins; slower and weaker ones are dropped"""
+
+    def recognizer(self, backends, **options):
+        """A HedgedRecognizer shut down after the test"""
+        options.setdefault('budget', 2.0)
+        recognizer = HedgedRecognizer(backends, **options)
+        self.addCleanup(recognizer.shutdown)
+        return recognizer
+
+    def test_first_confident_answer_wins(self):
+        """A fast confident backend answers and the slow one is cancelled"""
+        fast = CountingBackend('fast', 'open safari', confidence=0.9, delay=0.05)
+        slow = CountingBackend('slow', 'open safari', confidence=0.95, delay=5)
+        recognizer = self.recognizer([slow, fast])
+
+        started = time.perf_counter()
+        result = recognizer.recognize(None)
+        self.assertLess(time.perf_counter() - started, 1)
+        self.assertEqual((result.text, result.backend), ('open safari', 'fast'))
+        self.assertTrue(slow.cancelled.wait(1))
+        self.assertEqual(recognizer.summary()['fast']['wins'], 1)
+
+    def test_unsure_answer_waits_for_a_better_one(self):
+        """Below min_confidence the race goes on; the confident answer wins"""
+        unsure = FakeRecognitionBackend('unsure', 'open safety', confidence=0.4, delay=0.01)
+        sure = FakeRecognitionBackend('sure', 'open safari', confidence=0.9, delay=0.2)
+        result = self.recognizer([unsure, sure], min_confidence=0.6).recognize(None)
+        self.assertEqual(result.backend, 'sure')
+
+    def test_best_so_far_when_none_qualifies(self):
+        """With no confident answer, the most confident one is used once all have finished"""
+        backends = [FakeRecognitionBackend('sphinx', 'open safari', confidence=None, delay=0.01),
+                    FakeRecognitionBackend('weak', 'open safety', confidence=0.3, delay=0.05)]
+        result = self.recognizer(backends).recognize(None)
+        self.assertEqual(result.backend, 'weak')
+
+    def test_hedge_delay(self):
+        """The second backend only starts if the first hasn't answered within hedge_delay"""
+        first = CountingBackend('first', 'open safari', delay=0.01)
+        second = CountingBackend('second', 'open safari', delay=0.01)
+        recognizer = self.recognizer([first, second], hedge_delay=0.5)
+        self.assertEqual(recognizer.recognize(None).backend, 'first')
+        self.assertEqual(second.calls, 0)
+
+        first.delay = 1.0
+        self.assertEqual(recognizer.recognize(None).backend, 'second')
+        self.assertEqual(second.calls, 1)
+
+    def test_failure_starts_the_next_backend_at_once(self):
+        """An error skips the rest of the hedge delay"""
+        broken = FakeRecognitionBackend('broken', '', delay=0.01, error=sr.RequestError('offline'))
+        spare = FakeRecognitionBackend('spare', 'open safari', delay=0.01)
+        started = time.perf_counter()
+        result = self.recognizer([broken, spare], hedge_delay=5).recognize(None)
+        self.assertEqual(result.backend, 'spare')
+        self.assertLess(time.perf_counter() - started, 1)
+
+    def test_errors(self):
+        """All errors is a RequestError; any unintelligible answer makes it UnknownValueError"""
+        def broken(name):
+            return FakeRecognitionBackend(name, '', delay=0.01, error=sr.RequestError('offline'))
+
+        with self.assertRaises(sr.RequestError):
+            self.recognizer([broken('a'), broken('b')]).recognize(None)
+
+        unintelligible = FakeRecognitionBackend('c', '', delay=0.01, error=sr.UnknownValueError())
+        with self.assertRaises(sr.UnknownValueError):
+            self.recognizer([broken('a'), unintelligible]).recognize(None)
+
+    def test_budget(self):
+        """Nothing within the budget is a RequestError, not a hang"""
+        slow = FakeRecognitionBackend('slow', 'open safari', delay=5)
+        started = time.perf_counter()
+        with self.assertRaises(sr.RequestError):
+            self.recognizer([slow], budget=0.2).recognize(None)
+        self.assertLess(time.perf_counter() - started, 1)
+
+    def test_winner_ranks_first(self):
+        """A backend that keeps winning is started first next time"""
+        local = FakeRecognitionBackend('local', 'open safari', confidence=0.5, delay=0.01)
+        remote = FakeRecognitionBackend('remote', 'open safari', confidence=0.9, delay=0.05)
+        recognizer = self.recognizer([local, remote])
+        self.assertEqual(recognizer.ranked([local, remote]), [local, remote])
+        for _ in range(3):
+            recognizer.recognize(None)
+        self.assertEqual(recognizer.ranked([local, remote]), [remote, local])
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """Closed -> open after repeated failures -> half-open probe -> closed or open again"""
+
+    def setUp(self):
+        self.probed = threading.Event()
+        self.breaker = CircuitBreaker('remote', failure_threshold=2, slow_seconds=1.0,
+                                      reset_seconds=0.05, max_reset_seconds=0.15,
+                                      on_probe=self.probed.set)
+        self.addCleanup(self.breaker.stop)
+
+    def trip(self):
+        """Fail until the breaker opens"""
+        self.breaker.failure("offline")
+        self.assertTrue(self.breaker.allow())
+        self.breaker.failure("offline")
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_open_half_open_closed(self):
+        """A good probe after the reset timeout closes the circuit"""
+        self.trip()
+        self.assertGreater(self.breaker.retry_in(), 0)
+        self.assertTrue(self.probed.wait(2))
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.breaker.success(0.1)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.summary(), {'state': 'closed', 'trips': 1, 'retry_in': 0.0})
+
+    def test_failed_probe_backs_off(self):
+        """A failed probe reopens the circuit with the wait doubled, up to the maximum"""
+        self.trip()
+        for expected in (0.1, 0.15):
+            self.assertTrue(self.probed.wait(2))
+            self.probed.clear()
+            self.breaker.failure("failed probe")
+            self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+            self.assertEqual(self.breaker.reset_seconds, expected)
+
+        self.assertTrue(self.probed.wait(2))
+        self.breaker.success(0.1)
+        self.assertEqual(self.breaker.reset_seconds, 0.05)
+
+    def test_slow_responses_count_as_failures(self):
+        """Answers slower than slow_seconds trip it; a good one in between resets the count"""
+        self.breaker.success(2.0)
+        self.breaker.success(0.1)
+        self.breaker.success(2.0)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.breaker.success(2.0)
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_recognizer_skips_open_backend(self):
+        """An open primary is not waited on; the fallback answers until a probe recovers it"""
+        remote = CountingBackend('remote', 'open safari', delay=0.01,
+                                 error=sr.RequestError('offline'))
+        local = CountingBackend('local', 'open safari', delay=0.01)
+        recognizer = HedgedRecognizer([remote], fallback=[local], budget=2.0,
+                                      breaker={'failure_threshold': 1, 'reset_seconds': 0.2})
+        self.addCleanup(recognizer.shutdown)
+
+        self.assertEqual(recognizer.recognize(None).backend, 'local')
+        self.assertFalse(recognizer.breakers['remote'].allow())
+        self.assertEqual(recognizer.recognize(None).backend, 'local')
+        self.assertEqual(remote.calls, 1)
+
+        remote.error = None  # Back online; the half-open probe finds out
+        deadline = time.monotonic() + 5
+        while not recognizer.breakers['remote'].allow() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(recognizer.recognize(None).backend, 'remote')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""parse_schedule phrasing and ReminderScheduler persistence"""
+
+import json
+import logging
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from jarvis import ReminderScheduler, parse_schedule
+
+LOGGER = logging.getLogger('test_reminders')
+NOW = datetime(2026, 1, 5, 10, 0, 30)
+
+
+class ParseScheduleTest(unittest.TestCase):
+    """Spoken timings become (due, interval, message) relative to a fixed now"""
+
+    def test_relative(self):
+        """'in 5 minutes' counts from now and leaves the message"""
+        self.assertEqual(parse_schedule("remind me in 5 minutes to stretch", NOW),
+                         (NOW + timedelta(minutes=5), None, "stretch"))
+        due, _, message = parse_schedule(
+            "remind me to call mum in twenty minutes and 30 seconds", NOW)
+        self.assertEqual(due, NOW + timedelta(minutes=20, seconds=30))
+        self.assertEqual(message, "call mum")
+
+    def test_every_day_at(self):
+        """'every day at 9' repeats daily from the next 9 am"""
+        self.assertEqual(parse_schedule("remind me every day at 9 to take my pills", NOW),
+                         (datetime(2026, 1, 6, 9, 0), 86400, "take my pills"))
+
+    def test_clock_times(self):
+        """Bare small hours mean the afternoon; past times roll over to tomorrow"""
+        cases = {
+            "at 5 remind me to leave": datetime(2026, 1, 5, 17, 0),
+            "at 10:15 am to stand up": datetime(2026, 1, 5, 10, 15),
+            "at 10 am to stand up": datetime(2026, 1, 6, 10, 0),
+            "at noon to eat": datetime(2026, 1, 5, 12, 0),
+            "at 12 a.m. to sleep": datetime(2026, 1, 6, 0, 0),
+        }
+        for text, due in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(parse_schedule(text, NOW)[0], due)
+
+    def test_every_interval(self):
+        """'every 2 hours' starts one interval from now"""
+        self.assertEqual(parse_schedule("every 2 hours remind me to drink water", NOW),
+                         (NOW + timedelta(hours=2), 7200, "drink water"))
+
+    def test_no_time(self):
+        """Text without a time, or with an impossible one, is not a schedule"""
+        self.assertIsNone(parse_schedule("remind me to buy milk", NOW))
+        self.assertIsNone(parse_schedule("remind me at 25:00 to buy milk", NOW))
+
+
+class ReminderSchedulerTest(unittest.TestCase):
+    """Reminders survive a restart through the JSON file"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = Path(directory) / 'reminders.json'
+
+    def scheduler(self, on_fire=None):
+        """A scheduler on the test file; not started"""
+        return ReminderScheduler(self.path, on_fire or (lambda reminder: None), LOGGER)
+
+    def test_round_trip(self):
+        """A new scheduler loads what the last one saved and keeps numbering after it"""
+        first = self.scheduler()
+        due = datetime.now() + timedelta(hours=1)
+        once = first.add("stretch", due)
+        daily = first.add("take my pills", due + timedelta(hours=1), 86400)
+        first.add("cancelled", due)
+        first.cancel(3)
+        self.assertEqual(len(json.loads(self.path.read_text(encoding='utf-8'))), 2)
+
+        second = self.scheduler()
+        self.assertEqual(second.upcoming(), [once, daily])
+        self.assertEqual(second.add("next", due)['id'], 3)
+        self.assertFalse(self.path.with_suffix('.tmp').exists())
+
+    def test_missed_reminders_fire_on_start(self):
+        """Overdue one-shots fire and are removed; repeating ones move to their next time"""
+        first = self.scheduler()
+        first.add("stretch", datetime.now() - timedelta(minutes=5))
+        daily = first.add("take my pills", datetime.now() - timedelta(days=2, hours=1), 86400)
+
+        fired = []
+        both = threading.Event()
+
+        def on_fire(reminder):
+            fired.append(reminder['message'])
+            if len(fired) == 2:
+                both.set()
+
+        second = self.scheduler(on_fire)
+        second.start()
+        self.addCleanup(second.stop)
+        self.assertTrue(both.wait(5))
+        self.assertEqual(sorted(fired), ["stretch", "take my pills"])
+
+        saved = json.loads(self.path.read_text(encoding='utf-8'))
+        self.assertEqual([reminder['id'] for reminder in saved], [daily['id']])
+        self.assertGreater(saved[0]['due'], datetime.now().timestamp())
+        self.assertLessEqual(saved[0]['due'], datetime.now().timestamp() + 86400)
+
+    def test_unreadable_file_starts_empty(self):
+        """A corrupt file is logged, not fatal"""
+        self.path.write_text("{not json", encoding='utf-8')
+        with self.assertLogs(LOGGER, 'ERROR'):
+            scheduler = self.scheduler()
+        self.assertEqual(scheduler.upcoming(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Compound command planning and reply merging"""
+
+import unittest
+
+from jarvis import INTENTS, IntentRouter, JarvisAssistant
+
+KNOWN_APPS = {'chrome', 'spotify', 'safari', 'notes'}
+
+
+def resolves(intent, slots):
+    """Stand-in for JarvisAssistant.resolves with a fixed set of apps"""
+    return intent != 'open_app' or slots['app'] in KNOWN_APPS
+
+
+class PlanTest(unittest.TestCase):
+    """IntentRouter.plan splits compound commands, but not names containing "and\""""
+
+    def setUp(self):
+        self.router = IntentRouter(INTENTS)
+
+    def plan(self, text):
+        """The plan without the text of each part"""
+        return [[(intent, slots) for intent, slots, _ in stage]
+                for stage in self.router.plan(text, resolves=resolves)]
+
+    def test_borrowed_verb_splits_known_apps(self):
+        """'and spotify' borrows 'open'"""
+        self.assertEqual(self.plan("open chrome and spotify"),
+                         [[('open_app', {'app': 'chrome'}), ('open_app', {'app': 'spotify'})]])
+
+    def test_sequence_makes_stages(self):
+        """'then' starts a new stage"""
+        self.assertEqual(self.plan("open safari and notes then mute"),
+                         [[('open_app', {'app': 'safari'}), ('open_app', {'app': 'notes'})],
+                          [('mute', {})]])
+
+    def test_names_with_and_stay_whole(self):
+        """No split unless both parts are known apps"""
+        for name in ("barnes and noble", "rock and roll", "chrome and barnes"):
+            with self.subTest(name=name):
+                self.assertEqual(self.plan(f"open {name}"), [[('open_app', {'app': name})]])
+
+    def test_reminder_keeps_its_details(self):
+        """A reminder's text is never split"""
+        plan = self.plan("remind me in 5 minutes to call mom and dad")
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(plan[0][0][0], 'reminder')
+
+
+class RouteTest(unittest.TestCase):
+    """Short phrases only claim commands that are really theirs"""
+
+    def setUp(self):
+        self.router = IntentRouter(INTENTS)
+
+    def test_near_misses_do_not_route(self):
+        """Words inside longer requests don't trigger lock, license or quit"""
+        for text in ("lock the door", "this is mit", "close chrome", "stop the music",
+                     "exit the slideshow", "sleep well"):
+            with self.subTest(text=text):
+                self.assertIsNone(self.router.route(text)[0])
+
+    def test_intended_phrases_route(self):
+        """The tightened phrases still reach their intents"""
+        for text, intent in (("lock screen", 'lock_screen'), ("lock my mac", 'lock_screen'),
+                             ("go to sleep", 'lock_screen'), ("what license is this", 'license'),
+                             ("quit", 'quit'), (" goodbye ", 'quit'), ("stop", 'quit')):
+            with self.subTest(text=text):
+                self.assertEqual(self.router.route(text)[0], intent)
+
+    def test_quit_as_a_part(self):
+        """A whole-utterance intent still ends a compound command"""
+        plan = [[intent for intent, _, _ in stage]
+                for stage in self.router.plan("mute then quit", resolves=resolves)]
+        self.assertEqual(plan, [['mute'], ['quit']])
+
+
+class SummarizeRepliesTest(unittest.TestCase):
+    """Replies of one plan are merged into a single spoken sentence per verb"""
+
+    def test_same_verb_merges(self):
+        """'Opening chrome' and 'Opening spotify' become one sentence"""
+        summarize = JarvisAssistant.summarize_replies
+        self.assertEqual(summarize(["Opening chrome", "Opening spotify", "Executing mute"]),
+                         "Opening chrome and spotify. Executing mute.")
+        self.assertEqual(summarize(["Trying to open chrome", "Trying to open spotify"]),
+                         "Trying to open chrome and spotify.")
+
+    def test_other_replies_stay_separate(self):
+        """Replies with different verbs are joined as sentences"""
+        summarize = JarvisAssistant.summarize_replies
+        self.assertEqual(summarize(["Opening chrome", "Trying to open notes"]),
+                         "Opening chrome. Trying to open notes.")
+        self.assertEqual(summarize(["The time is 10:00 PM", "Opening safari"]),
+                         "The time is 10:00 PM. Opening safari.")
+
+
+if __name__ == '__main__':
+    unittest.main()
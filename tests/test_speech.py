@@ -0,0 +1,123 @@
+"""SpeechWorker ordering and barge-in with a fake TTS engine"""
+
+import logging
+import threading
+import unittest
+
+from jarvis import SpeechWorker
+
+HOLD = "please hold on while I look that up"
+
+
+class FakeEngine:
+    """pyttsx3 stand-in: each word fires 'started-word'; HOLD keeps talking until released"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.text = None
+        self.stopping = False
+        self.finished = []   # Texts spoken to the end
+        self.cut = []        # Texts stopped part way
+        self.speaking = threading.Event()
+        self.released = threading.Event()
+
+    def connect(self, name, callback):
+        """Register an engine callback"""
+        self.callbacks[name] = callback
+
+    @staticmethod
+    def getProperty(name):  # pylint: disable=invalid-name
+        """Fixed voice settings"""
+        return {'voice': 'test', 'rate': 185, 'volume': 1.0}[name]
+
+    def say(self, text):
+        """Queue text for runAndWait"""
+        self.text = text
+
+    def runAndWait(self):  # pylint: disable=invalid-name
+        """Speak word by word, stopping at a word boundary after stop()"""
+        text, self.text = self.text, None
+        self.stopping = False
+        self.speaking.set()
+        for location, word in enumerate(text.split()):
+            self.callbacks['started-word']('utterance', location, len(word))
+            while text == HOLD and not self.stopping and not self.released.wait(0.005):
+                self.callbacks['started-word']('utterance', location, len(word))
+            if self.stopping:
+                self.cut.append(text)
+                return
+        self.finished.append(text)
+
+    def stop(self):
+        """Cut the current utterance off"""
+        self.stopping = True
+
+
+class SpeechWorkerTest(unittest.TestCase):
+    """Replies are spoken in priority order and a barge-in silences them"""
+
+    def setUp(self):
+        self.engine = FakeEngine()
+        self.worker = SpeechWorker(lambda: self.engine, logging.getLogger('test_speech'))
+        self.worker.start()
+        self.addCleanup(self.worker.shutdown, drain=False)
+
+    def hold(self):
+        """Start speaking HOLD and wait until the engine is on it"""
+        handle = self.worker.say(HOLD)
+        self.assertTrue(self.engine.speaking.wait(5))
+        return handle
+
+    def test_priority_order(self):
+        """Queued replies wait for the current one, then go highest priority first"""
+        self.hold()
+        self.worker.say("normal")
+        self.worker.say("low", SpeechWorker.PRIORITY_LOW)
+        self.worker.say("urgent", SpeechWorker.PRIORITY_HIGH)
+        self.engine.released.set()
+        self.assertTrue(self.worker.wait_idle(5))
+        self.assertEqual(self.engine.finished, [HOLD, "urgent", "normal", "low"])
+
+    def test_barge_in_cuts_current_and_drops_queued(self):
+        """cancel_pending stops the reply mid-word and skips everything queued"""
+        current = self.hold()
+        queued = [self.worker.say("second"), self.worker.say("third")]
+        self.assertTrue(self.worker.busy())
+
+        self.worker.cancel_pending()
+        for handle in [current] + queued:
+            self.assertTrue(handle.wait(5))
+            self.assertTrue(handle.cancelled)
+        self.assertEqual(self.engine.cut, [HOLD])
+        self.assertEqual(self.engine.finished, [])
+        self.assertFalse(self.worker.busy())
+
+        # The worker keeps going after a barge-in
+        self.worker.say("next turn").wait(5)
+        self.assertEqual(self.engine.finished, ["next turn"])
+
+    def test_on_idle(self):
+        """Callbacks run once the queue drains, or at once when nothing is queued"""
+        called = []
+        self.worker.on_idle(lambda: called.append('now'))
+        self.assertEqual(called, ['now'])
+
+        self.hold()
+        self.worker.on_idle(lambda: called.append('drained'))
+        self.assertEqual(called, ['now'])
+        self.engine.released.set()
+        self.assertTrue(self.worker.wait_idle(5))
+        self.assertEqual(called, ['now', 'drained'])
+
+    def test_shutdown_without_drain(self):
+        """shutdown(drain=False) doesn't speak what is still queued"""
+        self.hold()
+        queued = self.worker.say("never spoken")
+        self.worker.shutdown(drain=False, timeout=5)
+        self.assertFalse(self.worker.is_alive())
+        self.assertTrue(queued.finished())
+        self.assertEqual(self.engine.finished, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
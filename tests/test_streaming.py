@@ -0,0 +1,91 @@
+"""listen_streaming: committing on a stable partial result before the speaker stops"""
+
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from array import array
+
+from jarvis import JarvisAssistant, ScriptedStreamingBackend
+
+
+class ToneSource:
+    """Microphone stand-in: loud samples for speech_seconds, then silence"""
+
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+    CHUNK = 1600  # 0.1 s
+
+    def __init__(self, speech_seconds, silence_seconds=2.0):
+        speech = array('h', [3000, -3000] * int(speech_seconds * self.SAMPLE_RATE / 2))
+        silence = array('h', [0]) * int(silence_seconds * self.SAMPLE_RATE)
+        self.pcm = (speech + silence).tobytes()
+        self.position = 0
+        self.stream = self
+
+    def read(self, frames):
+        """The next frames samples, or b'' at the end"""
+        size = frames * self.SAMPLE_WIDTH
+        chunk = self.pcm[self.position:self.position + size]
+        self.position += len(chunk)
+        return chunk
+
+    def seconds_read(self):
+        """Audio consumed so far"""
+        return self.position / self.SAMPLE_WIDTH / self.SAMPLE_RATE
+
+
+class ListenStreamingTest(unittest.TestCase):
+    """Early commit cuts the wait for an unambiguous command, and only for one"""
+
+    def setUp(self):
+        workdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, workdir)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(workdir)
+        self.jarvis = JarvisAssistant(speech=False, quiet=True, ephemeral=True)
+        self.addCleanup(self.jarvis.shutdown, drain=False)
+
+    def listen(self, transcript, speech_seconds, early, silence_seconds=2.0):
+        """(text, seconds of audio read) for transcript spoken over speech_seconds"""
+        source = ToneSource(speech_seconds, silence_seconds)
+        backend = ScriptedStreamingBackend(transcript, final_latency=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            text = self.jarvis.listen_streaming(source, backend, early=early)
+        return text, source.seconds_read()
+
+    def test_commits_on_stable_partial(self):
+        """'lock the screen' is acted on while the speaker is still talking"""
+        text, heard = self.listen("lock the screen now please", speech_seconds=3, early=True)
+        self.assertEqual(text, "lock the screen")
+        self.assertLess(heard, 2.0)
+
+    def test_waits_for_the_pause_without_early_commit(self):
+        """With early commit off the whole utterance is recognized after the pause"""
+        text, heard = self.listen("lock the screen now please", speech_seconds=3, early=False)
+        self.assertEqual(text, "lock the screen now please")
+        self.assertGreater(heard, 3.0)
+
+    def test_never_early_for_quit(self):
+        """Intents marked early: False wait for the end of the utterance"""
+        text, heard = self.listen("quit", speech_seconds=1.5, early=True)
+        self.assertEqual(text, "quit")
+        self.assertGreater(heard, 1.5)
+
+    def test_prefix_of_a_longer_phrase_waits(self):
+        """'lock' could still become 'lock screen', so it is not committed"""
+        self.assertIsNone(self.jarvis.early_intent("lock"))
+        self.assertIsNone(self.jarvis.early_intent("open chrome and"))
+        self.assertEqual(self.jarvis.early_intent("what time is it"), 'time')
+
+    def test_silence_times_out(self):
+        """No speech within listen_timeout returns None"""
+        text, heard = self.listen("", speech_seconds=0, early=True, silence_seconds=10)
+        self.assertIsNone(text)
+        self.assertLess(heard, 8)
+
+
+if __name__ == '__main__':
+    unittest.main()
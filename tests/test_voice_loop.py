@@ -0,0 +1,124 @@
+"""VoiceStateMachine driven by a fake assistant, no audio devices needed"""
+
+import asyncio
+import logging
+import threading
+import time
+import unittest
+
+from jarvis import NullMetrics, VoiceStateMachine
+
+
+class FakeAssistant:
+    """Just enough of JarvisAssistant for the state machine
+
+    The wake word is heard on every other listen; after `commands`
+    commands the next one is "quit".
+    """
+
+    wake_word = 'jarvis'
+
+    def __init__(self, commands=3):
+        self.commands = commands
+        self.metrics = NullMetrics()
+        self.logger = logging.getLogger('test_voice_loop')
+        self.scheduler = type('Scheduler', (), {'on_fire': None})()
+        self.settings = type('Settings', (), {'barge_in': False})()
+        self.tts = self
+        self.config = {'low_power': False}
+        self.capture = None
+        self.heard_at = None
+        self.on_captured = None
+        self.is_active = True
+        self.listens = 0
+        self.handled = []
+
+    def listen(self, listen_type):
+        """The wake word is heard every other time; commands end with quit"""
+        self.listens += 1
+        time.sleep(0.01)
+        if listen_type == 'wake_word':
+            return 'hey jarvis' if self.listens % 2 else None
+        if self.on_captured is not None:
+            self.on_captured()
+        time.sleep(0.01)  # Recognition
+        return 'quit' if len(self.handled) >= self.commands else 'what time is it'
+
+    def run_command(self, text):
+        """Record the command"""
+        self.handled.append(text)
+        return {'intent': 'quit' if text == 'quit' else 'time'}
+
+    @staticmethod
+    def is_quit(result):
+        """Whether the command was quit"""
+        return result['intent'] == 'quit'
+
+    def on_idle(self, callback):
+        """Nothing is ever being spoken"""
+        threading.Timer(0.005, callback).start()
+
+    def speak(self, text, priority=None):
+        """Say nothing"""
+
+    def skip_buffered_audio(self):
+        """Nothing is buffered"""
+
+    def on_reminder(self, reminder):
+        """No reminders fire"""
+
+
+class VoiceStateMachineTest(unittest.TestCase):
+    """Turns run through every state and end on quit"""
+
+    def run_machine(self, wake_word):
+        """Run the loop to quit; returns the assistant and the loop's summary"""
+        assistant = FakeAssistant()
+        machine = VoiceStateMachine(assistant, wake_word=wake_word)
+        asyncio.run(asyncio.wait_for(machine.run(), timeout=20))
+        return assistant, machine.summary()
+
+    def test_wake_word_mode(self):
+        """Three commands and quit, each after the wake word"""
+        assistant, summary = self.run_machine(wake_word=True)
+        self.assertEqual(assistant.handled, ['what time is it'] * 3 + ['quit'])
+        self.assertFalse(assistant.is_active)
+        states = summary['states']
+        self.assertEqual(states['wake']['entries'], 4)
+        self.assertEqual(states['capturing']['entries'], 4)
+        self.assertEqual(states['recognizing']['entries'], 4)
+        self.assertEqual(states['executing']['entries'], 4)
+        self.assertEqual(states['speaking']['entries'], 3)
+        self.assertIn('executing->stopped', summary['transitions'])
+        for stats in states.values():
+            self.assertEqual(set(stats), {'entries', 'seconds', 'cpu_percent',
+                                          'wakeups_per_second', 'rss_mb'})
+
+    def test_continuous_mode(self):
+        """Commands follow each other without the wake word"""
+        assistant, summary = self.run_machine(wake_word=False)
+        self.assertEqual(len(assistant.handled), 4)
+        self.assertNotIn('idle', summary['states'])
+        self.assertEqual(summary['transitions']['speaking->capturing']['count'], 3)
+
+    def test_stale_events_are_ignored(self):
+        """A 'captured' event from an earlier capture doesn't end this one"""
+        machine = VoiceStateMachine(FakeAssistant())
+
+        async def scenario():
+            machine.loop = asyncio.get_running_loop()
+            machine.events = asyncio.Queue()
+            # Left over from the previous turn's capture
+            machine.events.put_nowait(('captured', None, time.perf_counter()))
+            machine.enter(VoiceStateMachine.CAPTURING, None)
+            listening = machine.loop.create_future()
+            machine.loop.call_later(0.05, listening.set_result,
+                                    ('open safari', time.perf_counter()))
+            return await machine.until(listening, 'captured')
+
+        outcome, text, _ = asyncio.run(scenario())
+        self.assertEqual((outcome, text), ('done', 'open safari'))
+
+
+if __name__ == '__main__':
+    unittest.main()